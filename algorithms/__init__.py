@@ -1,3 +1,6 @@
+import numpy as np
+
+from cpas.models.structures import symbols_from_codes
 
 def to_string(sequence):
     """
@@ -6,6 +9,16 @@ def to_string(sequence):
     T2T -> B
     P2T -> C
     T2P -> D
+    
+    Already encoded input is used as is: a str, a WidgetChain (its cached
+    symbol_string) or an integer array of type codes (WIDGET_TYPES order).
     """
+    if isinstance(sequence, str):
+        return sequence
+    symbols = getattr(sequence, 'symbol_string', None)
+    if symbols is not None:
+        return symbols
+    if isinstance(sequence, np.ndarray) and sequence.dtype.kind in 'iu':
+        return symbols_from_codes(sequence)
     mapping = {'P2P': 'A', 'T2T': 'B', 'P2T': 'C', 'T2P': 'D'}
     return "".join([mapping.get(s, 'X') for s in sequence])
@@ -2,7 +2,32 @@ import threading
 import queue
 import functools
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+
+from cpas.models.timeseries import TimeSeries
+
+def _extrema_chain_block(block, prominence, distance):
+    """
+    Extrema -> WidgetChain pipeline for a block of channels (one batched
+    detection over the block, then a chain per row).
+    Module-level so it can be pickled into worker processes.
+    """
+    from cpas.core.extrema import ExtremaDetector
+    from cpas.core.widgets import WidgetGenerator
+    
+    res = ExtremaDetector.detect_batch(block, prominence=prominence, distance=distance)
+    channels = []
+    for r, row in enumerate(block):
+        peaks = res['peaks'][res['peak_offsets'][r]:res['peak_offsets'][r + 1]]
+        troughs = res['troughs'][res['trough_offsets'][r]:res['trough_offsets'][r + 1]]
+        chain = WidgetGenerator.generate_chain(row, peaks, troughs)
+        channels.append({'peaks': peaks, 'troughs': troughs, 'chain': chain})
+    return channels
 
 class AsyncProcessor:
     """
@@ -10,11 +35,17 @@ class AsyncProcessor:
     Ensures safe UI updates via callback queues.
     """
     
+    # Prominence hierarchies kept (each holds a smoothed copy of its series)
+    HIERARCHY_CACHE_SIZE = 4
+    
     def __init__(self, ui_callback_manager=None):
         self.executor = ThreadPoolExecutor(max_workers=2) # 1 For calculation, 1 for other
         self.ui_callback = ui_callback_manager # Function to schedule on main thread
         self.result_queue = queue.Queue()
-        self._cache_extrema = {}
+        # LRU: (data identity, distance, volatility, window) -> ExtremaHierarchy
+        self._cache_hierarchy = OrderedDict()
+        self._hierarchy_lock = threading.Lock() # Filled by workers, read by the UI thread
+        self._cache_zigzag = {}
         self._cache_dna = {}
 
     def _hash_data(self, data):
@@ -24,41 +55,225 @@ class AsyncProcessor:
         if data is None: return 0
         return hash((len(data), data[0], data[-1], data.dtype))
 
-    def submit_extrema_detection(self, values, prominence, distance, callback):
+    def _data_key(self, values):
+        """
+        Cache identity of a series: its dataset fingerprint when it has one
+        (a TimeSeries loaded by DataLoader), else the _hash_data fallback.
+        """
+        fingerprint = getattr(values, 'fingerprint', None)
+        if fingerprint is not None:
+            return fingerprint
+        if isinstance(values, TimeSeries):
+            values = values.values
+        return self._hash_data(values)
+
+    def _hierarchy_key(self, values, distance, volatility=None, volatility_window=100):
+        return (self._data_key(values), distance, volatility, volatility_window)
+
+    def _get_hierarchy(self, key):
+        with self._hierarchy_lock:
+            hierarchy = self._cache_hierarchy.get(key)
+            if hierarchy is not None:
+                self._cache_hierarchy.move_to_end(key)
+            return hierarchy
+
+    def _put_hierarchy(self, key, hierarchy):
+        """Caches a hierarchy, dropping the least recently used beyond HIERARCHY_CACHE_SIZE."""
+        with self._hierarchy_lock:
+            self._cache_hierarchy[key] = hierarchy
+            self._cache_hierarchy.move_to_end(key)
+            while len(self._cache_hierarchy) > self.HIERARCHY_CACHE_SIZE:
+                self._cache_hierarchy.popitem(last=False)
+
+    def submit_extrema_detection(self, values, prominence, distance, callback, volatility=None, volatility_window=100,
+                                 previous_chain=None):
         """
         Runs ExtremaDetection in background.
+        values may be a numpy array or a TimeSeries.
+        
+        The first run for a series builds its ExtremaHierarchy; later runs with
+        another prominence only cut it (see cached_extrema). With volatility
+        set, prominence is a multiple of the rolling volatility measure.
+        With previous_chain, the chain is updated from it and the result also
+        has 'changes' (see WidgetGenerator.update_chain).
+        A TimeSeries' fingerprint keys the caches (see _data_key).
         """
         # Check Cache
-        d_hash = self._hash_data(values)
-        key = (d_hash, prominence, distance)
-        
-        if key in self._cache_extrema:
-            self._notify_main(callback, self._cache_extrema[key])
+        cached = self.cached_extrema(values, prominence, distance, volatility, volatility_window, previous_chain)
+        if cached is not None:
+            self._notify_main(callback, cached)
+            return
+
+        key = self._hierarchy_key(values, distance, volatility, volatility_window)
+        fingerprint = getattr(values, 'fingerprint', None)
+        if isinstance(values, TimeSeries):
+            values = values.values
+
+        def task():
+            try:
+                from cpas.core.extrema_hierarchy import ExtremaHierarchy
+                hierarchy = self._get_hierarchy(key)
+                if hierarchy is None:
+                    hierarchy = ExtremaHierarchy(values, distance=distance, volatility=volatility,
+                                                 volatility_window=volatility_window, fingerprint=fingerprint)
+                    # Cache
+                    self._put_hierarchy(key, hierarchy)
+                return hierarchy.cut_chain(prominence, previous_chain)
+            except Exception as e:
+                return {'error': str(e)}
+
+        self.executor.submit(self._worker_wrapper, task, callback)
+
+    def cached_extrema(self, values, prominence, distance, volatility=None, volatility_window=100, previous_chain=None):
+        """
+        Extrema and chain for a series whose hierarchy is already built, computed
+        synchronously (a binary search plus the distance filter), or None.
+        Lets the resolution slider update in real time without a background job.
+        previous_chain: as in submit_extrema_detection.
+        """
+        hierarchy = self._get_hierarchy(self._hierarchy_key(values, distance, volatility, volatility_window))
+        if hierarchy is None:
+            return None
+        return hierarchy.cut_chain(prominence, previous_chain)
+
+    def on_chain_changed(self, changes=None):
+        """
+        Drops results that refer to the previous chain. changes is the
+        WidgetGenerator.update_chain report (None: unknown, treated as a full
+        change); DNA search results survive only an unchanged chain.
+        """
+        if changes != []:
+            self._cache_dna.clear()
+
+    def submit_progressive_extrema(self, values, prominence, distance, callback):
+        """
+        Coarse-to-fine detection (see ProgressiveExtremaDetector) for long series.
+        Callback runs once per update with {'peaks', 'troughs', 'chain',
+        'exact_until', 'progress', 'final'}: first within a fraction of a second
+        from a decimated copy, last with the exact result. The hierarchy for
+        slider cuts is built afterwards in the same background job.
+        """
+        key = self._hierarchy_key(values, distance)
+        fingerprint = getattr(values, 'fingerprint', None)
+        if isinstance(values, TimeSeries):
+            values = values.values
+
+        def task():
+            from cpas.core.progressive import ProgressiveExtremaDetector
+            from cpas.core.widgets import WidgetGenerator
+            try:
+                for update in ProgressiveExtremaDetector.run(values, prominence, distance, fingerprint=fingerprint):
+                    update['chain'] = WidgetGenerator.generate_chain(values, update['peaks'], update['troughs'])
+                    self._notify_main(callback, update)
+                    
+                if self._get_hierarchy(key) is None:
+                    from cpas.core.extrema_hierarchy import ExtremaHierarchy
+                    self._put_hierarchy(key, ExtremaHierarchy(values, distance=distance, fingerprint=fingerprint))
+            except Exception as e:
+                self._notify_main(callback, {'error': str(e)})
+
+        self.executor.submit(task)
+
+    def submit_zigzag_detection(self, values, callback, deviation=None, percent=None):
+        """
+        Runs ZigZagDetector (single pass) plus chain generation in background.
+        Callback receives {'peaks', 'troughs', 'chain'}.
+        """
+        key = (self._data_key(values), deviation, percent)
+        if isinstance(values, TimeSeries):
+            values = values.values
+        if key in self._cache_zigzag:
+            self._notify_main(callback, self._cache_zigzag[key])
             return
 
         def task():
             try:
-                # Late import to avoid circular dep if any
-                from cpas.core.extrema import ExtremaDetector
+                from cpas.core.zigzag import ZigZagDetector
                 from cpas.core.widgets import WidgetGenerator
-                
-                res = ExtremaDetector.detect(values, prominence=prominence, distance=distance)
-                # Also generate chain here since they go together
+                res = ZigZagDetector.detect(values, deviation=deviation, percent=percent)
                 chain = WidgetGenerator.generate_chain(values, res['peaks'], res['troughs'])
-                
                 output = {'peaks': res['peaks'], 'troughs': res['troughs'], 'chain': chain}
-                
-                # Cache
-                self._cache_extrema[key] = output
+                self._cache_zigzag[key] = output
                 return output
             except Exception as e:
                 return {'error': str(e)}
 
         self.executor.submit(self._worker_wrapper, task, callback)
 
+    def submit_incremental_extrema(self, detector, batch, series, callback, previous_chain=None):
+        """
+        Feeds an appended batch to an IncrementalExtremaDetector in background
+        and updates the chain from its result (only the widgets around changed
+        extrema, usually the tail, are regenerated). Batches run on a dedicated
+        single thread so they reach the detector in submission order.
+        Callback receives {'peaks', 'troughs', 'chain', 'changes', 'confirmed_peaks',
+        'confirmed_troughs', 'tentative_peaks', 'tentative_troughs'}.
+        """
+        if not hasattr(self, '_live_executor'):
+            self._live_executor = ThreadPoolExecutor(max_workers=1)
+
+        def task():
+            try:
+                from cpas.core.widgets import WidgetGenerator
+                update = detector.append(batch)
+                res = detector.result()
+                chain, changes = WidgetGenerator.update_chain(previous_chain, series.values, res['peaks'], res['troughs'])
+                return {**update, 'peaks': res['peaks'], 'troughs': res['troughs'], 'chain': chain, 'changes': changes}
+            except Exception as e:
+                return {'error': str(e)}
+
+        self._live_executor.submit(self._worker_wrapper, task, callback)
+
+    def submit_multi_extrema_detection(self, series, prominence, distance, callback, max_workers=None):
+        """
+        Runs the extrema -> chain pipeline for every channel of a MultiSeries
+        in a process pool, so one load yields a chain per channel. Channels are
+        split into one block per worker; each worker runs a batched detection
+        (ExtremaDetector.detect_batch) plus chain generation over its block.
+        Callback receives {'columns': [...], 'channels': [{'peaks', 'troughs', 'chain'}, ...]}.
+        """
+        def task():
+            try:
+                rows = len(series.values)
+                workers = max(1, min(max_workers or os.cpu_count() or 1, rows))
+                blocks = [b for b in np.array_split(np.arange(rows), workers) if len(b)]
+                # Spawn: forking a process that runs Tk threads is unsafe
+                ctx = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                    futures = [pool.submit(_extrema_chain_block, series.values[b[0]:b[-1] + 1], prominence, distance)
+                               for b in blocks]
+                    channels = [ch for f in futures for ch in f.result()]
+                return {'columns': list(series.columns), 'channels': channels}
+            except Exception as e:
+                return {'error': str(e)}
+
+        self.executor.submit(self._worker_wrapper, task, callback)
+
+    def submit_catalog_ingest(self, catalog, source, callback, progress=None):
+        """
+        Runs DatasetCatalog.ingest (itself a process pool) off the UI thread.
+        Callback receives the ingest summary; progress(done, total, record) is
+        forwarded to the main thread.
+        """
+        def on_progress(done, total, record):
+            if progress:
+                self._notify_main(lambda r: progress(done, total, r), record)
+
+        def task():
+            try:
+                return catalog.ingest(source, progress=on_progress)
+            except Exception as e:
+                return {'error': str(e)}
+
+        self.executor.submit(self._worker_wrapper, task, callback)
+
     def submit_dna_search(self, full_seq, q_seq, mode, key_context, callback):
         """
         Runs DNA Search (KMP/NW/etc) in background.
+        
+        full_seq and q_seq may be widget type lists or their to_string encoding
+        (e.g. WidgetChain.symbol_string and a slice of it), which avoids
+        re-encoding the chain on every search.
         """
         # key_context: (algo_mode, anchor_start_hash, etc)
         # We can cache based on (len(full_seq), tuple(q_seq), mode)
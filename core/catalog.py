@@ -0,0 +1,142 @@
+import glob
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+
+from cpas.core.data_loader import DataLoader, COLUMNAR_FORMATS
+from cpas.core.dataset_cache import DatasetCache
+
+# File extensions picked up when ingesting a directory
+INGEST_EXTENSIONS = ('.csv',) + tuple(COLUMNAR_FORMATS)
+
+def _ingest_file(file_path, cache_dir, cache_max_bytes):
+    """
+    Validates one dataset and writes its binary cache entry.
+    Module-level so it can be pickled into worker processes.
+
+    Returns:
+        dict: Catalog record (see DatabaseManager.DATASET_FIELDS). Failures are
+            returned as a record with 'error' set instead of raising, so one bad
+            file doesn't abort the batch.
+    """
+    from cpas.models.timeseries import TimeSeries
+
+    ext = os.path.splitext(file_path)[1].lower()
+    record = {
+        'filepath': file_path,
+        'filename': os.path.basename(file_path),
+        'format': COLUMNAR_FORMATS.get(ext, 'csv'),
+    }
+    try:
+        cache = DatasetCache(cache_dir, max_bytes=cache_max_bytes)
+        # One fingerprint (before parsing) for the record, the cache lookup and the store
+        fingerprint = cache.fingerprint(file_path)
+        record['fingerprint'] = fingerprint
+        if ext in COLUMNAR_FORMATS:
+            timestamps, values, names = DataLoader._read_columnar(file_path, None, None, all_numeric=False)
+            series = TimeSeries.from_arrays(timestamps, values[0])
+            record['schema'] = {'value_cols': names}
+        else:
+            schema = DataLoader.sniff_schema(file_path, fingerprint)
+            series = DataLoader.load(file_path, cache=cache, fingerprint=fingerprint, schema=schema)
+            record['schema'] = {**asdict(schema), 'columns': list(schema.columns)}
+    except Exception as e:
+        record['error'] = str(e)
+        return record
+
+    record['rows'] = len(series)
+    if len(series):
+        record['start_ns'] = int(series.time_index.time_at(0))
+        record['end_ns'] = int(series.time_index.time_at(len(series) - 1))
+    return record
+
+class DatasetCatalog:
+    """
+    Bulk ingestion of many datasets into the binary cache plus a catalog of
+    their metadata (schema, row count, time span, fingerprint) in the session
+    database. Files are validated in a process pool; files whose fingerprint
+    matches their catalog entry are skipped.
+    """
+
+    def __init__(self, db=None, cache=None):
+        if db is None:
+            from cpas.storage.db import DatabaseManager
+            db = DatabaseManager()
+        self.db = db
+        self.cache = cache or DatasetCache()
+
+    @staticmethod
+    def expand(source):
+        """
+        Resolves a directory (all supported files directly inside it) or a glob
+        pattern to a sorted list of absolute file paths.
+        """
+        if os.path.isdir(source):
+            paths = [e.path for e in os.scandir(source)
+                     if e.is_file() and os.path.splitext(e.name)[1].lower() in INGEST_EXTENSIONS]
+        else:
+            paths = [p for p in glob.glob(source, recursive=True) if os.path.isfile(p)]
+        return sorted(os.path.abspath(p) for p in paths)
+
+    def ingest(self, source, max_workers=None, force=False, progress=None):
+        """
+        Validates and caches every dataset under source.
+
+        Args:
+            source (str | list): Directory, glob pattern or list of file paths.
+            max_workers (int, optional): Pool size (default: CPU count).
+            force (bool): Re-ingest files even if their fingerprint is unchanged.
+            progress (callable, optional): progress(done, total, record) after each file.
+
+        Returns:
+            dict: {'ingested': [records], 'skipped': [paths], 'failed': [records]}
+        """
+        paths = source if isinstance(source, (list, tuple)) else self.expand(source)
+        paths = [os.path.abspath(p) for p in paths]
+
+        todo, skipped = [], []
+        for path in paths:
+            if not force and self.is_current(path):
+                skipped.append(path)
+            else:
+                todo.append(path)
+
+        records = []
+        if todo:
+            # Spawn: forking a process that runs Tk threads is unsafe
+            ctx = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+                futures = [pool.submit(_ingest_file, p, self.cache.cache_dir, self.cache.max_bytes) for p in todo]
+                for done, future in enumerate(futures, 1):
+                    record = future.result()
+                    records.append(record)
+                    if progress:
+                        progress(done, len(todo), record)
+
+            self.db.upsert_datasets(records)
+
+        return {
+            'ingested': [r for r in records if not r.get('error')],
+            'skipped': skipped,
+            'failed': [r for r in records if r.get('error')],
+        }
+
+    def lookup(self, file_path):
+        """Catalog record for file_path if it still describes the file on disk, else None."""
+        record = self.db.get_dataset(os.path.abspath(file_path))
+        if record is None or record.get('error'):
+            return None
+        try:
+            if DatasetCache.fingerprint(file_path) != record['fingerprint']:
+                return None
+        except OSError:
+            return None
+        return record
+
+    def is_current(self, file_path):
+        return self.lookup(file_path) is not None
+
+    def datasets(self):
+        """All catalog records."""
+        return self.db.list_datasets()
@@ -1,5 +1,55 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
 import pandas as pd
 import numpy as np
+from pandas.tseries.api import guess_datetime_format
+
+# Files above this size are streamed in chunks instead of parsed in one go.
+STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
+DEFAULT_CHUNKSIZE = 500_000
+# Rows read to detect column roles and the datetime format.
+SNIFF_ROWS = 1000
+# Detected schemas remembered (least recently used are dropped).
+SCHEMA_CACHE_SIZE = 64
+# Columnar formats read through pyarrow (optional dependency).
+COLUMNAR_FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.feather': 'feather', '.arrow': 'ipc', '.ipc': 'ipc'}
+
+@dataclass
+class CsvSchema:
+    """
+    Column roles of a CSV source, detected once from a sample.
+    """
+    columns: Tuple[str, ...]          # Header (all column names, in file order)
+    timestamp_col: str
+    value_cols: List[str]             # Numeric columns, primary first
+    datetime_format: Optional[str] = None  # strptime format, None if it must be inferred
+    
+    @property
+    def primary_value_col(self):
+        return self.value_cols[0]
+
+@dataclass
+class MultiSeries:
+    """
+    All numeric channels of a dataset over one shared timestamp index.
+    """
+    timestamps: np.ndarray  # datetime64[ns], shape (n,)
+    values: np.ndarray      # float64, shape (channels, n); each channel row is contiguous
+    columns: List[str]
+    fingerprint: Optional[str] = None  # DatasetCache fingerprint of the source file
+    
+    def channel(self, name):
+        return self.values[self.columns.index(name)]
+    
+    def series(self, name):
+        """One channel as a TimeSeries (zero-copy), with a per-channel fingerprint."""
+        from cpas.models.timeseries import TimeSeries
+        fingerprint = f"{self.fingerprint}|column={name}" if self.fingerprint is not None else None
+        return TimeSeries.from_arrays(self.timestamps, self.channel(name), fingerprint=fingerprint)
 
 class DataLoader:
     """
@@ -7,12 +57,15 @@ class DataLoader:
     """
     
     @staticmethod
-    def load_csv(file_path):
+    def load_csv(file_path, chunksize=None, schema=None):
         """
         Loads a CSV file, performs strict validation, and returns a sanitized DataFrame.
         
         Args:
             file_path (str): Path to the CSV file.
+            chunksize (int, optional): If set, the file is streamed in chunks of this
+                many rows (see load_csv_chunked) instead of being parsed in one go.
+            schema (CsvSchema, optional): Already sniffed schema (see sniff_schema).
             
         Returns:
             pd.DataFrame: Validated dataframe with 'timestamp' and 'value' columns.
@@ -20,12 +73,460 @@ class DataLoader:
         Raises:
             ValueError: If any validation rule is violated.
         """
+        if chunksize:
+            return DataLoader.load_csv_chunked(file_path, chunksize=chunksize, schema=schema)
+
+        # 1. Check for mandatory columns (sniffed from a sample, cached per source)
+        schema = schema or DataLoader.sniff_schema(file_path)
+        timestamp_col = schema.timestamp_col
+            
+        # If multiple numeric columns, we take the first one as primary 'value' 
+        # but keep others as features if needed. For M1 Scope, let's strictly set primary.
+        primary_value_col = schema.primary_value_col
+        
+        try:
+            df = pd.read_csv(file_path, usecols=[timestamp_col, primary_value_col])
+        except Exception as e:
+            raise ValueError(f"Failed to read CSV: {e}")
+            
+        if not pd.api.types.is_numeric_dtype(df[primary_value_col]):
+            raise ValueError(f"Non-numeric values in column '{primary_value_col}'. Dataset REJECTED.")
+        
+        # convert timestamp to actual datetime (one vectorized pass with the sniffed format)
+        df[timestamp_col] = DataLoader._to_datetime(df[timestamp_col], schema.datetime_format)
+        
+        # 2. Check strict ordering
+        if not df[timestamp_col].is_monotonic_increasing:
+             raise ValueError("Timestamps are not strictly ordered. Dataset REJECTED.")
+             
+        # 3. Check for missing values
+        if df[timestamp_col].isnull().any():
+            raise ValueError("Missing timestamps detected. Dataset REJECTED.")
+            
+        if df[primary_value_col].isnull().any():
+            # SRS: "Missing numeric values -> REJECT or INTERPOLATE (user-configurable)"
+            # Default to reject for now as per "Invalid datasets MUST produce explicit diagnostics."
+            raise ValueError(f"Missing numeric values in column '{primary_value_col}'. Dataset REJECTED.")
+            
+        # Standardize columns
+        df = df.rename(columns={timestamp_col: 'timestamp', primary_value_col: 'value'})
+        
+        # Return cleaned df
+        return df[['timestamp', 'value']]
+
+    @staticmethod
+    def load_csv_multi(file_path):
+        """
+        Loads every numeric column of a CSV instead of only the primary one.
+        
+        Args:
+            file_path (str): Path to the CSV file.
+            
+        Returns:
+            MultiSeries: Shared timestamps plus a (channels, n) float array.
+            
+        Raises:
+            ValueError: If any validation rule is violated in any channel.
+        """
+        schema = DataLoader.sniff_schema(file_path)
         try:
-            df = pd.read_csv(file_path)
+            df = pd.read_csv(file_path, usecols=[schema.timestamp_col] + list(schema.value_cols))
         except Exception as e:
             raise ValueError(f"Failed to read CSV: {e}")
+            
+        ts = DataLoader._to_datetime(df[schema.timestamp_col], schema.datetime_format)
+        if not ts.is_monotonic_increasing:
+            raise ValueError("Timestamps are not strictly ordered. Dataset REJECTED.")
+        if ts.isnull().any():
+            raise ValueError("Missing timestamps detected. Dataset REJECTED.")
+            
+        # One contiguous block, filled channel by channel
+        values = np.empty((len(schema.value_cols), len(df)), dtype=float)
+        for row, col in enumerate(schema.value_cols):
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                raise ValueError(f"Non-numeric values in column '{col}'. Dataset REJECTED.")
+            values[row] = df[col].to_numpy(dtype=float)
+            if np.isnan(values[row]).any():
+                raise ValueError(f"Missing numeric values in column '{col}'. Dataset REJECTED.")
+            del df[col]
+            
+        return MultiSeries(
+            timestamps=ts.to_numpy(dtype='datetime64[ns]'),
+            values=values,
+            columns=list(schema.value_cols)
+        )
+
+    @staticmethod
+    def load_multi(file_path):
+        """
+        Loads every numeric channel of a CSV or columnar file (load_csv_multi /
+        load_columnar_multi by extension).
+        
+        Returns:
+            MultiSeries: Channels plus the file's DatasetCache fingerprint.
+        """
+        from cpas.core.dataset_cache import DatasetCache
+        # Fingerprint BEFORE parsing, as in load
+        fingerprint = DatasetCache.fingerprint(file_path)
+        if os.path.splitext(file_path)[1].lower() in COLUMNAR_FORMATS:
+            multi = DataLoader.load_columnar_multi(file_path)
+        else:
+            multi = DataLoader.load_csv_multi(file_path)
+        multi.fingerprint = fingerprint
+        return multi
+
+    @staticmethod
+    def load_columnar(file_path, value_column=None, timestamp_column=None):
+        """
+        Loads a Parquet / Feather / Arrow IPC file, reading only the timestamp
+        column and one value column (memory-mapped where the format allows).
+        
+        Args:
+            file_path (str): Path to the columnar file.
+            value_column (str, optional): Value column; defaults to the first numeric one.
+            timestamp_column (str, optional): Timestamp column; detected from the schema if omitted.
+            
+        Returns:
+            pd.DataFrame: Validated dataframe with 'timestamp' and 'value' columns.
+            
+        Raises:
+            ValueError: If any validation rule is violated or pyarrow is missing.
+        """
+        timestamps, values, _ = DataLoader._read_columnar(
+            file_path, [value_column] if value_column else None, timestamp_column, all_numeric=False
+        )
+        return pd.DataFrame({'timestamp': timestamps, 'value': values[0]}, copy=False)
 
-        # 1. Check for mandatory columns
+    @staticmethod
+    def load_columnar_multi(file_path, value_columns=None, timestamp_column=None):
+        """
+        Columnar counterpart of load_csv_multi; reads only the requested value
+        columns (all numeric columns if value_columns is None).
+        
+        Returns:
+            MultiSeries: Shared timestamps plus a (channels, n) float array.
+        """
+        timestamps, values, names = DataLoader._read_columnar(
+            file_path, value_columns, timestamp_column, all_numeric=True
+        )
+        block = np.empty((len(values), len(timestamps)), dtype=float)
+        for row, v in enumerate(values):
+            block[row] = v
+        return MultiSeries(timestamps=timestamps, values=block, columns=names)
+
+    @staticmethod
+    def _read_columnar(file_path, value_columns, timestamp_column, all_numeric):
+        """
+        Projects and validates columns of an Arrow-readable file.
+        
+        Returns:
+            tuple: (datetime64[ns] array, list of float arrays, list of value column names)
+        """
+        fmt = COLUMNAR_FORMATS.get(os.path.splitext(file_path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"Unsupported columnar format: {file_path}")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            import pyarrow.feather as feather
+        except ImportError:
+            raise ValueError("Reading Parquet/Feather/Arrow files requires pyarrow (pip install pyarrow).")
+            
+        # 1. Column roles from the schema alone (no data read yet)
+        try:
+            if fmt == 'parquet':
+                schema = pq.read_schema(file_path, memory_map=True)
+            else:
+                with pa.memory_map(file_path) as source:
+                    schema = pa.ipc.open_file(source).schema
+        except Exception as e:
+            raise ValueError(f"Failed to read {fmt} file: {e}")
+            
+        if timestamp_column is None:
+            temporal = [f.name for f in schema if pa.types.is_timestamp(f.type) or pa.types.is_date(f.type)]
+            if not temporal:
+                raise ValueError("No valid timestamp column found. Dataset REJECTED.")
+            timestamp_column = temporal[0]
+            
+        numeric = [f.name for f in schema if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)]
+        if value_columns is None:
+            value_columns = numeric if all_numeric else numeric[:1]
+        if not value_columns:
+            raise ValueError("No numeric value column found. Dataset REJECTED.")
+        for col in value_columns:
+            if col not in numeric:
+                raise ValueError(f"Column '{col}' is not a numeric column. Dataset REJECTED.")
+                
+        # 2. Projected read: only the needed columns are touched
+        columns = [timestamp_column] + list(value_columns)
+        try:
+            if fmt == 'parquet':
+                table = pq.read_table(file_path, columns=columns, memory_map=True)
+            elif fmt == 'feather':
+                table = feather.read_table(file_path, columns=columns, memory_map=True)
+            else:
+                with pa.memory_map(file_path) as source:
+                    table = pa.ipc.open_file(source).read_all().select(columns)
+        except Exception as e:
+            raise ValueError(f"Failed to read {fmt} file: {e}")
+            
+        # 3. Same rules as load_csv
+        ts_col = table.column(timestamp_column)
+        if ts_col.null_count:
+            raise ValueError("Missing timestamps detected. Dataset REJECTED.")
+        try:
+            ts_col = ts_col.cast(pa.timestamp('ns'))
+        except Exception as e:
+            raise ValueError(f"Unparseable timestamps in column '{timestamp_column}': {e}. Dataset REJECTED.")
+        timestamps = ts_col.to_numpy()
+        backwards = np.flatnonzero(timestamps[1:] < timestamps[:-1])
+        if len(backwards):
+            raise ValueError(f"Timestamps are not strictly ordered (row {backwards[0] + 2}). Dataset REJECTED.")
+            
+        values = []
+        for col in value_columns:
+            arr = table.column(col)
+            if arr.null_count:
+                raise ValueError(f"Missing numeric values in column '{col}'. Dataset REJECTED.")
+            # Zero-copy for a single float64 chunk, one conversion otherwise
+            values.append(np.asarray(arr.to_numpy(), dtype=float))
+            
+        return timestamps, values, list(value_columns)
+
+    @staticmethod
+    def load(file_path, cache=None, chunksize=None, resample=None, dtype=None, fingerprint=None, schema=None):
+        """
+        Loads a dataset through the optional binary cache.
+        
+        Columnar files (Parquet / Feather / Arrow IPC) are read directly with
+        load_columnar; they are already binary so they bypass the cache. For CSV,
+        on a cache hit the columns come back as memory-mapped arrays and no CSV
+        parsing happens; on a miss the file is parsed with load_csv and the
+        validated columns are stored for the next open.
+        
+        If resample is given, the validated series is reduced to the
+        open/high/low/close rows of each period (see Resampler), so peaks and
+        troughs survive while downstream work runs on a far smaller input.
+        The cache always holds the raw columns.
+        
+        Args:
+            file_path (str): Path to the CSV or columnar file.
+            cache (DatasetCache, optional): Cache to read from / write to.
+            chunksize (int, optional): Passed to load_csv on a miss.
+            resample (str, optional): Bucket period such as '1s' or '1min'.
+            dtype (np.dtype, optional): Value dtype; np.float32 halves memory.
+            fingerprint (str, optional): DatasetCache.fingerprint of the file, if
+                the caller already has it (it must be taken before parsing).
+            schema (CsvSchema, optional): Already sniffed schema of a CSV file.
+            
+        Returns:
+            TimeSeries: Validated series (int64 ns timestamps + values). Carries
+                raw_rows (row position in the file's data) when resampled, and
+                the file's DatasetCache fingerprint (qualified by resample / dtype).
+        """
+        from cpas.models.timeseries import TimeSeries
+        timestamps, values, fingerprint = DataLoader._load_raw(file_path, cache, chunksize, fingerprint, schema)
+        series = TimeSeries.from_arrays(timestamps, values, fingerprint=fingerprint)
+        if resample:
+            from cpas.core.resample import Resampler
+            series = Resampler.resample_series(series, resample)
+        if dtype is not None:
+            series = TimeSeries(series.time_index, series.values.astype(dtype, copy=False), series.raw_rows,
+                                f"{series.fingerprint}|dtype={np.dtype(dtype).name}")
+        return series
+
+    @staticmethod
+    def _load_raw(file_path, cache, chunksize, fingerprint=None, schema=None):
+        """
+        Returns validated (datetime64[ns] / int64 ns timestamps, values) arrays
+        plus the file's DatasetCache fingerprint.
+        """
+        from cpas.core.dataset_cache import DatasetCache
+        # Fingerprint BEFORE parsing so a concurrent write can't be cached under the new identity
+        if fingerprint is None:
+            fingerprint = DatasetCache.fingerprint(file_path)
+        if os.path.splitext(file_path)[1].lower() in COLUMNAR_FORMATS:
+            df = DataLoader.load_columnar(file_path)
+            return df['timestamp'].to_numpy(dtype='datetime64[ns]'), df['value'].to_numpy(), fingerprint
+            
+        if cache is not None:
+            hit = cache.get(file_path, fingerprint)
+            if hit is not None:
+                return hit + (fingerprint,)
+            
+        schema = schema or DataLoader.sniff_schema(file_path, fingerprint)
+        df = DataLoader.load_csv(file_path, chunksize=chunksize, schema=schema)
+        timestamps = df['timestamp'].to_numpy(dtype='datetime64[ns]')
+        values = df['value'].to_numpy(dtype=float)
+        if cache is not None:
+            cache.put(file_path, timestamps, values, fingerprint)
+        return timestamps, values, fingerprint
+
+    @staticmethod
+    def load_csv_chunked(file_path, chunksize=DEFAULT_CHUNKSIZE, schema=None):
+        """
+        Streaming variant of load_csv for files too large to parse in one go.
+        
+        The schema (timestamp column, primary value column) is sniffed from a
+        sample. The file is then read in bounded chunks restricted to those two
+        columns, each chunk is validated on its own (parseable timestamps,
+        ordering across chunk boundaries, missing values) and only its numpy
+        arrays are kept, so a full object-dtype DataFrame is never held.
+        
+        Args:
+            file_path (str): Path to the CSV file.
+            chunksize (int): Number of rows parsed per chunk.
+            schema (CsvSchema, optional): Already sniffed schema (see sniff_schema).
+            
+        Returns:
+            pd.DataFrame: Validated dataframe with 'timestamp' and 'value' columns.
+            
+        Raises:
+            ValueError: On the first violated rule, naming the 1-based data row.
+        """
+        schema = schema or DataLoader.sniff_schema(file_path)
+        timestamp_col = schema.timestamp_col
+        primary_value_col = schema.primary_value_col
+        
+        ts_parts = []
+        value_parts = []
+        last_ts = None
+        row_offset = 0
+        
+        try:
+            reader = pd.read_csv(file_path, usecols=[timestamp_col, primary_value_col], chunksize=chunksize)
+            for chunk in reader:
+                ts, values = DataLoader._validate_chunk(
+                    chunk[timestamp_col], chunk[primary_value_col], primary_value_col,
+                    schema.datetime_format, last_ts, row_offset
+                )
+                if len(ts):
+                    last_ts = ts[-1]
+                ts_parts.append(ts)
+                value_parts.append(values)
+                row_offset += len(chunk)
+        except ValueError as e:
+            if "REJECTED" in str(e):
+                raise
+            raise ValueError(f"Failed to read CSV: {e}")
+        except Exception as e:
+            raise ValueError(f"Failed to read CSV: {e}")
+            
+        # One copy into contiguous arrays
+        timestamps = np.concatenate(ts_parts) if ts_parts else np.empty(0, dtype='datetime64[ns]')
+        values = np.concatenate(value_parts) if value_parts else np.empty(0, dtype=float)
+        
+        return pd.DataFrame({'timestamp': timestamps, 'value': values}, copy=False)
+
+    # Detected schemas, LRU: (abs path, file identity) -> CsvSchema
+    _schemas = OrderedDict()
+    _schemas_lock = threading.Lock()
+
+    @staticmethod
+    def sniff_schema(file_path, fingerprint=None):
+        """
+        Detects column roles and the datetime format from the first SNIFF_ROWS rows.
+        
+        The result is remembered for the file's current contents: keyed by its
+        DatasetCache fingerprint if given, else by (size, mtime). A modified file
+        is sniffed again, so a stale datetime format is never reused. At most
+        SCHEMA_CACHE_SIZE schemas are kept.
+        
+        Args:
+            file_path (str): Path to the CSV file.
+            fingerprint (str, optional): DatasetCache.fingerprint of the file.
+            
+        Returns:
+            CsvSchema: Detected schema.
+            
+        Raises:
+            ValueError: If the sample violates the column rules.
+        """
+        source = os.path.abspath(file_path)
+        try:
+            if fingerprint is None:
+                st = os.stat(file_path)
+                key = (source, st.st_size, st.st_mtime_ns)
+            else:
+                key = (source, fingerprint)
+            with DataLoader._schemas_lock:
+                cached = DataLoader._schemas.get(key)
+                if cached is not None:
+                    DataLoader._schemas.move_to_end(key)
+                    return cached
+            sample = pd.read_csv(file_path, nrows=SNIFF_ROWS)
+        except Exception as e:
+            raise ValueError(f"Failed to read CSV: {e}")
+            
+        timestamp_col, numeric_cols = DataLoader._identify_columns(sample)
+        schema = CsvSchema(
+            columns=tuple(sample.columns),
+            timestamp_col=timestamp_col,
+            value_cols=numeric_cols,
+            datetime_format=DataLoader._infer_datetime_format(sample[timestamp_col])
+        )
+        with DataLoader._schemas_lock:
+            DataLoader._schemas[key] = schema
+            while len(DataLoader._schemas) > SCHEMA_CACHE_SIZE:
+                DataLoader._schemas.popitem(last=False)
+        return schema
+
+    @staticmethod
+    def _infer_datetime_format(sample):
+        """
+        Guesses an explicit strptime format from the sample and checks it against
+        every sampled value. Returns None if no single format fits.
+        """
+        non_null = sample.dropna()
+        if non_null.empty or not isinstance(non_null.iloc[0], str):
+            return None
+        # Month-first and day-first guesses from both ends of the sample
+        candidates = []
+        for value in (non_null.iloc[0], non_null.iloc[-1]):
+            for dayfirst in (False, True):
+                fmt = guess_datetime_format(value, dayfirst=dayfirst)
+                if fmt and fmt not in candidates:
+                    candidates.append(fmt)
+        for fmt in candidates:
+            try:
+                pd.to_datetime(non_null, format=fmt, utc=True)
+                return fmt
+            except (ValueError, TypeError):
+                continue
+        return None
+
+    @staticmethod
+    def _to_datetime(col, datetime_format=None):
+        """
+        Vectorized timestamp conversion. Uses the sniffed format when known and
+        falls back to pandas format inference if a later row doesn't follow it.
+        
+        Timestamps with a UTC offset are converted to UTC and returned naive
+        (like naive ones, which are taken as UTC), so every loader path yields
+        the same datetime64[ns] values whatever the file size or chunking.
+        
+        Raises:
+            ValueError: If the column can't be parsed as timestamps.
+        """
+        if datetime_format:
+            try:
+                return pd.to_datetime(col, format=datetime_format, utc=True).dt.tz_localize(None).dt.as_unit('ns')
+            except (ValueError, TypeError):
+                pass
+        try:
+            return pd.to_datetime(col, utc=True).dt.tz_localize(None).dt.as_unit('ns')
+        except (ValueError, TypeError) as e:
+            reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+            raise ValueError(f"Unparseable timestamps in column '{col.name}': {reason}. Dataset REJECTED.")
+
+    @staticmethod
+    def _identify_columns(df):
+        """
+        Identifies the timestamp column and the numeric value columns of a frame.
+        
+        Returns:
+            tuple: (timestamp_col, numeric_cols)
+        """
         # We expect strictly ONE timestamp column (datetime) and ONE numeric value column
         # To identify them, we can check dtypes, but user might have headers.
         # Strategy: Try to parse date columns.
@@ -50,7 +551,7 @@ class DataLoader:
             # Check if datetime or convertable
             try:
                 # Attempt conversion on a sample to speed up
-                pd.to_datetime(df[col], errors='raise')
+                pd.to_datetime(df[col], errors='raise', utc=True)
                 # If successful, this is a candidate
                 if timestamp_col is None:
                     timestamp_col = col
@@ -65,29 +566,45 @@ class DataLoader:
         if not numeric_cols:
             raise ValueError("No numeric value column found. Dataset REJECTED.")
             
-        # If multiple numeric columns, we take the first one as primary 'value' 
-        # but keep others as features if needed. For M1 Scope, let's strictly set primary.
-        primary_value_col = numeric_cols[0]
+        return timestamp_col, numeric_cols
+
+    @staticmethod
+    def _validate_chunk(ts_col, value_col, value_name, datetime_format, last_ts, row_offset):
+        """
+        Converts and validates one chunk of the timestamp / value columns.
         
-        # convert timestamp to actual datetime
-        df[timestamp_col] = pd.to_datetime(df[timestamp_col])
+        Returns:
+            tuple: (datetime64[ns] array, float array)
+        """
+        def row(i):
+            # 1-based data row number (header excluded)
+            return row_offset + int(i) + 1
         
-        # 2. Check strict ordering
-        if not df[timestamp_col].is_monotonic_increasing:
-             raise ValueError("Timestamps are not strictly ordered. Dataset REJECTED.")
-             
-        # 3. Check for missing values
-        if df[timestamp_col].isnull().any():
-            raise ValueError("Missing timestamps detected. Dataset REJECTED.")
+        try:
+            ts = DataLoader._to_datetime(ts_col, datetime_format)
+        except ValueError:
+            # Locate the first row that doesn't parse (with the sniffed format if known)
+            ts = pd.to_datetime(ts_col, format=datetime_format, errors='coerce', utc=True).dt.tz_localize(None).dt.as_unit('ns')
+        bad = ts.isnull().to_numpy()
+        if bad.any():
+            i = np.argmax(bad)
+            if pd.isnull(ts_col.iloc[i]):
+                raise ValueError(f"Missing timestamp at row {row(i)}. Dataset REJECTED.")
+            raise ValueError(f"Unparseable timestamp '{ts_col.iloc[i]}' at row {row(i)}. Dataset REJECTED.")
+        ts = ts.to_numpy(dtype='datetime64[ns]')
+        
+        if last_ts is not None and len(ts) and ts[0] < last_ts:
+            raise ValueError(f"Timestamps are not strictly ordered (row {row(0)}). Dataset REJECTED.")
+        backwards = np.flatnonzero(ts[1:] < ts[:-1])
+        if len(backwards):
+            raise ValueError(f"Timestamps are not strictly ordered (row {row(backwards[0] + 1)}). Dataset REJECTED.")
             
-        if df[primary_value_col].isnull().any():
-            # SRS: "Missing numeric values -> REJECT or INTERPOLATE (user-configurable)"
-            # Default to reject for now as per "Invalid datasets MUST produce explicit diagnostics."
-            raise ValueError(f"Missing numeric values in column '{primary_value_col}'. Dataset REJECTED.")
+        values = pd.to_numeric(value_col, errors='coerce')
+        bad = values.isnull().to_numpy()
+        if bad.any():
+            i = np.argmax(bad)
+            if pd.isnull(value_col.iloc[i]):
+                raise ValueError(f"Missing numeric value in column '{value_name}' at row {row(i)}. Dataset REJECTED.")
+            raise ValueError(f"Non-numeric value '{value_col.iloc[i]}' in column '{value_name}' at row {row(i)}. Dataset REJECTED.")
             
-        # Standardize columns
-        df = df.rename(columns={timestamp_col: 'timestamp', primary_value_col: 'value'})
-        
-        # Return cleaned df
-        return df[['timestamp', 'value']]
-
+        return ts, values.to_numpy(dtype=float)
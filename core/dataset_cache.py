@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+class DatasetCache:
+    """
+    Persistent binary cache of validated datasets.
+    Stores the 'timestamp' (int64 ns) and 'value' columns as .npy files that are
+    memory-mapped on reload, so re-opening a dataset skips CSV parsing entirely.
+
+    Entries are keyed by a fast fingerprint of the source file (size, mtime and a
+    hash of sampled blocks); a modified file gets a new key and its stale entry is
+    dropped. Total size is bounded with least-recently-used eviction.
+    """
+
+    SAMPLE_BYTES = 64 * 1024  # Bytes hashed from head, middle and tail
+
+    def __init__(self, cache_dir=None, max_bytes=2 * 1024 ** 3):
+        if cache_dir is None:
+            # Same base directory as the session database
+            cache_dir = os.path.join(os.path.expanduser("~"), "Documents", "CPAS", "cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def fingerprint(file_path):
+        """
+        Cheap identity of a file: size, mtime and a hash of three sampled blocks.
+        Cost is independent of the file size.
+        """
+        st = os.stat(file_path)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+
+        sample = DatasetCache.SAMPLE_BYTES
+        with open(file_path, 'rb') as f:
+            for offset in (0, max(0, st.st_size // 2 - sample // 2), max(0, st.st_size - sample)):
+                f.seek(offset)
+                h.update(f.read(sample))
+        return h.hexdigest()
+
+    def _key(self, file_path, fingerprint):
+        source = os.path.abspath(file_path)
+        return hashlib.blake2b(f"{source}|{fingerprint}".encode(), digest_size=16).hexdigest()
+
+    def get(self, file_path, fingerprint=None):
+        """
+        Returns (timestamps, values) as read-only memory-mapped arrays, or None on a miss.
+        Timestamps are int64 nanoseconds since the epoch.
+        """
+        if fingerprint is None:
+            fingerprint = self.fingerprint(file_path)
+        entry = os.path.join(self.cache_dir, self._key(file_path, fingerprint))
+
+        try:
+            timestamps = np.load(os.path.join(entry, "timestamp.npy"), mmap_mode='r')
+            values = np.load(os.path.join(entry, "value.npy"), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return timestamps, values
+
+    def put(self, file_path, timestamps, values, fingerprint=None):
+        """
+        Stores validated columns for file_path. Any older entry for the same
+        source is invalidated, then the cache is trimmed to max_bytes. Columns
+        larger than max_bytes on their own are not stored (eviction would only
+        delete them again).
+        """
+        if fingerprint is None:
+            fingerprint = self.fingerprint(file_path)
+        key = self._key(file_path, fingerprint)
+        entry = os.path.join(self.cache_dir, key)
+        source = os.path.abspath(file_path)
+
+        self._drop_source(source, keep=key)
+        if os.path.isdir(entry):
+            return
+        timestamps = np.asarray(timestamps).view(np.int64)
+        values = np.asarray(values)
+        if timestamps.nbytes + values.nbytes > self.max_bytes:
+            return
+
+        # Write into a temp dir and rename, so readers never see a partial entry
+        tmp = os.path.join(self.cache_dir, f".{key}.{os.getpid()}.tmp")
+        os.makedirs(tmp, exist_ok=True)
+        try:
+            np.save(os.path.join(tmp, "timestamp.npy"), timestamps)
+            np.save(os.path.join(tmp, "value.npy"), values)
+            with open(os.path.join(tmp, "meta.json"), 'w') as f:
+                json.dump({'source': source, 'fingerprint': fingerprint, 'rows': len(values),
+                           'created': time.time()}, f)
+            os.replace(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """Removes least-recently-used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for name, path in self._entries():
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(path) if e.is_file())
+                entries.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue # Removed concurrently (e.g. by another ingest worker)
+            total += size
+
+        entries.sort()
+        while total > self.max_bytes and entries:
+            _, size, path = entries.pop(0)
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for _, path in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _entries(self):
+        for e in os.scandir(self.cache_dir):
+            if e.is_dir() and not e.name.startswith('.'):
+                yield e.name, e.path
+
+    def _drop_source(self, source, keep=None):
+        """Invalidates entries built from an older version of source."""
+        for name, path in self._entries():
+            if name == keep:
+                continue
+            try:
+                with open(os.path.join(path, "meta.json")) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if meta.get('source') == source:
+                shutil.rmtree(path, ignore_errors=True)
@@ -1,5 +1,7 @@
 import numpy as np
 import pandas as pd
+from cpas.core.smoothing import Smoother
+from cpas.models.timeseries import TimeSeries
 
 class ExtremaDetector:
     """
@@ -8,15 +10,24 @@ class ExtremaDetector:
     """
     
     @staticmethod
-    def detect(values, prominence=0.1, distance=1, smoothing_window=0):
+    def detect(values, prominence=0.1, distance=1, smoothing_window=0, volatility=None, volatility_window=100,
+               smoothing_kernel='sma', fingerprint=None):
         """
         Detects peaks and troughs.
         
         Args:
-            values (np.array): Time series values.
-            prominence (float): Minimum absolute difference between peak and surrounding baseline.
+            values (np.array | TimeSeries): Time series values.
+            prominence (float): Minimum absolute difference between peak and surrounding baseline
+                (a multiple of the local volatility if 'volatility' is set).
             distance (int): Minimum number of indices between consecutive extrema of the same type.
-            smoothing_window (int): If > 0, applies simple moving average before detection.
+            smoothing_window (int): If > 1, smooths the series before detection.
+            volatility (str, optional): Adaptive threshold measure, 'std', 'range' or 'atr'
+                (see Volatility); each candidate then needs prominence * volatility at its position.
+            volatility_window (int): Rolling window of the volatility measure.
+            smoothing_kernel (str): 'sma', 'ema' or 'savgol' (see Smoother). The smoothed
+                series is cached per fingerprint, so repeated calls with other thresholds reuse it.
+            fingerprint (str, optional): Identity of the data for the smoothing cache
+                (default: the TimeSeries' fingerprint; arrays without one are not cached).
             
         Returns:
             dict: {
@@ -25,20 +36,15 @@ class ExtremaDetector:
                 'smoothed': [values] (or original if no smoothing)
             }
         """
-        # Ensure numpy array
+        # Ensure numpy array (float64 working copy, also for float32 series)
+        if isinstance(values, TimeSeries):
+            fingerprint = fingerprint or values.fingerprint
+            values = values.values
         y = np.array(values, dtype=float)
         
-        # 1. Smoothing
+        # 1. Smoothing (cached per series, kernel and window)
         if smoothing_window > 1:
-            kernel = np.ones(smoothing_window) / smoothing_window
-            # valid mode to avoid edge artifacts, but we want same length
-            # same mode equivalent in numpy convolve?
-            # 'same' mode:
-            y_smooth = np.convolve(y, kernel, mode='same')
-            # Edge correction (simple)
-            y = y_smooth
-        else:
-            y_smooth = y
+            y = Smoother.smooth(y, smoothing_window, smoothing_kernel, fingerprint=fingerprint)
             
         # 2. Local Extrema Detection (Naive)
         # We find indices where y[i-1] < y[i] > y[i+1]
@@ -48,22 +54,19 @@ class ExtremaDetector:
         if len(y) < 3:
             return {'peaks': [], 'troughs': [], 'smoothed': y}
             
-        dx = np.diff(y)
-        # Peaks: slope changes from + to -
-        # Troughs: slope changes from - to +
-        # Note: This doesn't handle flat tops perfectly, but M1 scope likely allows simplified logic.
-        
-        # indices of local max
-        peaks_indices = np.where((y[1:-1] > y[:-2]) & (y[1:-1] > y[2:]))[0] + 1
-        # indices of local min
-        troughs_indices = np.where((y[1:-1] < y[:-2]) & (y[1:-1] < y[2:]))[0] + 1
+        peaks_indices, troughs_indices = ExtremaDetector.find_candidates(y)
         
         # 3. Apply Prominence & Distance (Iterative Filtering)
         # This is complex to do vectorized without Scipy.
         # We will implement a simplified "greedy" approach for M1.
         
-        peaks_indices = ExtremaDetector._filter_by_prominence(y, peaks_indices, prominence, is_peak=True)
-        troughs_indices = ExtremaDetector._filter_by_prominence(y, troughs_indices, prominence, is_peak=False)
+        scale = None
+        if volatility is not None:
+            from cpas.core.volatility import Volatility
+            scale = Volatility.measure(y, volatility, volatility_window)
+        
+        peaks_indices = ExtremaDetector._filter_by_prominence(y, peaks_indices, prominence, is_peak=True, scale=scale)
+        troughs_indices = ExtremaDetector._filter_by_prominence(y, troughs_indices, prominence, is_peak=False, scale=scale)
         
         # 4. Distance Filtering
         # If multiple peaks are within 'distance', keep the highest.
@@ -77,104 +80,278 @@ class ExtremaDetector:
         }
 
     @staticmethod
-    def _filter_by_prominence(y, indices, threshold, is_peak=True):
-        """
-        Filters extrema by absolute prominence (simplified).
-        Checks if the extrema stands out by 'threshold' from its immediate neighbors 
-        (or a localized window).
-        Strict prominence definition requires contour mapping which is O(N^2) or O(N) with complex stack.
-        
-        For M1, we use a simpler heuristic:
-        The peak must be > (min of left_valley, right_valley) + threshold.
-        """
-        valid = []
-        for i in indices:
-            # Look left and right for the nearest points that are "significant valleys"
-            # This is hard to robustly define without full topographic prominence.
-            # Simplified: Check if it's the highest point in a small window?
-            # Or just check global range?
-            
-            # Let's use: deviation from specific local baseline?
-            # SRS: "Minimum prominence".
-            # Let's interpret as: Difference between the peak Value and the Max of the two adjacent troughs 
-            # (or Min of adjacent valleys for a peak).
-            
-            # Since we haven't identified adjacent troughs yet (we are filtering), 
-            # we can just assume a fixed window or verify strictly local drop.
+    def detect_batch(matrix, prominence=0.1, distance=1, smoothing_window=0, smoothing_kernel='sma'):
+        """
+        ExtremaDetector.detect for many aligned series at once.
+        
+        Rows are laid end to end, separated by +inf padding, and every stage
+        runs once over the whole block: smoothing and the candidate tests are
+        2D array operations, and the prominence sweep and distance filter run
+        over the concatenation. The padding is higher than any value (so no
+        base crosses into the next row) and wider than 'distance' (so no
+        distance window does either), which makes each row's result identical
+        to detect() on that row alone.
+        
+        Args:
+            matrix (np.array): (series, time) values.
+            prominence, distance, smoothing_window, smoothing_kernel: As in detect.
             
-            # Very simple check: y[i] must be > y[i-1] + threshold AND y[i] > y[i+1] + threshold? 
-            # No, that's just steepness.
+        Returns:
+            dict: {
+                'peaks': [indices] of all rows concatenated (time positions),
+                'peak_offsets': row r's peaks are peaks[peak_offsets[r]:peak_offsets[r + 1]],
+                'troughs', 'trough_offsets': same layout,
+                'smoothed': (series, time) values
+            }
+        """
+        y = np.array(matrix, dtype=float, ndmin=2)
+        if y.ndim != 2:
+            raise ValueError(f"Expected a 2D (series, time) array, got shape {y.shape}")
+        rows, n = y.shape
+        
+        # 1. Smoothing (all rows in one pass)
+        if smoothing_window > 1:
+            y = Smoother.smooth(y, smoothing_window, smoothing_kernel)
             
-            # Better: Local Range.
-            # We keep it simple: We allow all local maxima for now unless we do a full scan.
-            # But let's apply the threshold to the *value* itself relative to mean? No.
+        out = {'smoothed': y}
+        if n < 3:
+            for name in ('peaks', 'troughs'):
+                out[name] = np.empty(0, dtype=np.int64)
+                out[name[:-1] + '_offsets'] = np.zeros(rows + 1, dtype=np.int64)
+            return out
             
-            # Let's skip complex prominence in pure numpy for this step unless critical.
-            # However, SRS says "Configurable Minimum Prominence".
-            # We will implement a basic "Drop" check.
-            # Go left until we find a higher point or end. The min value in between is the 'key col'.
-            # Prominence = height - max(min_left_range, min_right_range) ?? 
-            # Standard definition: Vertical distance between the peak and the lowest contour line encircling it (but no higher peak).
+        # 2. Candidates of every row
+        mid = y[:, 1:-1]
+        peak_mask = (mid > y[:, :-2]) & (mid > y[:, 2:])
+        trough_mask = (mid < y[:, :-2]) & (mid < y[:, 2:])
+        
+        # 3. One flat sequence: row r occupies [r * stride, r * stride + n)
+        pad = max(1, int(distance))
+        stride = n + pad
+        flat = np.full((rows, stride), np.inf)
+        flat[:, :n] = y
+        flat = flat.ravel()
+        
+        # 4. Prominence: one pair of sweeps serves peaks and troughs of every row
+        r, t = np.nonzero(peak_mask | trough_mask)
+        cand = r * stride + t + 1
+        prom, _, _ = ExtremaDetector.compute_prominences(flat, cand)
+        is_peak_cand = peak_mask[r, t]
+        passed = prom >= prominence
+        
+        for name, is_peak in (('peaks', True), ('troughs', False)):
+            # 5. Distance over all rows at once
+            kept = cand[passed & (is_peak_cand == is_peak)]
+            kept = ExtremaDetector._filter_by_distance(flat, kept, distance, is_peak=is_peak)
             
-            # Implementation of robust prominence (O(N)):
-            # 1. Scan left: find first index j < i with y[j] > y[i]. Min value in y[j:i] is left_base.
-            # 2. Scan right: find first index k > i with y[k] > y[i]. Min value in y[i:k] is right_base.
-            # 3. Prominence = y[i] - max(left_base, right_base).
-            # If no higher point on one side, base is the global min on that side? (Or 0?)
+            # 6. Back to (row, time): compact offsets + values
+            row_of = kept // stride
+            out[name] = kept - row_of * stride
+            out[name[:-1] + '_offsets'] = np.searchsorted(row_of, np.arange(rows + 1)).astype(np.int64)
+        return out
+
+    @staticmethod
+    def find_candidates(y):
+        """
+        Strict local maxima and minima (y[i-1] < y[i] > y[i+1] and the reverse),
+        before any prominence or distance filtering.
+        
+        Returns:
+            tuple: (peak positions, trough positions)
+        """
+        # Peaks: slope changes from + to -
+        # Troughs: slope changes from - to +
+        # Note: This doesn't handle flat tops perfectly, but M1 scope likely allows simplified logic.
+        if len(y) < 3:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        
+        # indices of local max
+        peaks_indices = np.where((y[1:-1] > y[:-2]) & (y[1:-1] > y[2:]))[0] + 1
+        # indices of local min
+        troughs_indices = np.where((y[1:-1] < y[:-2]) & (y[1:-1] < y[2:]))[0] + 1
+        return peaks_indices, troughs_indices
+
+    @staticmethod
+    def _filter_by_prominence(y, indices, threshold, is_peak=True, scale=None):
+        """
+        Filters extrema by absolute prominence (see compute_prominences).
+        
+        Prominence of i = |y[i] - max(left_base, right_base)|, where each base is
+        the lowest point between i and the nearest strictly higher point on that
+        side (that point included), or the lowest point of the whole side if
+        nothing is higher. The same definition is applied to peaks and troughs.
+        
+        With scale (per-position volatility), the test is on prominence / scale[i].
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        prominences, _, _ = ExtremaDetector.compute_prominences(y, indices)
+        if scale is not None:
+            prominences = ExtremaDetector.scaled_prominences(prominences, scale[indices])
+        return indices[prominences >= threshold]
+
+    @staticmethod
+    def scaled_prominences(prominences, scale):
+        """
+        Prominence in units of the local volatility. Zero volatility (a flat
+        window) gives inf, so such candidates pass any threshold, as they would
+        against a threshold of 0 * prominence.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = prominences / scale
+        out[scale == 0] = np.inf
+        return out
+
+    @staticmethod
+    def compute_prominences(y, indices):
+        """
+        Prominence and left/right bases of every candidate in roughly one pass.
+        
+        The series is first compressed to the points that can matter: endpoints,
+        every point that is not strictly inside a monotone run, and each
+        candidate with its two neighbours. Any range minimum is attained at such
+        a point, and skipping a monotone point never changes which minimum lies
+        before the nearest higher point. A monotonic stack is then swept over
+        the compressed points once from each side.
+        
+        Args:
+            y (np.array): Series values.
+            indices (array-like): Candidate positions.
             
-            curr_val = y[i]
+        Returns:
+            tuple: (prominences, left_bases, right_bases) aligned with indices;
+                bases are positions in y (the candidate itself if that side is empty).
+        """
+        y = np.asarray(y, dtype=float)
+        indices = np.asarray(indices, dtype=np.int64)
+        n = len(y)
+        if len(indices) == 0:
+            return np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
             
-            # Left Scan
-            left_slice = y[:i]
-            higher_left = np.where(left_slice > curr_val)[0]
-            if len(higher_left) == 0:
-                # No higher peak to left. Base is min of all left.
-                left_base = np.min(left_slice) if len(left_slice) > 0 else curr_val
-            else:
-                nearest_higher = higher_left[-1]
-                left_base = np.min(y[nearest_higher:i])
+        # 1. Compress to turning points (+ candidates and their neighbours)
+        keep = np.zeros(n, dtype=bool)
+        keep[0] = keep[n - 1] = True
+        if n > 2:
+            a, b, c = y[:-2], y[1:-1], y[2:]
+            keep[1:-1] = ~(((a < b) & (b < c)) | ((a > b) & (b > c)))
+        keep[indices] = True
+        keep[np.maximum(indices - 1, 0)] = True
+        keep[np.minimum(indices + 1, n - 1)] = True
+        pos = np.flatnonzero(keep)
+        vals = y[pos].tolist()
+        m = len(vals)
+        
+        # 2. Sweep left-to-right and right-to-left
+        left_val, left_slot = ExtremaDetector._sweep_bases(vals, range(m))
+        right_val, right_slot = ExtremaDetector._sweep_bases(vals, range(m - 1, -1, -1))
+        
+        # 3. Gather candidates
+        slots = np.searchsorted(pos, indices)
+        left_val = np.asarray(left_val)[slots]
+        right_val = np.asarray(right_val)[slots]
+        prominences = np.abs(y[indices] - np.maximum(left_val, right_val))
+        left_bases = pos[np.asarray(left_slot, dtype=np.int64)[slots]]
+        right_bases = pos[np.asarray(right_slot, dtype=np.int64)[slots]]
+        return prominences, left_bases, right_bases
+
+    @staticmethod
+    def _sweep_bases(vals, order):
+        """
+        Monotonic-stack sweep over slots in the given order.
+        For each slot: the minimum from its nearest strictly higher slot (inclusive)
+        up to the slot itself (exclusive), or over everything before it if no
+        slot is higher, or its own value if nothing comes before it.
+        
+        Returns:
+            tuple: (base values, base slots) as lists indexed by slot.
+        """
+        m = len(vals)
+        base_val = [0.0] * m
+        base_slot = [0] * m
+        inf = float('inf')
+        
+        # Stack of slots with strictly decreasing values; each entry also keeps
+        # the minimum of everything between it and the entry below it
+        st_val, st_slot, st_min, st_min_slot = [], [], [], []
+        for s in order:
+            v = vals[s]
+            mn, mn_slot = inf, s
+            while st_val and st_val[-1] <= v:
+                # Popped entry and its covered range lie between s and its higher point
+                if st_min[-1] < mn:
+                    mn, mn_slot = st_min[-1], st_min_slot[-1]
+                if st_val[-1] < mn:
+                    mn, mn_slot = st_val[-1], st_slot[-1]
+                st_val.pop(); st_slot.pop(); st_min.pop(); st_min_slot.pop()
                 
-            # Right Scan
-            right_slice = y[i+1:]
-            higher_right = np.where(right_slice > curr_val)[0]
-            if len(higher_right) == 0:
-                right_base = np.min(right_slice) if len(right_slice) > 0 else curr_val
+            if st_val and st_val[-1] < mn:
+                # Nothing between s and its higher point: the higher point is the base
+                base_val[s], base_slot[s] = st_val[-1], st_slot[-1]
+            elif mn == inf:
+                base_val[s], base_slot[s] = v, s # Empty side
             else:
-                nearest_higher = higher_right[0] + (i + 1)
-                right_base = np.min(y[i+1:nearest_higher+1])
-            
-            base = max(left_base, right_base)
-            prom = abs(curr_val - base)
-            
-            if prom >= threshold:
-                valid.append(i)
+                base_val[s], base_slot[s] = mn, mn_slot
                 
-        return np.array(valid)
+            st_val.append(v); st_slot.append(s); st_min.append(mn); st_min_slot.append(mn_slot)
+            
+        return base_val, base_slot
 
     @staticmethod
     def _filter_by_distance(y, indices, distance, is_peak=True):
         """
-        Greedy distance filtering.
+        Greedy distance filtering: visiting extrema from strongest to weakest,
+        keep one unless an already kept extremum lies closer than 'distance'.
+        
+        Only candidates with a neighbour closer than 'distance' can affect each
+        other, so isolated ones are kept directly. For the rest, the neighbours
+        within 'distance' of every candidate are found up front with binary
+        search over the sorted positions (O(k log k)); the greedy pass then only
+        checks that small window instead of every kept index.
+        
+        Equal values are broken by position: the later of two tied peaks and
+        the earlier of two tied troughs wins, whatever the input order.
+        
+        >>> y = np.array([0., 5., 0., 5., 0.])
+        >>> ExtremaDetector._filter_by_distance(y, np.array([3, 1]), 3, is_peak=True).tolist()
+        [3]
+        >>> ExtremaDetector._filter_by_distance(-y, np.array([3, 1]), 3, is_peak=False).tolist()
+        [1]
         """
         if len(indices) == 0:
             return indices
             
+        indices = np.asarray(indices)
+        
+        # Isolated candidates (gap >= distance on both sides) are always kept
+        by_pos = np.sort(indices)
+        close = np.diff(by_pos) < distance
+        crowded = np.zeros(len(by_pos), dtype=bool)
+        crowded[1:] |= close
+        crowded[:-1] |= close
+        if not crowded.any():
+            return by_pos.astype(np.int64)
+            
         # Sort by value (descending for peaks, ascending for troughs)
-        # We prioritize the "strongest" extrema.
+        # We prioritize the "strongest" extrema. Ties are broken by position
+        # (later first for peaks, earlier first for troughs), so the order never
+        # depends on how the candidate array happens to be laid out.
+        order = np.lexsort((indices, y[indices]))
         if is_peak:
-            sorted_idx = indices[np.argsort(y[indices])[::-1]]
+            sorted_idx = indices[order[::-1]]
         else:
-            sorted_idx = indices[np.argsort(y[indices])]
-            
-        keep = []
-        for idx in sorted_idx:
-            # If this idx is within 'distance' of any already kept idx, skip
-            is_too_close = False
-            for k in keep:
-                if abs(idx - k) < distance:
-                    is_too_close = True
-                    break
-            if not is_too_close:
-                keep.append(idx)
+            sorted_idx = indices[order]
+        positions = by_pos[crowded]
+        sorted_idx = sorted_idx[np.isin(sorted_idx, positions)]
+        
+        # Rank of each candidate among the sorted positions, and the rank window
+        # of positions strictly closer than 'distance'
+        ranks = np.searchsorted(positions, sorted_idx)
+        lo = np.searchsorted(positions, sorted_idx - distance, side='right')
+        hi = np.searchsorted(positions, sorted_idx + distance, side='left')
+        
+        kept = bytearray(len(positions))
+        for r, a, b in zip(ranks.tolist(), lo.tolist(), hi.tolist()):
+            if kept.find(1, a, b) < 0:
+                kept[r] = 1
                 
-        return np.sort(keep)
+        keep = positions[np.frombuffer(bytes(kept), dtype=np.uint8).astype(bool)]
+        return np.sort(np.concatenate([by_pos[~crowded], keep]).astype(np.int64))
@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from cpas.core.extrema import ExtremaDetector
+from cpas.core.parallel_extrema import ParallelExtremaDetector
+from cpas.models.timeseries import TimeSeries
+
+class ExtremaHierarchy:
+    """
+    Every extremum candidate of a series ranked by prominence, computed once.
+
+    A candidate's prominence does not depend on the threshold, so the set that
+    passes any threshold is a suffix of the ranking: a binary search instead of
+    a new detection. Only the distance filter (which depends on which
+    neighbours survive) is re-run, on the surviving candidates alone.
+    cut(p) returns exactly what ExtremaDetector.detect(values, p, ...) returns.
+    """
+
+    # Recent cuts kept (slider positions are revisited while dragging)
+    CACHE_SIZE = 32
+
+    def __init__(self, values, distance=1, smoothing_window=0, max_workers=None, volatility=None, volatility_window=100,
+                 smoothing_kernel='sma', fingerprint=None):
+        """
+        Args:
+            values (np.array | TimeSeries): Series values.
+            distance (int): Distance filter applied to every cut.
+            smoothing_window (int): Same meaning as in ExtremaDetector.detect.
+            max_workers (int, optional): Process pool size for long series (default: CPU count).
+            volatility (str, optional): Rank by prominence / local volatility instead
+                (see ExtremaDetector.detect); cut thresholds are then multiples of it.
+            volatility_window (int): Rolling window of the volatility measure.
+            smoothing_kernel (str): Same meaning as in ExtremaDetector.detect.
+            fingerprint (str, optional): Same meaning as in ExtremaDetector.detect.
+        """
+        if isinstance(values, TimeSeries):
+            fingerprint = fingerprint or values.fingerprint
+            values = values.values
+        self.values = np.asarray(values)
+        self.distance = distance
+        self.smoothing_window = smoothing_window
+        self.smoothing_kernel = smoothing_kernel
+
+        # Long series are split across processes (see ParallelExtremaDetector)
+        y, levels = ParallelExtremaDetector.prominences(values, smoothing_window, max_workers=max_workers,
+                                                         smoothing_kernel=smoothing_kernel, fingerprint=fingerprint)
+        self.smoothed = y
+
+        scale = None
+        if volatility is not None:
+            from cpas.core.volatility import Volatility
+            scale = Volatility.measure(y, volatility, volatility_window)
+
+        # Per type: positions and prominences, ascending by prominence
+        self._levels = {}
+        for name, (cand, prom) in levels.items():
+            if scale is not None:
+                prom = ExtremaDetector.scaled_prominences(prom, scale[cand])
+            order = np.argsort(prom, kind='stable')
+            self._levels[name] = (cand[order], prom[order])
+        self._cuts = OrderedDict()
+
+    def __len__(self):
+        """Number of candidates (peaks + troughs) in the hierarchy."""
+        return sum(len(pos) for pos, _ in self._levels.values())
+
+    def prominences(self, kind='peaks'):
+        """
+        Returns:
+            tuple: (positions, prominences) of one candidate type, ascending by prominence.
+        """
+        return self._levels[kind]
+
+    def count(self, prominence):
+        """Number of (peak, trough) candidates passing the prominence test (before the distance filter)."""
+        return tuple(len(prom) - int(np.searchsorted(prom, prominence, side='left'))
+                     for _, prom in self._levels.values())
+
+    def cut(self, prominence):
+        """
+        Extrema for one prominence threshold.
+
+        Returns:
+            dict: {'peaks': [indices], 'troughs': [indices]} as from ExtremaDetector.detect
+                (shared with the cache; do not modify).
+        """
+        key = float(prominence)
+        if key in self._cuts:
+            self._cuts.move_to_end(key)
+            return self._cuts[key]
+
+        out = {}
+        for name, is_peak in (('peaks', True), ('troughs', False)):
+            pos, prom = self._levels[name]
+            # Everything from the first prominence >= threshold on passes
+            k = int(np.searchsorted(prom, prominence, side='left'))
+            passed = np.sort(pos[k:])
+            out[name] = ExtremaDetector._filter_by_distance(self.smoothed, passed, self.distance, is_peak=is_peak)
+
+        self._cuts[key] = out
+        if len(self._cuts) > self.CACHE_SIZE:
+            self._cuts.popitem(last=False)
+        return out
+
+    def cut_chain(self, prominence, previous=None):
+        """
+        cut() plus the WidgetChain built from it.
+
+        Args:
+            prominence (float): Threshold.
+            previous (WidgetChain, optional): The chain currently shown; if given,
+                the new chain is derived from it (WidgetGenerator.update_chain)
+                and the changed widget ranges are reported.
+
+        Returns:
+            dict: {'peaks', 'troughs', 'chain'}, plus 'changes' (see
+                WidgetGenerator.update_chain) when previous is given.
+        """
+        from cpas.core.widgets import WidgetGenerator
+        res = self.cut(prominence)
+        out = {'peaks': res['peaks'], 'troughs': res['troughs']}
+        if previous is not None:
+            if res.get('chain') is previous:
+                out['changes'] = []
+            else:
+                res['chain'], out['changes'] = WidgetGenerator.update_chain(previous, self.values, res['peaks'], res['troughs'])
+        elif 'chain' not in res:
+            # Cached with the cut, so revisiting a slider position is free
+            res['chain'] = WidgetGenerator.generate_chain(self.values, res['peaks'], res['troughs'])
+        out['chain'] = res['chain']
+        return out
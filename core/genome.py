@@ -12,7 +12,22 @@ class GenomeEngine:
     def __init__(self, extrema_indices: List[int], total_ticks: int):
         self.extrema = np.array(sorted(extrema_indices))
         self.total_ticks = total_ticks
-        
+
+    def replace_tail(self, extrema_indices, since: int, total_ticks: int):
+        """
+        Replaces the extrema at index >= since (live data only changes the
+        tail), so a follow batch does not re-sort every extremum.
+
+        Args:
+            extrema_indices (array-like): Extrema at index >= since (any order).
+            since (int): First index whose extrema may have changed.
+            total_ticks (int): New series length.
+        """
+        keep = np.searchsorted(self.extrema, since)
+        tail = np.sort(np.asarray(extrema_indices, dtype=self.extrema.dtype))
+        self.extrema = np.concatenate([self.extrema[:keep], tail])
+        self.total_ticks = total_ticks
+
     def find_nearest_extrema(self, target_idx: float, search_radius: float) -> Tuple[Optional[int], float]:
         """
         Finds the nearest extrema index to target_idx within radius.
@@ -0,0 +1,389 @@
+import bisect
+
+import numpy as np
+
+from cpas.core.smoothing import Smoother
+from cpas.models.timeseries import TimeSeries
+
+INF = float('inf')
+
+class _DistanceTrack:
+    """
+    Distance-filter state for one extremum type (peaks or troughs).
+
+    Members are candidates whose prominence test is final, kept sorted by
+    position. A member's kept/rejected status is final once no future change
+    (new candidates at the tail, undecided candidates joining) can reach it
+    through a chain of lower-priority neighbours closer than 'distance'.
+    """
+
+    def __init__(self, is_peak):
+        self.is_peak = is_peak
+        self.pos = []
+        self.val = []
+        self.kept = bytearray()
+        self.final = bytearray()
+        self.pending = set() # Positions of non-final members
+
+    def key(self, pos, val):
+        """Greedy priority (higher first), same order as ExtremaDetector._filter_by_distance."""
+        return (val, pos) if self.is_peak else (-val, -pos)
+
+    def add(self, pos, val):
+        i = bisect.bisect_left(self.pos, pos)
+        self.pos.insert(i, pos)
+        self.val.insert(i, val)
+        self.kept.insert(i, 0)
+        self.final.insert(i, 0)
+        self.pending.add(pos)
+
+    def window(self, p, distance):
+        """Member index range with |pos - p| < distance."""
+        return bisect.bisect_right(self.pos, p - distance), bisect.bisect_left(self.pos, p + distance)
+
+    def influence(self, frontier, uncertain, distance):
+        """
+        Indices of members whose status may still change: members near the
+        frontier (future candidates have unknown priority), members below an
+        undecided candidate, and everything reachable from those through
+        lower-priority neighbours.
+        """
+        seen = set(range(bisect.bisect_right(self.pos, frontier - distance), len(self.pos)))
+        todo = list(seen)
+        for p, v in uncertain:
+            k = self.key(p, v)
+            a, b = self.window(p, distance)
+            for j in range(a, b):
+                if j not in seen and self.key(self.pos[j], self.val[j]) < k:
+                    seen.add(j)
+                    todo.append(j)
+
+        while todo:
+            i = todo.pop()
+            k = self.key(self.pos[i], self.val[i])
+            a, b = self.window(self.pos[i], distance)
+            for j in range(a, b):
+                if j != i and j not in seen and self.key(self.pos[j], self.val[j]) < k:
+                    seen.add(j)
+                    todo.append(j)
+        return seen
+
+    def solve(self, distance, frontier, uncertain, extras):
+        """
+        Re-runs the greedy pass for non-final members plus this snapshot's
+        tentative extras, then finalizes members outside the influence set.
+
+        Returns:
+            tuple: (newly confirmed kept positions, tentative kept positions)
+        """
+        infl = self.influence(frontier, uncertain, distance)
+        redo = infl | {bisect.bisect_left(self.pos, p) for p in self.pending}
+
+        items = [(self.key(self.pos[i], self.val[i]), self.pos[i], i) for i in redo]
+        items += [(self.key(p, v), p, -1) for p, v in extras]
+        items.sort(reverse=True)
+        for i in redo:
+            self.kept[i] = 0
+
+        extra_kept = []
+        for _, p, i in items:
+            a, b = self.window(p, distance)
+            if self.kept.find(1, a, b) >= 0 or any(abs(p - q) < distance for q in extra_kept):
+                continue
+            if i >= 0:
+                self.kept[i] = 1
+            else:
+                extra_kept.append(p)
+
+        confirmed = []
+        for i in redo - infl:
+            self.final[i] = 1
+            if self.kept[i]:
+                confirmed.append(self.pos[i])
+        self.pending = {self.pos[i] for i in infl}
+
+        tentative = [self.pos[i] for i in infl if self.kept[i]] + extra_kept
+        self.extra_kept = extra_kept
+        return sorted(confirmed), sorted(tentative)
+
+    def kept_positions(self):
+        pos = np.asarray(self.pos, dtype=np.int64)
+        mask = np.frombuffer(bytes(self.kept), dtype=np.uint8).astype(bool)
+        return np.sort(np.concatenate([pos[mask], np.asarray(getattr(self, 'extra_kept', []), dtype=np.int64)]))
+
+class IncrementalExtremaDetector:
+    """
+    Stateful counterpart of ExtremaDetector.detect for data that keeps growing.
+
+    Appended samples are streamed once through two stacks: the left-base stack
+    of the prominence sweep (everything needed for future left bases) and the
+    candidates whose right side is still open, with the running minimum after
+    each of them. A candidate's prominence test becomes final when a strictly
+    higher point closes it, when it already passes (an open base can only
+    drop), or when its right base fell below its left base (the prominence is
+    then fixed). The distance filter is re-solved only for members that future
+    data can still affect.
+
+    The moving average is computed from running prefix sums (Smoother.sma),
+    which continue across batches exactly. The last (window-1)//2 smoothed
+    values and the unconfirmed tail are simulated on every append and rolled
+    back, so result() always equals a full ExtremaDetector.detect (default
+    'sma' kernel) over all samples seen so far.
+    """
+
+    def __init__(self, prominence=0.1, distance=1, smoothing_window=0):
+        self.prominence = prominence
+        self.distance = distance
+        self.window = smoothing_window if smoothing_window > 1 else 1
+        self.n = 0              # Raw samples appended
+        # Smoothing context from _ctx_offset on: raw values (no smoothing), or
+        # Smoother.prefix_sums of the raw values relative to the first sample
+        self._ctx = np.empty(0) if self.window == 1 else np.zeros(1)
+        self._ctx_offset = 0
+        self._base = None
+        self._m = 0             # Smoothed values that are final
+        self._z = np.empty(0)   # Final smoothed values from _z_offset on
+        self._z_offset = 0
+        self._f = 0             # Next position to stream through the stacks
+        self._left = []         # Left-base stack: (value, min since entry below)
+        self._open = []         # Undecided candidates: (value, pos, min after, left base, is_peak)
+        self._journal = None
+        self._tracks = {True: _DistanceTrack(True), False: _DistanceTrack(False)}
+        self._last = {'confirmed_peaks': [], 'confirmed_troughs': [], 'tentative_peaks': [], 'tentative_troughs': []}
+
+    def append(self, values):
+        """
+        Adds samples and updates the detection.
+
+        Args:
+            values (array-like | TimeSeries): New raw samples.
+
+        Returns:
+            dict: {
+                'confirmed_peaks', 'confirmed_troughs': positions that became final with this batch,
+                'tentative_peaks', 'tentative_troughs': current non-final positions (replace the previous ones)
+            }
+        """
+        if isinstance(values, TimeSeries):
+            values = values.values
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return {**self._last, 'confirmed_peaks': [], 'confirmed_troughs': []}
+
+        if self.window == 1:
+            self._ctx = np.concatenate([self._ctx, values])
+        else:
+            if self._base is None:
+                self._base = float(values[0])
+            prefix = Smoother.prefix_sums(values, self._base, start=self._ctx[-1])
+            self._ctx = np.concatenate([self._ctx, prefix[1:]])
+        self.n += len(values)
+
+        # 1. Smoothed values that can no longer change
+        m = max(0, self.n - (self.window - 1) // 2)
+        if m > self._m:
+            self._z = np.concatenate([self._z, self._smoothed(self._m, m)])
+            self._m = m
+
+        # 2. Stream final points (each needs its right neighbour for the candidate test)
+        if self._m - 1 > self._f:
+            self._feed(self._z, self._z_offset, self._f, self._m - 1, self._m, None)
+            self._f = self._m - 1
+        self._decide_open()
+        self._trim()
+
+        # 3. Snapshot: simulate the provisional tail on top of the committed state
+        extras = {True: [], False: []}
+        uncertain = {True: [], False: []}
+        for val, pos, _, _, is_peak in self._open:
+            uncertain[is_peak].append((pos, val))
+        tail = np.concatenate([self._z, self._smoothed(self._m, self.n)])
+
+        self._journal = []
+        try:
+            self._feed(tail, self._z_offset, self._f, self.n, self.n, extras)
+            self._close_all(extras)
+        finally:
+            self._rollback()
+
+        # 4. Distance filter
+        out = {}
+        for is_peak, name in ((True, 'peaks'), (False, 'troughs')):
+            confirmed, tentative = self._tracks[is_peak].solve(
+                self.distance, self._f, uncertain[is_peak], extras[is_peak])
+            out[f'confirmed_{name}'] = confirmed
+            out[f'tentative_{name}'] = tentative
+        self._last = out
+        return out
+
+    @property
+    def frontier(self):
+        """
+        Position below which the detection is final: the confirmed positions
+        there are exactly ExtremaDetector.detect's, whatever data follows.
+        Bounded by the next position to stream, undecided candidates and
+        distance-filter members whose status may still change.
+        """
+        undecided = [pos for _, pos, _, _, _ in self._open]
+        pending = [*self._tracks[True].pending, *self._tracks[False].pending]
+        return min([self._f, *undecided, *pending])
+
+    def result(self):
+        """
+        Current peaks and troughs; equal to ExtremaDetector.detect over every
+        sample appended so far.
+        """
+        return {
+            'peaks': self._tracks[True].kept_positions(),
+            'troughs': self._tracks[False].kept_positions(),
+        }
+
+    def _smoothed(self, start, stop):
+        if stop <= start:
+            return np.empty(0)
+        if self.window == 1:
+            return self._ctx[start - self._ctx_offset:stop - self._ctx_offset].copy()
+        return Smoother.sma_from_prefix(self._ctx, self._base, self.window, self.n, start, stop, offset=self._ctx_offset)
+
+    def _trim(self):
+        """Drops context that no future computation needs."""
+        # Raw value / prefix sum index of the first window still to be computed
+        keep_ctx = max(0, self._m - self.window // 2)
+        if keep_ctx > self._ctx_offset:
+            self._ctx = self._ctx[keep_ctx - self._ctx_offset:].copy()
+            self._ctx_offset = keep_ctx
+        keep_z = max(0, self._f - 1) # Look-behind for the next candidate test
+        if keep_z > self._z_offset:
+            self._z = self._z[keep_z - self._z_offset:].copy()
+            self._z_offset = keep_z
+
+    def _feed(self, seq, seq_offset, p0, p1, end, extras):
+        """
+        Streams positions [p0, p1) of seq (values from seq_offset on) through
+        both stacks. end is the current series length (for the candidate test).
+        Decisions are committed to the distance tracks, or collected in extras
+        during a simulation.
+        """
+        v = seq[p0 - seq_offset:p1 - seq_offset]
+        prev = np.full(len(v), np.nan)
+        nxt = np.full(len(v), np.nan)
+        lo = max(p0, 1)
+        prev[lo - p0:] = seq[lo - 1 - seq_offset:p1 - 1 - seq_offset]
+        hi = min(p1, end - 1)
+        nxt[:hi - p0] = seq[p0 + 1 - seq_offset:hi + 1 - seq_offset]
+
+        cand = np.where((v > prev) & (v > nxt), 1, np.where((v < prev) & (v < nxt), -1, 0))
+        # Strictly monotone points never matter for bases (see compute_prominences),
+        # unless next to a candidate; batch edges are always kept
+        turning = ~(((prev < v) & (v < nxt)) | ((prev > v) & (v > nxt)))
+        keep = turning.copy()
+        keep[1:] |= turning[:-1]
+        keep[:-1] |= turning[1:]
+        keep[[0, -1]] = True
+
+        left, opened, thr = self._left, self._open, self.prominence
+        for p, val, c in zip(np.arange(p0, p1)[keep].tolist(), v[keep].tolist(), cand[keep].tolist()):
+            # Left base: min back to the nearest strictly higher point
+            mn = INF
+            while left and left[-1][0] <= val:
+                lv, lmin = self._pop(left)
+                mn = min(mn, lv, lmin)
+            if left:
+                lb = min(mn, left[-1][0])
+            else:
+                lb = val if mn == INF else mn
+            self._push(left, (val, mn))
+
+            # Close open candidates that this point rises above
+            while opened and opened[-1][0] < val:
+                ov, opos, oafter, olb, opeak = self._pop(opened)
+                rb = min(oafter, val)
+                if abs(ov - max(olb, rb)) >= thr:
+                    self._accept(opos, ov, opeak, extras)
+                if opened:
+                    top = opened[-1]
+                    self._set_top(opened, top[:2] + (min(top[2], ov, oafter),) + top[3:])
+            if opened and val < opened[-1][2]:
+                top = opened[-1]
+                self._set_top(opened, top[:2] + (val,) + top[3:])
+
+            if c:
+                self._push(opened, (val, p, INF, lb, c == 1))
+
+    def _accept(self, pos, val, is_peak, extras):
+        if extras is None:
+            self._tracks[is_peak].add(pos, val)
+        else:
+            extras[is_peak].append((pos, val))
+
+    def _decide_open(self):
+        """
+        Settles open candidates whose prominence test can no longer change:
+        already passing (the right base only drops while open) or right base
+        at/below the left base (prominence is then fixed).
+        """
+        after = self._right_minima()
+        kept = []
+        for entry, rb in zip(self._open, after):
+            val, pos, oafter, lb, is_peak = entry
+            decided = False
+            if rb != INF:
+                prom = abs(val - max(lb, rb))
+                if prom >= self.prominence:
+                    self._tracks[is_peak].add(pos, val)
+                    decided = True
+                elif rb <= lb:
+                    decided = True
+            if decided:
+                # Its value and range now belong to the range after the entry below
+                if kept:
+                    below = kept[-1]
+                    kept[-1] = below[:2] + (min(below[2], val, oafter),) + below[3:]
+            else:
+                kept.append(entry)
+        self._open = kept
+
+    def _close_all(self, extras):
+        """End of data: open candidates take the minimum of everything after them."""
+        for (val, pos, _, lb, is_peak), rb in zip(self._open, self._right_minima()):
+            if rb == INF:
+                rb = val # Nothing after it
+            if abs(val - max(lb, rb)) >= self.prominence:
+                extras[is_peak].append((pos, val))
+
+    def _right_minima(self):
+        """Minimum of all streamed points after each open candidate."""
+        out = [INF] * len(self._open)
+        run = INF
+        for i in range(len(self._open) - 1, -1, -1):
+            val, _, oafter, _, _ = self._open[i]
+            out[i] = min(oafter, run)
+            run = min(run, val, oafter)
+        return out
+
+    # Stack mutations go through these so a simulation can be rolled back
+    def _pop(self, st):
+        e = st.pop()
+        if self._journal is not None:
+            self._journal.append((st, 0, e))
+        return e
+
+    def _push(self, st, e):
+        st.append(e)
+        if self._journal is not None:
+            self._journal.append((st, 1, None))
+
+    def _set_top(self, st, e):
+        if self._journal is not None:
+            self._journal.append((st, 2, st[-1]))
+        st[-1] = e
+
+    def _rollback(self):
+        for st, op, e in reversed(self._journal):
+            if op == 0:
+                st.append(e)
+            elif op == 1:
+                st.pop()
+            else:
+                st[-1] = e
+        self._journal = None
@@ -0,0 +1,149 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from cpas.core.data_loader import DataLoader
+
+class CsvFollower:
+    """
+    Follows a CSV file that is still being appended to (e.g. a live recorder).
+    Only bytes written since the last poll are parsed; every batch is validated
+    against the rows already seen and pushed to the subscribed consumers.
+    """
+
+    def __init__(self, file_path, schema=None, offset=None, last_timestamp=None, row_offset=0):
+        """
+        Args:
+            file_path (str): CSV being appended to.
+            schema (CsvSchema, optional): Column roles; sniffed if omitted.
+            offset (int, optional): Byte offset already consumed (default: current file size).
+                May be the file size recorded before the dataset was parsed; rows
+                appended while parsing are then re-read, and the ones already
+                loaded (see row_offset) are skipped.
+            last_timestamp (np.datetime64, optional): Last loaded timestamp, so the
+                first new rows are checked for ordering against it.
+            row_offset (int): Data rows already loaded. With an explicit offset,
+                the re-read rows beyond the offset's row count are skipped.
+        """
+        self.file_path = file_path
+        self.schema = schema or DataLoader.sniff_schema(file_path)
+        if offset is None:
+            self.offset = os.path.getsize(file_path)
+        else:
+            # A size recorded mid-write may split a line: resume from its start
+            self.offset = CsvFollower._line_start(file_path, offset)
+        self.last_timestamp = last_timestamp
+        self.row_offset = row_offset
+        # Rows between offset and the end of the load were already delivered.
+        # They are skipped by count: new rows may repeat the last timestamp.
+        self._skip = 0
+        if offset is not None:
+            self._skip = max(0, row_offset - CsvFollower._count_rows(file_path, self.offset))
+        self._subscribers = []
+
+    @staticmethod
+    def _line_start(file_path, offset, block=64 * 1024):
+        """Start of the line containing byte offset (offset itself if a line starts there)."""
+        with open(file_path, 'rb') as f:
+            end = offset
+            while end > 0:
+                start = max(0, end - block)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b'\n')
+                if newline >= 0:
+                    return start + newline + 1
+                end = start
+        return 0
+
+    @staticmethod
+    def _count_rows(file_path, offset, block=1 << 20):
+        """
+        Data rows in the first offset bytes (offset at a line start): non-blank
+        lines minus the header, as read_csv counts them.
+        """
+        lines = 0
+        tail = b'\n\n' # Two bytes before each block; the file start acts as a line start
+        with open(file_path, 'rb') as f:
+            remaining = offset
+            while remaining > 0:
+                chunk = f.read(min(block, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                buf = np.frombuffer(tail + chunk, dtype=np.uint8)
+                nl = buf[2:] == 10
+                # A line is blank if its newline follows a newline (or "\r" after one)
+                blank = nl & ((buf[1:-1] == 10) | ((buf[1:-1] == 13) & (buf[:-2] == 10)))
+                lines += int(nl.sum()) - int(blank.sum())
+                tail = bytes(buf[-2:])
+        return max(0, lines - 1)
+
+    def subscribe(self, callback):
+        """Registers callback(timestamps, values), called for every appended batch."""
+        self._subscribers.append(callback)
+
+    def poll(self):
+        """
+        Parses rows appended since the last poll and pushes them to subscribers.
+        A trailing partial line is left for the next poll.
+
+        Returns:
+            tuple: (datetime64[ns] array, float array) of new rows, or None if nothing complete was appended.
+
+        Raises:
+            ValueError: If the file shrank or a new row breaks a validation rule.
+                The offset is not advanced, so the bad batch is never half-applied.
+        """
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:
+            raise ValueError("Followed file was truncated or replaced. Reload the dataset.")
+        if size == self.offset:
+            return None
+
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+
+        end = data.rfind(b'\n')
+        if end < 0:
+            return None # Writer is mid-line
+        data = data[:end + 1]
+
+        schema = self.schema
+        try:
+            df = pd.read_csv(
+                io.BytesIO(data), header=None, names=list(schema.columns),
+                usecols=[schema.timestamp_col, schema.primary_value_col]
+            )
+        except pd.errors.EmptyDataError:
+            # Only blank lines were appended
+            self.offset += end + 1
+            return None
+        except Exception as e:
+            raise ValueError(f"Failed to read appended rows: {e}")
+
+        if self._skip:
+            # Drop rows the initial load already delivered
+            dropped = min(self._skip, len(df))
+            df = df.iloc[dropped:]
+            self._skip -= dropped
+            if not len(df):
+                self.offset += end + 1
+                return None
+
+        timestamps, values = DataLoader._validate_chunk(
+            df[schema.timestamp_col], df[schema.primary_value_col], schema.primary_value_col,
+            schema.datetime_format, self.last_timestamp, self.row_offset
+        )
+
+        self.offset += end + 1
+        self.row_offset += len(values)
+        if len(timestamps):
+            self.last_timestamp = timestamps[-1]
+
+        for callback in self._subscribers:
+            callback(timestamps, values)
+
+        return timestamps, values
@@ -0,0 +1,264 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cpas.core.extrema import ExtremaDetector
+from cpas.core.smoothing import Smoother
+from cpas.models.timeseries import TimeSeries
+
+INF = float('inf')
+
+def _stack_profile(vals):
+    """
+    One direction of a chunk's base sweep, for stitching with its neighbours.
+
+    Returns:
+        tuple: (base values from ExtremaDetector._sweep_bases,
+                open mask: no strictly higher point earlier in the chunk, so the base
+                    depends on the chunks before,
+                minimum before each point (inf for the first),
+                final stack values and the minimum below each stack entry)
+    """
+    m = len(vals)
+    base, _ = ExtremaDetector._sweep_bases(vals.tolist(), range(m))
+    before_max = np.concatenate([[-INF], np.maximum.accumulate(vals)[:-1]])
+    before_min = np.concatenate([[INF], np.minimum.accumulate(vals)[:-1]])
+    is_open = vals >= before_max
+
+    # Entries left on the stack: strictly higher than everything after them
+    after_max = np.concatenate([np.maximum.accumulate(vals[::-1])[::-1][1:], [-INF]])
+    slots = np.flatnonzero(vals > after_max)
+    starts = np.concatenate([[0], slots[:-1] + 1])
+    stack_min = np.full(len(slots), INF)
+    filled = starts < slots
+    if filled.any():
+        # Range minimum between consecutive stack entries
+        bounds = np.ravel(np.column_stack([starts[filled], slots[filled]]))
+        stack_min[filled] = np.minimum.reduceat(vals, bounds)[::2]
+    return np.asarray(base), is_open, before_min, vals[slots].tolist(), stack_min.tolist()
+
+def _detect_chunk(y_name, n, start, stop, threshold):
+    """
+    Finds candidates and resolves the prominence of chunk [start, stop) as far
+    as the chunk allows. Module-level so it can be pickled into worker
+    processes; the (already smoothed) series is read from shared memory.
+
+    Returns:
+        dict: per type 'peaks' / 'troughs': (positions, prominences) of resolved
+            candidates passing threshold; 'open': candidates whose bases need
+            neighbouring chunks; 'left' / 'right': stack summaries for stitching.
+    """
+    y_shm = shared_memory.SharedMemory(name=y_name)
+    try:
+        # 1. Values with a halo of 2 (candidate test of the neighbours)
+        lo, hi = max(0, start - 2), min(n, stop + 2)
+        y = np.ndarray((n,), dtype=np.float64, buffer=y_shm.buf)[lo:hi].copy()
+
+        # 2. Candidates and turning points of positions [start - 1, stop + 1)
+        c0, c1 = max(start - 1, 1), min(stop + 1, n - 1)
+        mid = y[c0 - lo:c1 - lo]
+        prev = y[c0 - 1 - lo:c1 - 1 - lo]
+        nxt = y[c0 + 1 - lo:c1 + 1 - lo]
+        is_peak = (mid > prev) & (mid > nxt)
+        is_trough = (mid < prev) & (mid < nxt)
+        turning = ~(((prev < mid) & (mid < nxt)) | ((prev > mid) & (mid > nxt)))
+
+        # 3. Compression, as in ExtremaDetector.compute_prominences
+        keep = np.zeros(c1 - c0 + 2, dtype=bool) # positions [c0 - 1, c1 + 1)
+        cand = is_peak | is_trough
+        keep[1:-1] |= turning | cand
+        keep[:-2] |= cand
+        keep[2:] |= cand
+        keep = keep[start - (c0 - 1):stop - (c0 - 1)]
+        keep[[0, -1]] = True # Chunk edges (also the series endpoints)
+        pos = np.flatnonzero(keep) + start
+        vals = y[pos - lo]
+
+        # 4. Sweeps from both sides
+        left, left_open, left_min, left_st, left_st_min = _stack_profile(vals)
+        right, right_open, right_min, right_st, right_st_min = _stack_profile(vals[::-1])
+        right, right_open, right_min = right[::-1], right_open[::-1], right_min[::-1]
+
+        out = {'open': [], 'left': (left_st, left_st_min), 'right': (right_st, right_st_min)}
+        for name, mask in (('peaks', is_peak), ('troughs', is_trough)):
+            cpos = np.flatnonzero(mask) + c0
+            cpos = cpos[(cpos >= start) & (cpos < stop)]
+            slots = np.searchsorted(pos, cpos)
+            resolved = ~(left_open[slots] | right_open[slots])
+            prom = np.abs(vals[slots] - np.maximum(left[slots], right[slots]))
+            passed = resolved if threshold is None else resolved & (prom >= threshold)
+            out[name] = (cpos[passed], prom[passed])
+
+            for s, p in zip(slots[~resolved].tolist(), cpos[~resolved].tolist()):
+                out['open'].append((p, name == 'peaks', float(vals[s]),
+                                    None if left_open[s] else float(left[s]), float(left_min[s]),
+                                    None if right_open[s] else float(right[s]), float(right_min[s])))
+        return out
+    finally:
+        y_shm.close()
+
+class ParallelExtremaDetector:
+    """
+    Multi-core ExtremaDetector.detect for very long series.
+
+    The series is smoothed once up front (Smoother, so the result is cached),
+    then split into chunks that workers process independently from shared
+    memory: candidate detection and the prominence sweeps. A candidate whose nearest higher point lies
+    outside its chunk is left open; the workers also return the final sweep
+    stack of each chunk, which is all that later chunks can see of it. Open
+    candidates are resolved by replaying those small stacks in chunk order,
+    so the prominences equal the single-process ones. The distance filter
+    then runs once over the surviving candidates.
+    """
+
+    # Below this many points the serial detector is faster than starting a pool
+    MIN_POINTS = 2_000_000
+    # Chunks per worker (smaller chunks balance uneven work better)
+    CHUNKS_PER_WORKER = 4
+    MIN_CHUNK = 100_000
+
+    @staticmethod
+    def detect(values, prominence=0.1, distance=1, smoothing_window=0, max_workers=None,
+               volatility=None, volatility_window=100, smoothing_kernel='sma', fingerprint=None):
+        """
+        Same arguments and result as ExtremaDetector.detect.
+
+        Args:
+            max_workers (int, optional): Pool size (default: CPU count).
+        """
+        # Adaptive thresholds are only known per position: filter after the sweeps
+        threshold = prominence if volatility is None else None
+        y, levels = ParallelExtremaDetector.prominences(values, smoothing_window, threshold, max_workers,
+                                                         smoothing_kernel, fingerprint)
+        if len(y) < 3:
+            return {'peaks': [], 'troughs': [], 'smoothed': y}
+        if volatility is not None:
+            from cpas.core.volatility import Volatility
+            scale = Volatility.measure(y, volatility, volatility_window)
+            for name, (cand, prom) in levels.items():
+                passed = ExtremaDetector.scaled_prominences(prom, scale[cand]) >= prominence
+                levels[name] = (cand[passed], prom[passed])
+        return {
+            'peaks': ExtremaDetector._filter_by_distance(y, levels['peaks'][0], distance, is_peak=True),
+            'troughs': ExtremaDetector._filter_by_distance(y, levels['troughs'][0], distance, is_peak=False),
+            'smoothed': y
+        }
+
+    @staticmethod
+    def prominences(values, smoothing_window=0, threshold=None, max_workers=None, smoothing_kernel='sma',
+                    fingerprint=None):
+        """
+        Smoothed series plus the prominence of every candidate (or of those
+        >= threshold), in parallel when the series is long enough.
+        fingerprint keys the smoothing cache (see ExtremaDetector.detect).
+
+        Returns:
+            tuple: (smoothed, {'peaks': (positions, prominences), 'troughs': (...)}),
+                positions ascending.
+        """
+        if isinstance(values, TimeSeries):
+            fingerprint = fingerprint or values.fingerprint
+            values = values.values
+        y = np.array(values, dtype=float)
+        if smoothing_window > 1:
+            y = Smoother.smooth(y, smoothing_window, smoothing_kernel, fingerprint=fingerprint)
+        n = len(y)
+        workers = max_workers or os.cpu_count() or 1
+
+        if n < ParallelExtremaDetector.MIN_POINTS or workers < 2:
+            levels = {}
+            for name, cand in zip(('peaks', 'troughs'), ExtremaDetector.find_candidates(y)):
+                cand = np.asarray(cand, dtype=np.int64)
+                prom, _, _ = ExtremaDetector.compute_prominences(y, cand)
+                keep = slice(None) if threshold is None else prom >= threshold
+                levels[name] = (cand[keep], prom[keep])
+            return y, levels
+
+        n_chunks = min(workers * ParallelExtremaDetector.CHUNKS_PER_WORKER, max(1, n // ParallelExtremaDetector.MIN_CHUNK))
+        bounds = np.linspace(0, n, n_chunks + 1).astype(np.int64).tolist()
+
+        y_shm = shared_memory.SharedMemory(create=True, size=y.nbytes)
+        try:
+            np.ndarray((n,), dtype=np.float64, buffer=y_shm.buf)[:] = y
+
+            # Spawn: forking a process that runs Tk threads is unsafe
+            ctx = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                futures = [pool.submit(_detect_chunk, y_shm.name, n, a, b, threshold)
+                           for a, b in zip(bounds[:-1], bounds[1:])]
+                chunks = [f.result() for f in futures]
+        finally:
+            y_shm.close()
+            y_shm.unlink()
+
+        return y, ParallelExtremaDetector._stitch(chunks, threshold)
+
+    @staticmethod
+    def _stitch(chunks, threshold):
+        """Resolves the open candidates of every chunk and merges the results."""
+        # Left bases in chunk order, right bases in reverse order
+        left = ParallelExtremaDetector._replay(chunks, 'left', 3, 4)
+        right = ParallelExtremaDetector._replay(chunks[::-1], 'right', 5, 6)
+
+        levels = {}
+        for name, is_peak in (('peaks', True), ('troughs', False)):
+            pos = [c[name][0] for c in chunks]
+            prom = [c[name][1] for c in chunks]
+            extra_pos, extra_prom = [], []
+            for c in chunks:
+                for entry in c['open']:
+                    if entry[1] != is_peak:
+                        continue
+                    p, v = entry[0], entry[2]
+                    lb = entry[3] if entry[3] is not None else left[p]
+                    rb = entry[5] if entry[5] is not None else right[p]
+                    pr = abs(v - max(lb, rb))
+                    if threshold is None or pr >= threshold:
+                        extra_pos.append(p)
+                        extra_prom.append(pr)
+            pos = np.concatenate(pos + [np.asarray(extra_pos, dtype=np.int64)])
+            prom = np.concatenate(prom + [np.asarray(extra_prom, dtype=float)])
+            order = np.argsort(pos, kind='stable')
+            levels[name] = (pos[order].astype(np.int64), prom[order])
+        return levels
+
+    @staticmethod
+    def _replay(chunks, side, base_field, min_field):
+        """
+        Carries the sweep stack across chunks (in sweep order) and computes the
+        base of every candidate left open on that side.
+
+        Returns:
+            dict: position -> base value
+        """
+        st_val, st_min = [], []
+        bases = {}
+        for c in chunks:
+            # Open candidates are running maxima of their chunk (in sweep order),
+            # so each pops a superset of what the previous one popped
+            opened = [e for e in c['open'] if e[base_field] is None]
+            opened.sort(key=lambda e: e[0], reverse=(side == 'right'))
+            popped = INF
+            for e in opened:
+                v = e[2]
+                while st_val and st_val[-1] <= v:
+                    popped = min(popped, st_val.pop(), st_min.pop())
+                mn = min(e[min_field], popped)
+                if st_val:
+                    bases[e[0]] = min(mn, st_val[-1])
+                else:
+                    bases[e[0]] = v if mn == INF else mn
+
+            # The chunk's own stack goes on top; its bottom (the chunk maximum)
+            # pops everything it is not lower than
+            vals, mins = c[side]
+            while st_val and st_val[-1] <= vals[0]:
+                popped = min(popped, st_val.pop(), st_min.pop())
+            mins = list(mins)
+            mins[0] = min(mins[0], popped)
+            st_val += vals
+            st_min += mins
+        return bases
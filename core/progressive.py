@@ -0,0 +1,120 @@
+import numpy as np
+
+from cpas.core.extrema import ExtremaDetector
+from cpas.core.incremental_extrema import IncrementalExtremaDetector
+from cpas.core.smoothing import Smoother
+from cpas.models.timeseries import TimeSeries
+
+class ProgressiveExtremaDetector:
+    """
+    Coarse-to-fine extrema detection for very long series.
+
+    1. Coarse: the series is decimated to the min and max sample of each
+       bucket (so every large swing survives) and detected at that size,
+       which takes a fraction of a second regardless of the series length.
+    2. Refine: the full-resolution series is fed region by region through an
+       IncrementalExtremaDetector. After each region, the confirmed extrema
+       below the detector's frontier (close behind the region's end) are
+       exact and the coarse result fills in the rest.
+
+    The last update is exactly ExtremaDetector.detect's result.
+    """
+
+    # Samples kept by the coarse pass (min + max per bucket)
+    COARSE_POINTS = 20_000
+    # Number of refinement regions
+    REGIONS = 16
+
+    @staticmethod
+    def run(values, prominence=0.1, distance=1, smoothing_window=0, fingerprint=None):
+        """
+        Generator of progressively better results.
+
+        Args:
+            values (np.array | TimeSeries): Time series values.
+            prominence, distance, smoothing_window, fingerprint: As in ExtremaDetector.detect.
+
+        Yields:
+            dict: {
+                'peaks', 'troughs': [indices] (approximate until 'final'),
+                'exact_until': positions below this are final,
+                'progress': fraction of the series refined (0..1),
+                'final': True on the last update
+            }
+        """
+        if isinstance(values, TimeSeries):
+            fingerprint = fingerprint or values.fingerprint
+            values = values.values
+        y = np.asarray(values, dtype=float)
+        n = len(y)
+
+        if n <= ProgressiveExtremaDetector.COARSE_POINTS:
+            res = ExtremaDetector.detect(y, prominence, distance, smoothing_window, fingerprint=fingerprint)
+            yield {'peaks': np.asarray(res['peaks'], dtype=np.int64), 'troughs': np.asarray(res['troughs'], dtype=np.int64),
+                   'exact_until': n, 'progress': 1.0, 'final': True}
+            return
+
+        # 1. Coarse pass
+        coarse = ProgressiveExtremaDetector.coarse(y, prominence, distance, smoothing_window, fingerprint)
+        yield {**coarse, 'exact_until': 0, 'progress': 0.0, 'final': False}
+
+        # 2. Refinement
+        detector = IncrementalExtremaDetector(prominence, distance, smoothing_window)
+        bounds = np.linspace(0, n, ProgressiveExtremaDetector.REGIONS + 1).astype(np.int64).tolist()
+        confirmed = {'peaks': [], 'troughs': []}
+        exact_until = 0
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            update = detector.append(y[a:b])
+            if b == n:
+                break
+            # Only confirmed positions are final (tentative ones may still move)
+            exact_until = max(exact_until, detector.frontier)
+            merged = {}
+            for name in ('peaks', 'troughs'):
+                confirmed[name] += update[f'confirmed_{name}']
+                exact = np.sort(np.asarray(confirmed[name], dtype=np.int64))
+                rest = coarse[name][coarse[name] >= exact_until]
+                merged[name] = np.concatenate([exact[exact < exact_until], rest])
+            yield {**merged, 'exact_until': exact_until, 'progress': b / n, 'final': False}
+
+        res = detector.result()
+        yield {'peaks': res['peaks'], 'troughs': res['troughs'], 'exact_until': n, 'progress': 1.0, 'final': True}
+
+    @staticmethod
+    def coarse(y, prominence=0.1, distance=1, smoothing_window=0, fingerprint=None):
+        """
+        Approximate extrema from the min/max-per-bucket decimation.
+
+        Returns:
+            dict: {'peaks', 'troughs'} as positions in y.
+        """
+        y = np.asarray(y, dtype=float)
+        if smoothing_window > 1:
+            y = Smoother.smooth(y, smoothing_window, fingerprint=fingerprint)
+        pos = ProgressiveExtremaDetector.decimate(y, ProgressiveExtremaDetector.COARSE_POINTS)
+        # Distance in decimated samples (two per bucket)
+        bucket = len(y) / max(1, len(pos))
+        res = ExtremaDetector.detect(y[pos], prominence, max(1, int(round(distance / bucket))))
+        return {
+            'peaks': pos[np.asarray(res['peaks'], dtype=np.int64)],
+            'troughs': pos[np.asarray(res['troughs'], dtype=np.int64)],
+        }
+
+    @staticmethod
+    def decimate(y, points):
+        """
+        Positions of the min and max sample of each of points/2 equal buckets,
+        ascending (duplicates collapsed).
+        """
+        n = len(y)
+        size = max(1, -(-n // max(1, points // 2)))
+        full = n // size * size
+        grid = y[:full].reshape(-1, size)
+        starts = np.arange(0, full, size)
+        lo = starts + np.argmin(grid, axis=1)
+        hi = starts + np.argmax(grid, axis=1)
+        parts = [lo, hi]
+        if full < n:
+            tail = y[full:]
+            parts.append(np.array([full + np.argmin(tail), full + np.argmax(tail)]))
+        return np.unique(np.concatenate(parts))
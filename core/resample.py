@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+class Resampler:
+    """
+    Extrema-preserving downsampling of a raw (timestamp, value) series.
+
+    Rows are grouped into fixed time buckets (e.g. 1 minute) and each bucket
+    is reduced to its open / high / low / close samples. The kept samples are
+    real raw rows emitted in time order, so every bucket's true peak and trough
+    survives and each output point maps back to an exact raw row position.
+    """
+
+    # Raw rows processed per pass; bounds the temporaries on very large (memory-mapped) inputs
+    BLOCK_ROWS = 8_000_000
+
+    @staticmethod
+    def period_ns(period):
+        """
+        Converts a period ('1min', '5s', pd.Timedelta or int ns) to nanoseconds.
+
+        Raises:
+            ValueError: If the period is not a positive duration.
+        """
+        try:
+            ns = period if isinstance(period, (int, np.integer)) else pd.Timedelta(period).value
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid resample period: {period!r}")
+        if ns <= 0:
+            raise ValueError(f"Resample period must be positive, got {period!r}")
+        return int(ns)
+
+    @staticmethod
+    def ohlc_positions(timestamps, values, period):
+        """
+        Finds the open, high, low and close row of every non-empty bucket.
+
+        Args:
+            timestamps (np.ndarray): Ascending datetime64 or int64 ns array.
+            values (np.ndarray): Sample values (no NaNs).
+            period: Bucket width (see period_ns).
+
+        Returns:
+            tuple: (bucket_start_ns, positions) where positions is an (n_buckets, 4)
+                int64 array of raw row positions for open/high/low/close.
+        """
+        ns = np.asarray(timestamps)
+        if ns.dtype.kind == 'M':
+            ns = ns.astype('datetime64[ns]').view(np.int64)
+        values = np.asarray(values)
+        step = Resampler.period_ns(period)
+        n = len(values)
+
+        bucket_parts, pos_parts = [], []
+        start = 0
+        while start < n:
+            stop = min(start + Resampler.BLOCK_ROWS, n)
+            if stop < n:
+                # Extend the block to the end of its last bucket so no bucket is split
+                bucket_end = (ns[stop - 1] // step + 1) * step
+                stop += int(np.searchsorted(ns[stop:], bucket_end))
+            b, p = Resampler._block_ohlc(ns[start:stop], values[start:stop], step)
+            bucket_parts.append(b)
+            pos_parts.append(p + start)
+            start = stop
+
+        if not pos_parts:
+            return np.empty(0, dtype=np.int64), np.empty((0, 4), dtype=np.int64)
+        return np.concatenate(bucket_parts), np.concatenate(pos_parts)
+
+    @staticmethod
+    def _block_ohlc(ns, values, step):
+        buckets = ns // step
+        starts = np.flatnonzero(np.diff(buckets)) + 1
+        starts = np.concatenate([[0], starts]).astype(np.int64)
+        ends = np.append(starts[1:], len(values))
+        counts = ends - starts
+        rows = np.arange(len(values), dtype=np.int64)
+
+        # First row in each bucket that attains the bucket max / min
+        hi = np.repeat(np.maximum.reduceat(values, starts), counts)
+        lo = np.repeat(np.minimum.reduceat(values, starts), counts)
+        none = len(values)
+        high = np.minimum.reduceat(np.where(values == hi, rows, none), starts)
+        low = np.minimum.reduceat(np.where(values == lo, rows, none), starts)
+
+        positions = np.stack([starts, high, low, ends - 1], axis=1)
+        return buckets[starts] * step, positions
+
+    @staticmethod
+    def resample(timestamps, values, period):
+        """
+        Reduces the series to the OHLC rows of each bucket, in time order.
+
+        Args:
+            timestamps (np.ndarray): Ascending datetime64 or int64 ns array.
+            values (np.ndarray): Sample values (no NaNs).
+            period: Bucket width (see period_ns).
+
+        Returns:
+            tuple: (timestamps, values, raw_rows) of the kept samples; at most
+                4 per bucket, duplicates (e.g. open == high) collapsed.
+        """
+        timestamps = np.asarray(timestamps)
+        values = np.asarray(values)
+        _, positions = Resampler.ohlc_positions(timestamps, values, period)
+
+        # Order the four rows of each bucket by time and drop repeats
+        positions = np.sort(positions, axis=1)
+        keep = np.ones(positions.shape, dtype=bool)
+        keep[:, 1:] = positions[:, 1:] != positions[:, :-1]
+        raw_rows = positions[keep]
+
+        return timestamps[raw_rows], values[raw_rows], raw_rows
+
+    @staticmethod
+    def resample_series(series, period):
+        """
+        TimeSeries wrapper around resample.
+
+        Returns:
+            TimeSeries: Kept samples, with raw_rows mapping each point to its
+                position in the input (composed if the input was already resampled),
+                and the input's fingerprint qualified by the period.
+        """
+        from cpas.models.timeseries import TimeSeries
+        ts, vals, rows = Resampler.resample(series.timestamps, series.values, period)
+        if series.raw_rows is not None:
+            rows = series.raw_rows[rows]
+        fingerprint = f"{series.fingerprint}|resample={period}" if series.fingerprint is not None else None
+        return TimeSeries.from_arrays(ts, vals, rows, fingerprint=fingerprint)
@@ -0,0 +1,309 @@
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+class Smoother:
+    """
+    Smoothing stage in front of extrema detection.
+
+    Kernels (all along the last axis, so 2D arrays are smoothed row by row):
+        'sma':    centered moving average from prefix sums, O(N) for any window.
+                  Same alignment and zero padding as np.convolve(x, box, 'same').
+        'ema':    zero-phase exponential average (forward then backward pass,
+                  span = window), so extrema are not shifted by the filter lag.
+        'savgol': Savitzky-Golay (quadratic fit over an odd window, edges padded
+                  with the end values), O(N) from window moments.
+
+    Results are kept in a small LRU cache keyed by (fingerprint, kernel, window),
+    so re-running detection with other thresholds reuses the smoothed series.
+    The fingerprint is the caller's identity of the data (normally the
+    DatasetCache fingerprint carried by a loaded TimeSeries); data without one
+    is not cached unless the caller opts into content hashing (fingerprint(x)).
+    Cached arrays are read-only.
+    """
+
+    KERNELS = ('sma', 'ema', 'savgol')
+    # Total size of cached smoothed arrays
+    CACHE_BYTES = 512 * 1024 * 1024
+    # EMA blocks are sized so the per-block rescaling factor stays below this
+    EMA_MAX_GAIN = 1e12
+    # Savitzky-Golay windows up to this length use the direct weighted sum
+    SAVGOL_DIRECT_WINDOW = 75
+    # Savitzky-Golay moment blocks: outputs per block (at least 2 * window)
+    SAVGOL_BLOCK = 512
+
+    _cache = OrderedDict()
+    _cache_nbytes = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def smooth(values, window, kernel='sma', fingerprint=None, cache=True):
+        """
+        Smooths values with the given kernel.
+
+        Args:
+            values (np.array): 1D series or 2D (series, time) block.
+            window (int): Window length (span for 'ema'); <= 1 returns a float copy.
+            kernel (str): One of KERNELS.
+            fingerprint (str, optional): Identity of the data (e.g. TimeSeries.fingerprint).
+                Without one the result is not cached; pass Smoother.fingerprint(values)
+                to key by content instead (hashes every byte on each call).
+            cache (bool): Use the LRU cache.
+
+        Returns:
+            np.array: Smoothed values, same shape as values.
+
+        Raises:
+            ValueError: If the kernel is unknown.
+        """
+        if kernel not in Smoother.KERNELS:
+            raise ValueError(f"Unknown smoothing kernel: {kernel!r} (expected one of {Smoother.KERNELS})")
+        x = np.asarray(values, dtype=float)
+        if window <= 1:
+            return x.copy()
+
+        key = None
+        if cache and fingerprint is not None:
+            key = (fingerprint, kernel, int(window))
+            with Smoother._lock:
+                hit = Smoother._cache.get(key)
+                if hit is not None:
+                    Smoother._cache.move_to_end(key)
+                    return hit
+
+        if kernel == 'sma':
+            out = Smoother.sma(x, window)
+        elif kernel == 'ema':
+            out = Smoother.ema(x, window)
+        else:
+            out = Smoother.savgol(x, window)
+
+        if key is not None:
+            out.flags.writeable = False
+            Smoother._store(key, out)
+        return out
+
+    @staticmethod
+    def fingerprint(x):
+        """
+        Content hash of an array (shape, dtype and every byte), the explicit
+        fallback identity for data that has no dataset fingerprint.
+        Cost is linear in the array size.
+        """
+        x = np.ascontiguousarray(x)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{x.shape}|{x.dtype}".encode())
+        h.update(memoryview(x).cast('B'))
+        return h.hexdigest()
+
+    @staticmethod
+    def _store(key, out):
+        with Smoother._lock:
+            if key in Smoother._cache:
+                return
+            Smoother._cache[key] = out
+            Smoother._cache_nbytes += out.nbytes
+            while Smoother._cache_nbytes > Smoother.CACHE_BYTES and len(Smoother._cache) > 1:
+                _, old = Smoother._cache.popitem(last=False)
+                Smoother._cache_nbytes -= old.nbytes
+
+    @staticmethod
+    def clear_cache():
+        with Smoother._lock:
+            Smoother._cache.clear()
+            Smoother._cache_nbytes = 0
+
+    # --- Moving average ---
+
+    @staticmethod
+    def prefix_sums(x, base, start=0.0):
+        """
+        Running sums of (x - base) along the last axis, starting from 'start'.
+
+        Subtracting a base (the series' first value) keeps the sums small on
+        series with a large offset. Sums are accumulated sequentially, so
+        continuing from a previous batch's last sum reproduces the sums of the
+        whole series exactly (IncrementalExtremaDetector relies on this).
+
+        Returns:
+            np.array: One more element than x along the last axis.
+        """
+        x = np.asarray(x, dtype=float)
+        head = np.broadcast_to(np.asarray(start, dtype=float), x.shape[:-1] + (1,))
+        return np.cumsum(np.concatenate([head, x - base], axis=-1), axis=-1)
+
+    @staticmethod
+    def sma_from_prefix(prefix, base, window, n, start, stop, offset=0):
+        """
+        Moving average of positions [start, stop) from prefix sums.
+
+        Args:
+            prefix (np.array): prefix_sums entries for prefix indices [offset, offset + len(prefix)).
+            base: The base passed to prefix_sums.
+            window (int): Window length.
+            n (int): Series length (terms past the end count as zero).
+            start, stop (int): Output positions.
+            offset (int): Prefix index of prefix[..., 0].
+        """
+        # Window of position i = prefix indices [clip(i - w//2), clip(i + (w-1)//2 + 1)],
+        # i.e. q[i - start] and q[i - start + window] of the clipped index run below
+        a, b = start - window // 2, stop - window // 2 + window
+        lead, trail = max(0, -a), max(0, b - (n + 1))
+        lo, hi = max(a, 0), min(b, n + 1)
+        shape = prefix.shape[:-1]
+        q = np.concatenate([
+            np.broadcast_to(prefix[..., :1], shape + (lead,)) if lead else prefix[..., :0],
+            prefix[..., lo - offset:hi - offset],
+            np.broadcast_to(prefix[..., n - offset:n - offset + 1], shape + (trail,)) if trail else prefix[..., :0],
+        ], axis=-1)
+        idx = np.concatenate([np.zeros(lead, dtype=np.int64), np.arange(lo, hi), np.full(trail, n)])
+        total = q[..., window:] - q[..., :-window]
+        count = idx[window:] - idx[:-window]
+        return (total + base * count) / window
+
+    @staticmethod
+    def sma(x, window):
+        """Centered moving average, O(N) (zero padding at the ends)."""
+        x = np.asarray(x, dtype=float)
+        n = x.shape[-1]
+        if n == 0:
+            return x.copy()
+        base = x[..., :1]
+        prefix = Smoother.prefix_sums(x, base)
+        return Smoother.sma_from_prefix(prefix, base, window, n, 0, n)
+
+    # --- Exponential average ---
+
+    @staticmethod
+    def ema(x, window):
+        """Zero-phase EMA with span = window (alpha = 2 / (window + 1))."""
+        x = np.asarray(x, dtype=float)
+        if x.ndim > 1:
+            return np.stack([Smoother.ema(row, window) for row in x.reshape(-1, x.shape[-1])]).reshape(x.shape)
+        if len(x) == 0:
+            return x.copy()
+        alpha = 2.0 / (window + 1)
+        forward = Smoother.ema_causal(x, alpha)
+        return Smoother.ema_causal(forward[::-1], alpha)[::-1].copy()
+
+    @staticmethod
+    def ema_causal(x, alpha):
+        """y[0] = x[0], y[t] = (1 - alpha) * y[t-1] + alpha * x[t]."""
+        u = alpha * np.asarray(x, dtype=float)
+        u[0] = x[0]
+        return Smoother._recurrence(u, 1.0 - alpha)
+
+    @staticmethod
+    def _recurrence(u, d):
+        """
+        y[t] = d * y[t-1] + u[t] (y[-1] = 0) without a Python loop per sample.
+
+        Inside blocks of B samples, y = d^j * cumsum(u * d^-j), with B chosen so
+        d^-B stays below EMA_MAX_GAIN. The carry between blocks is the same
+        recurrence over block ends with factor d^B, solved recursively.
+        """
+        n = len(u)
+        if n == 0 or d == 0:
+            return u.copy()
+        B = int(np.log(Smoother.EMA_MAX_GAIN) / -np.log(d))
+        if B < 2:
+            # d^2 is below 1 / EMA_MAX_GAIN: one step of memory is exact to that precision
+            return u + d * np.concatenate([[0.0], u[:-1]])
+        B = min(B, 4096, n)
+
+        blocks = -(-n // B)
+        grid = np.zeros(blocks * B)
+        grid[:n] = u
+        grid = grid.reshape(blocks, B)
+        powers = d ** np.arange(B)
+        inner = np.cumsum(grid / powers, axis=1) * powers
+        if blocks > 1:
+            # Value carried into each block: y at the end of the previous block
+            ends = Smoother._recurrence(inner[:, -1], d ** B)
+            inner[1:] += np.outer(ends[:-1], powers * d)
+        return inner.ravel()[:n]
+
+    # --- Savitzky-Golay ---
+
+    @staticmethod
+    def savgol_coefficients(window, polyorder=2):
+        """Center-point least-squares weights of a polynomial fit over an odd window."""
+        half = window // 2
+        k = np.arange(-half, half + 1, dtype=float)
+        A = np.vander(k, min(polyorder, window - 1) + 1, increasing=True)
+        return np.linalg.pinv(A)[0]
+
+    @staticmethod
+    def savgol(x, window, polyorder=2):
+        """
+        Savitzky-Golay smoothing; even windows are widened by one. O(N) for any window.
+
+        Short windows (<= SAVGOL_DIRECT_WINDOW) take the weighted sum over each
+        window directly, which is cheaper at that size. Otherwise the center
+        weight of offset k is a polynomial in u = k / half (only even powers are
+        non-zero), so each output is a weighted sum of the window moments
+        S_p = sum(u^p * x). The moments come from prefix sums of t^q * x over
+        blocks of outputs, with t measured from the block middle in units of
+        half and x taken relative to the block's first value, which keeps the
+        cancellation between prefix sums at the level of float rounding.
+        """
+        x = np.asarray(x, dtype=float)
+        if x.ndim > 1:
+            return np.stack([Smoother.savgol(row, window, polyorder)
+                             for row in x.reshape(-1, x.shape[-1])]).reshape(x.shape)
+        n = len(x)
+        window = window if window % 2 else window + 1
+        half = window // 2
+        if n == 0 or half == 0:
+            return x.copy()
+        if window <= Smoother.SAVGOL_DIRECT_WINDOW:
+            padded = np.pad(x, (half, half), mode='edge')
+            windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+            return windows @ Smoother.savgol_coefficients(window, polyorder)
+        weights = Smoother.savgol_moment_weights(window, polyorder)
+
+        # Block b produces outputs [b * B, (b + 1) * B) from padded[b * B : b * B + B + 2 * half]
+        B = max(2 * window, Smoother.SAVGOL_BLOCK)
+        blocks = -(-n // B)
+        padded = np.pad(x, (half, blocks * B - n + half), mode='edge')
+        segments = np.lib.stride_tricks.sliding_window_view(padded, B + 2 * half)[::B]
+        t = (np.arange(B + 2 * half) - half - B / 2) / half
+        s = (np.arange(B) - B / 2) / half  # Window center of each output, same units
+
+        # Weights sum to one, so each block is smoothed relative to its first value
+        base = segments[:, :1]
+        centered = segments - base
+
+        # M[q][:, i] = sum of t^q * (x - base) over the window of output i
+        M = []
+        tq = np.ones_like(t)
+        for q in range(len(weights)):
+            prefix = np.zeros((blocks, B + 2 * half + 1))
+            np.cumsum(centered * tq, axis=1, out=prefix[:, 1:])
+            M.append(prefix[:, window:window + B] - prefix[:, :B])
+            tq = tq * t
+
+        # S_p = sum((t - s)^p * x) = sum_q C(p, q) (-s)^(p - q) M_q
+        out = np.repeat(base, B, axis=1)
+        for p, w in enumerate(weights):
+            if w == 0:
+                continue
+            for q in range(p + 1):
+                out += w * math.comb(p, q) * (-s) ** (p - q) * M[q]
+        return out.ravel()[:n]
+
+    @staticmethod
+    def savgol_moment_weights(window, polyorder=2):
+        """
+        Weights g_p with center weight(k) = sum(g_p * (k / half)^p), p = 0..polyorder.
+        Odd powers are zeroed (they vanish by symmetry).
+        """
+        half = window // 2
+        u = np.arange(-half, half + 1, dtype=float) / half
+        A = np.vander(u, min(polyorder, window - 1) + 1, increasing=True)
+        g = np.linalg.solve(A.T @ A, np.eye(A.shape[1])[0])
+        g[1::2] = 0.0
+        return g
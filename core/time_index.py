@@ -0,0 +1,163 @@
+import numpy as np
+
+class TimeIndex:
+    """
+    Maps between row positions and timestamps (int64 nanoseconds).
+
+    Regular-cadence series are stored as (start, step) plus a short list of
+    gap exceptions, so index -> time and time -> index are arithmetic instead
+    of a search over the full column. Irregular series fall back to a cached
+    int64 array with binary search.
+    """
+
+    # More exceptions than this fraction of rows => treat the series as irregular
+    MAX_GAP_FRACTION = 0.01
+
+    def __init__(self, length, start=0, step=0, seg_pos=None, seg_t0=None, ns=None):
+        self.length = int(length)
+        self.start = int(start)
+        self.step = int(step)
+        # Segment starts (row positions) and their timestamps; segment 0 starts at row 0
+        self.seg_pos = seg_pos if seg_pos is not None else np.zeros(1, dtype=np.int64)
+        self.seg_t0 = seg_t0 if seg_t0 is not None else np.array([start], dtype=np.int64)
+        # Irregular fallback
+        self._ns = ns
+
+    @staticmethod
+    def from_timestamps(timestamps):
+        """
+        Builds the index from a datetime64 / int64 ns array or Series.
+        Detects the dominant sampling step and keeps the compact form if the
+        rows off that cadence are rare.
+        """
+        ns = TimeIndex._as_ns(timestamps)
+        n = len(ns)
+        if n < 2:
+            return TimeIndex(n, start=ns[0] if n else 0, step=1)
+
+        d = np.diff(ns)
+        step = int(np.median(d))
+        if step <= 0:
+            return TimeIndex(n, ns=ns)
+
+        # A new segment starts wherever the spacing breaks from the cadence
+        breaks = np.flatnonzero(d != step) + 1
+        if len(breaks) > TimeIndex.MAX_GAP_FRACTION * n:
+            return TimeIndex(n, ns=ns)
+
+        seg_pos = np.concatenate([[0], breaks]).astype(np.int64)
+        return TimeIndex(n, start=ns[0], step=step, seg_pos=seg_pos, seg_t0=ns[seg_pos].copy())
+
+    @staticmethod
+    def _as_ns(timestamps):
+        # .values gives UTC datetime64 for tz-aware Series as well
+        arr = np.asarray(getattr(timestamps, 'values', timestamps))
+        if arr.dtype.kind == 'M':
+            arr = arr.astype('datetime64[ns]').view(np.int64)
+        return np.ascontiguousarray(arr, dtype=np.int64)
+
+    @property
+    def regular(self):
+        return self._ns is None
+
+    @property
+    def gaps(self):
+        """Number of cadence exceptions (0 for a perfectly regular series)."""
+        return len(self.seg_pos) - 1 if self.regular else None
+
+    @property
+    def nbytes(self):
+        if not self.regular:
+            return self._ns.nbytes
+        return self.seg_pos.nbytes + self.seg_t0.nbytes
+
+    def __len__(self):
+        return self.length
+
+    def time_at(self, idx):
+        """Row position(s) -> timestamp(s) in int64 ns."""
+        if not self.regular:
+            return self._ns[idx]
+        idx = np.asarray(idx, dtype=np.int64)
+        idx = np.where(idx < 0, idx + self.length, idx)  # Negative positions count from the end
+        if len(self.seg_pos) == 1:
+            return self.start + idx * self.step
+        j = np.searchsorted(self.seg_pos, idx, side='right') - 1
+        return self.seg_t0[j] + (idx - self.seg_pos[j]) * self.step
+
+    def index_of(self, t, side='left'):
+        """
+        Timestamp(s) in int64 ns -> insertion position(s), with the same
+        semantics as np.searchsorted over the full timestamp column.
+        """
+        if not self.regular:
+            return np.searchsorted(self._ns, t, side=side)
+
+        t = np.asarray(t, dtype=np.int64)
+        # Segment whose first timestamp is < t (left) or <= t (right)
+        j = np.searchsorted(self.seg_t0, t, side=side) - 1
+        before = j < 0
+        j = np.maximum(j, 0)
+
+        offset = t - self.seg_t0[j]
+        if side == 'left':
+            k = -(-offset // self.step)  # ceil
+        else:
+            k = offset // self.step + 1
+
+        seg_end = np.append(self.seg_pos[1:], self.length)[j]
+        idx = np.minimum(self.seg_pos[j] + k, seg_end)
+        return np.where(before, 0, idx)
+
+    def to_array(self):
+        """Materializes the full int64 ns column."""
+        if not self.regular:
+            return self._ns
+        return self.time_at(np.arange(self.length, dtype=np.int64))
+
+    def slice(self, start=None, stop=None, step=None):
+        """
+        Index of the rows [start:stop:step] (positional slice semantics).
+        A contiguous slice of a regular index stays compact: only the segments
+        it overlaps are kept, without materializing the timestamps.
+        """
+        s = slice(start, stop, step)
+        start, stop, step = s.indices(self.length)
+        if not self.regular:
+            return TimeIndex(len(range(start, stop, step)), ns=self._ns[s])
+        if step != 1:
+            return TimeIndex.from_timestamps(self.time_at(np.arange(start, stop, step, dtype=np.int64)))
+        if stop <= start:
+            return TimeIndex(0, start=0, step=self.step)
+
+        # Segments starting inside (start, stop), plus the one containing start
+        lo = np.searchsorted(self.seg_pos, start, side='right')
+        hi = np.searchsorted(self.seg_pos, stop, side='left')
+        t0 = int(self.time_at(start))
+        seg_pos = np.concatenate([[0], self.seg_pos[lo:hi] - start]).astype(np.int64)
+        seg_t0 = np.concatenate([[t0], self.seg_t0[lo:hi]]).astype(np.int64)
+        return TimeIndex(stop - start, start=t0, step=self.step, seg_pos=seg_pos, seg_t0=seg_t0)
+
+    def extend(self, timestamps):
+        """
+        Returns an index covering the appended timestamps as well (live data).
+        Only the new rows are inspected while the cadence holds.
+        """
+        new = self._as_ns(timestamps)
+        if not len(new):
+            return self
+        if not self.regular or self.length < 2:
+            base = self.to_array() if self.length else np.empty(0, dtype=np.int64)
+            return TimeIndex.from_timestamps(np.concatenate([base, new]))
+
+        last = int(self.time_at(self.length - 1))
+        d = np.diff(np.concatenate([[last], new]))
+        breaks = np.flatnonzero(d != self.step) + self.length
+        seg_pos = np.concatenate([self.seg_pos, breaks]).astype(np.int64)
+        length = self.length + len(new)
+
+        if len(seg_pos) - 1 > self.MAX_GAP_FRACTION * length:
+            return TimeIndex(length, ns=np.concatenate([self.to_array(), new]))
+
+        seg_t0 = np.concatenate([self.seg_t0, new[breaks - self.length]])
+        return TimeIndex(length, start=self.start, step=self.step, seg_pos=seg_pos, seg_t0=seg_t0)
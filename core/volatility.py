@@ -0,0 +1,98 @@
+import numpy as np
+
+class Volatility:
+    """
+    Rolling volatility measures in O(N) with vectorized windows, used to scale
+    extrema thresholds to the local regime (see ExtremaDetector.detect).
+
+    Windows are centered: position i covers [i - window//2, i + (window-1)//2],
+    clipped at the series ends.
+    """
+
+    MEASURES = ('std', 'range', 'atr')
+
+    @staticmethod
+    def measure(y, kind, window):
+        """
+        Dispatches to one of the measures by name.
+
+        Raises:
+            ValueError: If kind is unknown or window < 2.
+        """
+        if window < 2:
+            raise ValueError(f"Volatility window must be >= 2, got {window}")
+        if kind == 'std':
+            return Volatility.rolling_std(y, window)
+        if kind == 'range':
+            return Volatility.rolling_range(y, window)
+        if kind == 'atr':
+            return Volatility.rolling_atr(y, window)
+        raise ValueError(f"Unknown volatility measure: {kind!r} (expected one of {Volatility.MEASURES})")
+
+    @staticmethod
+    def _bounds(n, window):
+        i = np.arange(n)
+        lo = np.maximum(i - window // 2, 0)
+        hi = np.minimum(i + (window - 1) // 2 + 1, n)
+        return lo, hi
+
+    @staticmethod
+    def rolling_std(y, window):
+        """Population standard deviation per window (prefix sums of x and x^2)."""
+        y = np.asarray(y, dtype=float)
+        n = len(y)
+        if n == 0:
+            return np.empty(0)
+        # Centering first keeps the x^2 sums from cancelling on large offsets
+        x = y - y.mean()
+        s1 = np.concatenate([[0.0], np.cumsum(x)])
+        s2 = np.concatenate([[0.0], np.cumsum(x * x)])
+        lo, hi = Volatility._bounds(n, window)
+        count = hi - lo
+        mean = (s1[hi] - s1[lo]) / count
+        var = (s2[hi] - s2[lo]) / count - mean * mean
+        return np.sqrt(np.maximum(var, 0.0))
+
+    @staticmethod
+    def rolling_range(y, window):
+        """max - min per window."""
+        y = np.asarray(y, dtype=float)
+        return Volatility.rolling_max(y, window) - (-Volatility.rolling_max(-y, window))
+
+    @staticmethod
+    def rolling_atr(y, window):
+        """
+        Average true range for a single value series: the mean absolute step
+        |y[i] - y[i-1]| per window (the close-to-close true range).
+        """
+        y = np.asarray(y, dtype=float)
+        n = len(y)
+        if n == 0:
+            return np.empty(0)
+        tr = np.abs(np.diff(y, prepend=y[0]))
+        s = np.concatenate([[0.0], np.cumsum(tr)])
+        lo, hi = Volatility._bounds(n, window)
+        return (s[hi] - s[lo]) / (hi - lo)
+
+    @staticmethod
+    def rolling_max(y, window):
+        """
+        Centered rolling maximum with the van Herk / Gil-Werman block scheme:
+        per block of 'window' samples, a prefix and a suffix running max; any
+        window then spans at most two blocks, so its max is one comparison.
+        """
+        y = np.asarray(y, dtype=float)
+        n = len(y)
+        if n == 0:
+            return np.empty(0)
+        before, after = window // 2, (window - 1) // 2
+        # Pad so every window is complete; -inf never wins the max
+        padded = np.concatenate([np.full(before, -np.inf), y, np.full(after + window, -np.inf)])
+        blocks = -(-len(padded) // window)
+        padded = np.concatenate([padded, np.full(blocks * window - len(padded), -np.inf)])
+        grid = padded.reshape(blocks, window)
+        prefix = np.maximum.accumulate(grid, axis=1).ravel()
+        suffix = np.maximum.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+        # Window of output i covers padded [i, i + window - 1]
+        start = np.arange(n)
+        return np.maximum(suffix[start], prefix[start + window - 1])
@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from cpas.models.structures import Widget, WidgetChain
+from cpas.models.structures import WidgetChain, WIDGET_COLUMNS
 
 class WidgetGenerator:
     """
@@ -8,67 +8,190 @@ class WidgetGenerator:
     SRS: "Generated between consecutive extrema".
     """
     
+    # Type code by (start is peak) * 2 + (end is peak), codes as in WIDGET_TYPES:
+    # T->T (T2T), T->P (T2P), P->T (P2T), P->P (P2P)
+    _TYPE_BY_KINDS = np.array([1, 3, 2, 0], dtype=np.uint8)
+    # Endpoint kinds by type code (the inverse): P2P and P2T start at a peak,
+    # P2P and T2P end at one
+    _STARTS_AT_PEAK = np.array([1, 0, 1, 0], dtype=np.uint8)
+    _ENDS_AT_PEAK = np.array([1, 0, 0, 1], dtype=np.uint8)
+    # update_chain copies reused rows slice by slice below this many runs
+    MAX_COPY_RUNS = 1024
+    
     @staticmethod
     def generate_chain(values, peaks, troughs):
         """
         Generates a WidgetChain from sorted peaks and troughs.
         """
-        # 1. Merge and sort all extrema by time index
-        # We need to preserve type info
+        return WidgetChain.from_arrays(WidgetGenerator.generate_arrays(values, peaks, troughs))
+    
+    @staticmethod
+    def generate_arrays(values, peaks, troughs):
+        """
+        The columns of generate_chain's WidgetChain, all computed with array
+        operations.
+        
+        Extrema are merged by time index with a stable sort (peaks before
+        troughs at equal indices), and each widget's type code follows from
+        the kinds of its two endpoints.
         
-        # List of (index, type) - type: 1 for Peak, -1 for Trough
-        extrema = []
-        for p in peaks:
-            extrema.append((p, 'Peak'))
-        for t in troughs:
-            extrema.append((t, 'Trough'))
+        Args:
+            values (np.array): Series values (indexed by extrema positions).
+            peaks, troughs (array-like): Extrema positions.
             
-        # Sort by index
-        extrema.sort(key=lambda x: x[0])
+        Returns:
+            dict: {
+                'index', 'start_idx', 'end_idx', 'duration': int64 arrays,
+                'start_val', 'end_val': values at the endpoints,
+                'type_codes': uint8 codes into WIDGET_TYPES
+            }
+        """
+        positions, is_peak = WidgetGenerator._merge(peaks, troughs)
+        return WidgetGenerator._columns(values, positions, is_peak)
+    
+    @staticmethod
+    def update_chain(chain, values, peaks, troughs):
+        """
+        Rebuilds a chain after the extrema changed (slider nudge, appended
+        batch, manual edit), regenerating only the widgets around changes.
         
-        chain = WidgetChain()
+        The chain's own extrema (its widgets' endpoints) are matched to the new
+        ones by position and kind. A widget is reused when both its endpoints
+        are still consecutive extrema and its stored values still match
+        'values'; every other row is computed as in generate_chain. The result
+        equals generate_chain(values, peaks, troughs).
         
-        if len(extrema) < 2:
-            return chain
+        Args:
+            chain (WidgetChain): Previous chain (e.g. from generate_chain), or None.
+            values (np.array): Series values (may have grown since chain was built).
+            peaks, troughs (array-like): New extrema positions.
             
-        for i in range(len(extrema) - 1):
-            start = extrema[i]
-            end = extrema[i+1]
-            
-            start_idx = start[0]
-            end_idx = end[0]
-            
-            # Determine type
-            # P -> P (P2P)
-            # T -> T (T2T)
-            # P -> T (P2T)
-            # T -> P (T2P)
-            s_type = start[1]
-            e_type = end[1]
-            
-            if s_type == 'Peak' and e_type == 'Peak':
-                w_type = 'P2P'
-            elif s_type == 'Trough' and e_type == 'Trough':
-                w_type = 'T2T'
-            elif s_type == 'Peak' and e_type == 'Trough':
-                w_type = 'P2T'
-            elif s_type == 'Trough' and e_type == 'Peak':
-                w_type = 'T2P'
+        Returns:
+            tuple: (WidgetChain, changes) where changes lists the replaced row
+                ranges as (old_start, old_stop, new_start, new_stop), ascending:
+                old rows [old_start, old_stop) became new rows [new_start, new_stop).
+                Rows between the ranges are unchanged (only shifted). An empty
+                list means nothing changed.
+        """
+        values = np.asarray(values)
+        positions, is_peak = WidgetGenerator._merge(peaks, troughs)
+        m = max(0, len(positions) - 1)
+        n_old = len(chain.index) if chain is not None else 0
+        
+        # The old extrema can be read back only from a contiguous, ordered chain
+        old_keys = None
+        if n_old and m:
+            codes = chain.type_codes
+            old_pos = np.append(chain.start_idx, chain.end_idx[-1])
+            old_peak = np.append(WidgetGenerator._STARTS_AT_PEAK[codes], WidgetGenerator._ENDS_AT_PEAK[codes[-1]])
+            old_keys = WidgetGenerator._sort_keys(old_pos, old_peak)
+            if not (np.array_equal(chain.end_idx[:-1], chain.start_idx[1:]) and np.all(np.diff(old_keys) > 0)):
+                old_keys = None
+        if old_keys is None:
+            new = WidgetChain.from_arrays(WidgetGenerator._columns(values, positions, is_peak))
+            return new, ([(0, n_old, 0, m)] if n_old or m else [])
+        
+        # 1. Match new extrema to old ones (both sorted by the same key). The
+        # common prefix and suffix (appends, local edits) match one to one; only
+        # the part between them needs a binary search.
+        new_keys = WidgetGenerator._sort_keys(positions, is_peak)
+        n_new, n_ext = len(new_keys), len(old_keys)
+        both = min(n_new, n_ext)
+        differ = np.flatnonzero(old_keys[:both] != new_keys[:both])
+        head = int(differ[0]) if len(differ) else both
+        differ = np.flatnonzero(old_keys[n_ext - both + head:][::-1] != new_keys[n_new - both + head:][::-1])
+        tail = int(differ[0]) if len(differ) else both - head
+        middle = np.searchsorted(old_keys[head:n_ext - tail], new_keys[head:n_new - tail]) + head
+        middle = np.minimum(middle, n_ext - 1)
+        match = np.concatenate([np.arange(head), middle, np.arange(n_ext - tail, n_ext)])
+        
+        # An extremum is kept if its value in the series is unchanged too
+        old_vals = np.append(chain.start_val, chain.end_val[-1])
+        new_vals = values[positions]
+        found = np.empty(n_new, dtype=bool)
+        found[:head] = old_vals[:head] == new_vals[:head]
+        found[head:n_new - tail] = (old_keys[middle] == new_keys[head:n_new - tail]) & \
+                                   (old_vals[middle] == new_vals[head:n_new - tail])
+        found[n_new - tail:] = old_vals[n_ext - tail:] == new_vals[n_new - tail:]
+        
+        # 2. Reusable widgets: both endpoints kept and consecutive in the old chain;
+        # they form runs of rows that map to consecutive old rows
+        keep = found[:-1] & found[1:] & (match[1:] == match[:-1] + 1)
+        rows = np.flatnonzero(keep)
+        breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+        run_start = np.concatenate([[0], breaks]) if len(rows) else breaks
+        run_new = rows[run_start]
+        run_old = match[run_new]
+        run_len = np.diff(np.append(run_start, len(rows)))
+        
+        # 3. Columns: reused runs copied, the rest generated (row by row when
+        # the runs are too scattered for slice copies)
+        changed = np.flatnonzero(~keep)
+        fresh = WidgetGenerator._columns(values, positions, is_peak, rows=changed)
+        runs = list(zip(run_new.tolist(), run_old.tolist(), run_len.tolist()))
+        scattered = len(runs) > WidgetGenerator.MAX_COPY_RUNS
+        columns = {'index': np.arange(m, dtype=np.int64)}
+        for name, dtype in WIDGET_COLUMNS[1:]:
+            col = np.empty(m, dtype=dtype)
+            old_col = getattr(chain, name)
+            if scattered:
+                col[rows] = old_col[match[rows]]
             else:
-                w_type = 'Unknown' # Should not happen
-                
-            duration = end_idx - start_idx
-            
-            widget = Widget(
-                index=i,
-                start_idx=start_idx,
-                end_idx=end_idx,
-                start_val=values[start_idx],
-                end_val=values[end_idx],
-                duration=duration,
-                w_type=w_type
-            )
-            
-            chain.add_widget(widget)
-            
-        return chain
+                for r, o, k in runs:
+                    col[r:r + k] = old_col[o:o + k]
+            col[changed] = fresh[name]
+            columns[name] = col
+        new = WidgetChain.from_arrays(columns)
+        
+        # 4. Replaced ranges: the gaps before, between and after the runs
+        new_a = np.concatenate([[0], run_new + run_len])
+        new_b = np.append(run_new, m)
+        old_a = np.concatenate([[0], run_old + run_len])
+        old_b = np.append(run_old, n_old)
+        gaps = np.flatnonzero((new_b > new_a) | (old_b > old_a))
+        changes = list(zip(old_a[gaps].tolist(), old_b[gaps].tolist(), new_a[gaps].tolist(), new_b[gaps].tolist()))
+        return new, changes
+    
+    @staticmethod
+    def _merge(peaks, troughs):
+        """
+        Extrema merged by time index with a stable sort (peaks before troughs
+        at equal indices).
+        
+        Returns:
+            tuple: (positions int64, is_peak uint8)
+        """
+        peaks = np.asarray(peaks, dtype=np.int64).ravel()
+        troughs = np.asarray(troughs, dtype=np.int64).ravel()
+        positions = np.concatenate([peaks, troughs])
+        is_peak = np.concatenate([np.ones(len(peaks), dtype=np.uint8), np.zeros(len(troughs), dtype=np.uint8)])
+        order = np.argsort(positions, kind='stable')
+        return positions[order], is_peak[order]
+    
+    @staticmethod
+    def _sort_keys(positions, is_peak):
+        """Keys ordered like _merge's output: by position, peaks first."""
+        return positions * 2 + (1 - is_peak.astype(np.int64))
+    
+    @staticmethod
+    def _columns(values, positions, is_peak, rows=None):
+        """
+        Widget columns between consecutive merged extrema, for all widgets or
+        only the given rows.
+        """
+        values = np.asarray(values)
+        count = max(0, len(positions) - 1)
+        rows = np.arange(count, dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        start_idx = positions[rows]
+        end_idx = positions[rows + 1]
+        type_codes = WidgetGenerator._TYPE_BY_KINDS[is_peak[rows] * 2 + is_peak[rows + 1]]
+        
+        return {
+            'index': rows,
+            'start_idx': start_idx,
+            'end_idx': end_idx,
+            'start_val': values[start_idx],
+            'end_val': values[end_idx],
+            'duration': end_idx - start_idx,
+            'type_codes': type_codes,
+        }
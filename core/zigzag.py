@@ -0,0 +1,114 @@
+import numpy as np
+
+from cpas.core.smoothing import Smoother
+from cpas.models.timeseries import TimeSeries
+
+class ZigZagDetector:
+    """
+    ZigZag (reversal) extrema: a peak is confirmed once the series falls a
+    minimum move below the highest point since the last trough, and vice
+    versa. Output peaks and troughs strictly alternate.
+
+    The move is either absolute (deviation) or a percentage of the extreme's
+    value (percent). Detection is a single left-to-right pass with O(1) state
+    (the current leg's extreme), so it also suits streaming data.
+    """
+
+    @staticmethod
+    def detect(values, deviation=None, percent=None, smoothing_window=0, include_last=False, smoothing_kernel='sma',
+               fingerprint=None):
+        """
+        Detects ZigZag pivots.
+
+        Args:
+            values (np.array | TimeSeries): Time series values.
+            deviation (float): Minimum absolute reversal move.
+            percent (float): Minimum reversal move in percent of the extreme's value
+                (exactly one of deviation / percent must be given).
+            smoothing_window (int): If > 1, smooths the series first.
+            include_last (bool): Also report the final, not yet reversed extreme.
+            smoothing_kernel (str): 'sma', 'ema' or 'savgol' (see Smoother).
+            fingerprint (str, optional): Smoothing cache identity, as in ExtremaDetector.detect.
+
+        Returns:
+            dict: {
+                'peaks': [indices],
+                'troughs': [indices],
+                'smoothed': [values] (or original if no smoothing)
+            }
+
+        Raises:
+            ValueError: If not exactly one positive threshold is given.
+        """
+        if (deviation is None) == (percent is None):
+            raise ValueError("Give exactly one of 'deviation' or 'percent'")
+        threshold = deviation if deviation is not None else percent
+        if threshold <= 0:
+            raise ValueError(f"ZigZag threshold must be positive, got {threshold}")
+        if isinstance(values, TimeSeries):
+            fingerprint = fingerprint or values.fingerprint
+            values = values.values
+        y = np.array(values, dtype=float)
+        if smoothing_window > 1:
+            y = Smoother.smooth(y, smoothing_window, smoothing_kernel, fingerprint=fingerprint)
+
+        if percent is not None:
+            rate = percent / 100.0
+            move = lambda e: abs(e) * rate
+        else:
+            move = lambda e: deviation
+
+        pivots, last = ZigZagDetector._scan(y, move)
+        if include_last and last is not None:
+            pivots.append(last)
+
+        peaks = np.array([i for i, is_peak in pivots if is_peak], dtype=np.int64)
+        troughs = np.array([i for i, is_peak in pivots if not is_peak], dtype=np.int64)
+        return {'peaks': peaks, 'troughs': troughs, 'smoothed': y}
+
+    @staticmethod
+    def _scan(y, move):
+        """
+        The streaming pass: one visit per sample, constant state.
+
+        Returns:
+            tuple: ([(index, is_peak)] confirmed pivots in order, (index, is_peak)
+                of the pending extreme or None)
+        """
+        pivots = []
+        vals = y.tolist()
+        if not vals:
+            return pivots, None
+
+        # trend: 0 = undecided (tracking both the running min and max),
+        # 1 = rising leg (ext is the highest point), -1 = falling leg
+        trend, lo, hi, ext = 0, 0, 0, 0
+        for i, v in enumerate(vals):
+            if trend == 1:
+                e = vals[ext]
+                if v > e:
+                    ext = i
+                elif v < e and e - v >= move(e):
+                    pivots.append((ext, True))
+                    trend, ext = -1, i
+            elif trend == -1:
+                e = vals[ext]
+                if v < e:
+                    ext = i
+                elif v > e and v - e >= move(e):
+                    pivots.append((ext, False))
+                    trend, ext = 1, i
+            else:
+                if v < vals[lo]:
+                    lo = i
+                if v > vals[hi]:
+                    hi = i
+                # A reversal needs a real move (not just a repeated value)
+                if v < vals[hi] and vals[hi] - v >= move(vals[hi]):
+                    pivots.append((hi, True))
+                    trend, ext = -1, i
+                elif v > vals[lo] and v - vals[lo] >= move(vals[lo]):
+                    pivots.append((lo, False))
+                    trend, ext = 1, i
+
+        return pivots, ((ext, trend == 1) if trend else None)
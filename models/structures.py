@@ -1,11 +1,32 @@
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import List, Literal
+from typing import Literal
 
-@dataclass
+import numpy as np
+
+# Widget type names; a widget's type code is its position in this tuple
+WIDGET_TYPES = ('P2P', 'T2T', 'P2T', 'T2P')
+# One-character symbol per type code, as used by the string algorithms
+WIDGET_SYMBOLS = 'ABCD'
+
+# Byte lookup: code -> symbol ('X' for codes outside WIDGET_TYPES)
+_SYMBOL_BYTES = np.frombuffer(WIDGET_SYMBOLS.encode('ascii').ljust(256, b'X'), dtype=np.uint8)
+
+def symbols_from_codes(codes):
+    """Encodes an array of type codes as a WIDGET_SYMBOLS string in one table lookup."""
+    codes = np.asarray(codes)
+    if codes.dtype != np.uint8:
+        codes = np.where((codes >= 0) & (codes < len(WIDGET_TYPES)), codes, 255).astype(np.uint8)
+    return _SYMBOL_BYTES[codes].tobytes().decode('ascii')
+
+@dataclass(slots=True)
 class Widget:
     """
     Represents an atomic interval between two consecutive extrema.
     SRS: "Generated between consecutive extrema... Each widget MUST store: Start extrema, End extrema, Duration, Widget type, Index".
+    
+    WidgetChain stores widgets as columns; Widget objects are built from a
+    row on demand (see WidgetChain.widget) and do not write back to the chain.
     """
     index: int
     start_idx: int
@@ -37,22 +58,175 @@ class Widget:
             "energy": round(self.energy, 4)
         }
 
-@dataclass
+# WidgetChain columns and their dtypes ('type_codes' index into WIDGET_TYPES)
+WIDGET_COLUMNS = (
+    ('index', np.int64),
+    ('start_idx', np.int64),
+    ('end_idx', np.int64),
+    ('start_val', np.float64),
+    ('end_val', np.float64),
+    ('duration', np.int64),
+    ('type_codes', np.uint8),
+)
+
+def _empty_column(dtype):
+    return field(default_factory=lambda: np.empty(0, dtype=dtype))
+
+@dataclass(eq=False)
 class WidgetChain:
     """
     Represents an ordered sequence of Widgets.
     SRS: "Ordered sequences... Preserve exact temporal ordering".
+    
+    Stored column-wise (one typed array per Widget field, see WIDGET_COLUMNS),
+    so whole-chain operations are array operations and a million widgets cost
+    a few dozen MB. chain.widgets is a lazy sequence that builds Widget objects
+    only for the rows that are accessed.
+    
+    type_codes doubles as the integer symbol encoding; its string form
+    (symbol_string) is cached until add_widget changes the chain.
     """
-    widgets: List[Widget] = field(default_factory=list)
+    index: np.ndarray = _empty_column(np.int64)
+    start_idx: np.ndarray = _empty_column(np.int64)
+    end_idx: np.ndarray = _empty_column(np.int64)
+    start_val: np.ndarray = _empty_column(np.float64)
+    end_val: np.ndarray = _empty_column(np.float64)
+    duration: np.ndarray = _empty_column(np.int64)
+    type_codes: np.ndarray = _empty_column(np.uint8)
+    _buffers: object = field(default=None, init=False, repr=False)  # Append buffer (see add_widget)
+    _symbols: object = field(default=None, init=False, repr=False)  # Cached symbol_string
+    
+    def __post_init__(self):
+        for name, dtype in WIDGET_COLUMNS:
+            setattr(self, name, np.asarray(getattr(self, name), dtype=dtype))
+        lengths = {len(getattr(self, name)) for name, _ in WIDGET_COLUMNS}
+        if len(lengths) > 1:
+            raise ValueError(f"WidgetChain columns differ in length: {sorted(lengths)}")
+    
+    @staticmethod
+    def from_arrays(arrays):
+        """Wraps a dict of columns (e.g. WidgetGenerator.generate_arrays) without copying matching dtypes."""
+        return WidgetChain(**{name: arrays[name] for name, _ in WIDGET_COLUMNS})
+    
+    @property
+    def symbol_string(self):
+        """Widget types as one WIDGET_SYMBOLS character each (the to_string encoding), cached."""
+        if self._symbols is None:
+            self._symbols = symbols_from_codes(self.type_codes)
+        return self._symbols
+    
+    @property
+    def widgets(self):
+        """Lazy, list-like sequence of Widget views (indexing, slicing, iteration, len)."""
+        return WidgetSequence(self)
+    
+    def widget(self, i):
+        """Widget view of row i."""
+        return Widget(
+            index=self.index[i].item(),
+            start_idx=self.start_idx[i].item(),
+            end_idx=self.end_idx[i].item(),
+            start_val=self.start_val[i].item(),
+            end_val=self.end_val[i].item(),
+            duration=self.duration[i].item(),
+            w_type=WIDGET_TYPES[self.type_codes[i]]
+        )
+    
+    def iter_widgets(self, start=0, stop=None):
+        """Widget views of rows [start, stop), built from bulk-converted columns."""
+        s = slice(start, stop)
+        columns = [getattr(self, name)[s].tolist() for name, _ in WIDGET_COLUMNS[:-1]]
+        types = [WIDGET_TYPES[c] for c in self.type_codes[s].tolist()]
+        for row in zip(*columns, types):
+            yield Widget(*row)
+    
+    def slice(self, start=None, stop=None):
+        """Zero-copy chain of rows [start, stop) (widgets keep their index)."""
+        s = slice(start, stop)
+        return WidgetChain(**{name: getattr(self, name)[s] for name, _ in WIDGET_COLUMNS})
+    
+    def range_bounds(self, start, end):
+        """
+        Row range [a, b) of the widgets lying inside [start, end]
+        (start_idx >= start and end_idx <= end), by binary search.
+        
+        Widgets are in temporal order, so start_idx and end_idx are both
+        ascending and the contained widgets are one contiguous run; the lookup
+        is O(log n) regardless of the chain length.
+        
+        Returns:
+            tuple: (a, b) row positions, a == b if no widget fits.
+        """
+        a = int(np.searchsorted(self.start_idx, start, side='left'))
+        b = int(np.searchsorted(self.end_idx, end, side='right'))
+        return a, max(a, b)
+    
+    def range_slice(self, start, end):
+        """Zero-copy chain of the widgets inside [start, end] (see range_bounds)."""
+        return self.slice(*self.range_bounds(start, end))
     
     def add_widget(self, widget: Widget):
-        self.widgets.append(widget)
+        """
+        Appends one widget. Columns grow geometrically in a buffer owned by
+        this chain, so repeated appends are amortized O(1).
+        """
+        n = len(self.index)
+        buf = self._buffers
+        # Reuse the buffer only if the columns are still its latest views
+        if buf is None or buf['filled'] != n or self.index.base is not buf['index'] or len(buf['index']) < n + 1:
+            cap = max(n + 1, 2 * n, 64)
+            buf = {'filled': n}
+            for name, dtype in WIDGET_COLUMNS:
+                buf[name] = np.empty(cap, dtype=dtype)
+                buf[name][:n] = getattr(self, name)
+        
+        row = (widget.index, widget.start_idx, widget.end_idx, widget.start_val, widget.end_val,
+               widget.duration, WIDGET_TYPES.index(widget.w_type))
+        for (name, _), value in zip(WIDGET_COLUMNS, row):
+            buf[name][n] = value
+            setattr(self, name, buf[name][:n + 1])
+        buf['filled'] = n + 1
+        self._buffers = buf
+        self._symbols = None
         
     def to_list(self):
-        return [w.to_dict() for w in self.widgets]
+        return [w.to_dict() for w in self.iter_widgets()]
         
     def get_symbol_sequence(self):
         """
         Returns the sequence of widget types as a string or list for algorithm input.
         """
-        return [w.w_type for w in self.widgets]
+        return [WIDGET_TYPES[c] for c in self.type_codes.tolist()]
+
+class WidgetSequence(Sequence):
+    """
+    Read-only list-like view of a WidgetChain's rows as Widget objects.
+    Integer indexing builds one Widget; slicing returns a list of Widgets.
+    """
+    __slots__ = ('chain',)
+    
+    def __init__(self, chain):
+        self.chain = chain
+        
+    def __len__(self):
+        return len(self.chain.index)
+    
+    def __getitem__(self, key):
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step == 1:
+                return list(self.chain.iter_widgets(start, max(start, stop)))
+            return [self.chain.widget(i) for i in range(start, stop, step)]
+        i = int(key)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("widget index out of range")
+        return self.chain.widget(i)
+    
+    def __iter__(self):
+        return self.chain.iter_widgets()
+    
+    def __repr__(self):
+        return f"WidgetSequence({len(self)} widgets)"
@@ -0,0 +1,171 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from cpas.core.time_index import TimeIndex
+
+@dataclass(eq=False)
+class TimeSeries:
+    """
+    Array-backed (timestamp, value) series used in place of a pandas DataFrame.
+
+    Timestamps are int64 nanoseconds since the epoch (UTC); values are float64,
+    or float32 when memory matters more than precision. Slices are numpy views,
+    so cutting a window out of a large (possibly memory-mapped) series is free.
+
+    Time is held by a TimeIndex: a regular-cadence series keeps only
+    (start, step) plus its gap segments, and the int64 column exists only for
+    irregular series. timestamps / datetimes materialize the column on demand
+    for regular series, so prefer time_index.time_at / index_of for lookups.
+
+    fingerprint identifies the data (set by DataLoader from the DatasetCache
+    fingerprint of the source file); caches of derived results (e.g. Smoother)
+    key on it instead of hashing the values. Slices get a derived identity;
+    appended series have none.
+    """
+    time_index: TimeIndex  # Row <-> int64 ns mapping, ascending
+    values: np.ndarray
+    raw_rows: Optional[np.ndarray] = None  # Source row of each point (set after resampling)
+    fingerprint: Optional[str] = None  # Dataset identity (None: unknown)
+    _capacity: object = field(default=None, init=False, repr=False)  # Shared append buffer (see append)
+
+    def __post_init__(self):
+        if len(self.time_index) != len(self.values):
+            raise ValueError(f"Length mismatch: {len(self.time_index)} timestamps vs {len(self.values)} values")
+
+    @staticmethod
+    def from_arrays(timestamps, values, raw_rows=None, dtype=None, fingerprint=None):
+        """
+        Wraps arrays without copying when they already have the target dtypes.
+        The timestamps are kept only if they are irregular (see TimeIndex).
+
+        Args:
+            timestamps (array-like): datetime64 or int64 ns timestamps.
+            values (array-like): Sample values.
+            raw_rows (array-like, optional): Source row positions.
+            dtype (np.dtype, optional): Value dtype; np.float32 halves memory (default float64).
+            fingerprint (str, optional): Identity of the data (see TimeSeries).
+
+        Returns:
+            TimeSeries
+        """
+        index = TimeIndex.from_timestamps(timestamps)
+        vals = np.asarray(getattr(values, 'values', values), dtype=dtype or np.float64)
+        if raw_rows is not None:
+            raw_rows = np.asarray(raw_rows, dtype=np.int64)
+        return TimeSeries(index, vals, raw_rows, fingerprint)
+
+    @staticmethod
+    def from_frame(df, dtype=None):
+        """Builds a series from a DataFrame with 'timestamp' and 'value' (and optional 'raw_row') columns."""
+        raw_rows = df['raw_row'].to_numpy() if 'raw_row' in df else None
+        return TimeSeries.from_arrays(df['timestamp'], df['value'], raw_rows, dtype=dtype)
+
+    def to_frame(self):
+        """Returns a pandas DataFrame view (for export and legacy callers)."""
+        import pandas as pd
+        data = {'timestamp': self.datetimes, 'value': self.values}
+        if self.raw_rows is not None:
+            data['raw_row'] = self.raw_rows
+        return pd.DataFrame(data, copy=False)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.slice(key.start, key.stop, key.step)
+        raise TypeError("TimeSeries supports slice indexing only; use .values / .timestamps for elements")
+
+    @property
+    def timestamps(self):
+        """int64 ns column (stored for irregular series, computed for regular ones)."""
+        return self.time_index.to_array()
+
+    @property
+    def datetimes(self):
+        """Timestamps as datetime64[ns] (a view of timestamps)."""
+        return self.timestamps.view('datetime64[ns]')
+
+    @property
+    def nbytes(self):
+        n = self.time_index.nbytes + self.values.nbytes
+        return n + (self.raw_rows.nbytes if self.raw_rows is not None else 0)
+
+    def slice(self, start=None, stop=None, step=None):
+        """Zero-copy positional slice."""
+        s = slice(start, stop, step)
+        raw = self.raw_rows[s] if self.raw_rows is not None else None
+        fingerprint = None
+        if self.fingerprint is not None:
+            bounds = s.indices(len(self))
+            fingerprint = self.fingerprint if bounds == (0, len(self), 1) else f"{self.fingerprint}[{bounds}]"
+        return TimeSeries(self.time_index.slice(start, stop, step), self.values[s], raw, fingerprint)
+
+    def between(self, t0=None, t1=None):
+        """
+        Zero-copy slice of the rows with t0 <= timestamp < t1.
+        Bounds may be datetime64, pandas Timestamps or int64 ns; None means open.
+        """
+        start = 0 if t0 is None else int(self.time_index.index_of(self._to_ns(t0)))
+        stop = len(self) if t1 is None else int(self.time_index.index_of(self._to_ns(t1)))
+        return self.slice(start, max(start, stop))
+
+    @staticmethod
+    def _to_ns(t):
+        if isinstance(t, (int, np.integer)):
+            return int(t)
+        return int(np.datetime64(t, 'ns').astype(np.int64))
+
+    def raw_row(self, idx):
+        """Source row position of point idx (idx itself if the series was not resampled)."""
+        return int(self.raw_rows[idx]) if self.raw_rows is not None else int(idx)
+
+    def append(self, timestamps, values):
+        """
+        Returns a series extended by the given rows (live data).
+
+        Values are written into spare capacity of a buffer shared with this
+        series, which grows geometrically, so repeated appends are amortized
+        O(new rows) instead of copying the whole series each time. A regular
+        index is extended in O(new rows); once irregular, the int64 column is
+        kept in the shared buffer as well. Existing series objects keep seeing
+        only their own rows.
+        """
+        ts = TimeIndex._as_ns(timestamps)
+        vals = np.asarray(getattr(values, 'values', values), dtype=self.values.dtype)
+        if len(ts) != len(vals):
+            raise ValueError(f"Length mismatch: {len(ts)} timestamps vs {len(vals)} values")
+        n, k = len(self), len(vals)
+        if k == 0:
+            return self
+        if self.raw_rows is not None:
+            raise ValueError("Cannot append raw rows to a resampled series")
+
+        buf = self._capacity
+        # Reuse the buffer only if this series is its latest, un-sliced view
+        if buf is None or buf['filled'] != n or self.values.base is not buf['val'] \
+                or len(buf['val']) < n + k:
+            cap = max(n + k, 2 * n, 1024)
+            val_buf = np.empty(cap, dtype=self.values.dtype)
+            val_buf[:n] = self.values
+            buf = {'val': val_buf, 'ts': None, 'filled': n}
+
+        buf['val'][n:n + k] = vals
+        buf['filled'] = n + k
+
+        index = self.time_index
+        if index.regular:
+            index = index.extend(ts)
+        if not index.regular:
+            if buf['ts'] is None:
+                # First irregular append on this buffer: move the column into it
+                buf['ts'] = np.empty(len(buf['val']), dtype=np.int64)
+                buf['ts'][:n] = self.time_index.to_array()
+            buf['ts'][n:n + k] = ts
+            index = TimeIndex(n + k, ns=buf['ts'][:n + k])
+
+        out = TimeSeries(index, buf['val'][:n + k])
+        out._capacity = buf
+        return out
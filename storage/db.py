@@ -48,6 +48,20 @@ class DatabaseManager:
             rules_json TEXT
         )''')
         
+        # Dataset Catalog (one row per ingested file, keyed by absolute path)
+        c.execute('''CREATE TABLE IF NOT EXISTS datasets (
+            filepath TEXT PRIMARY KEY,
+            filename TEXT,
+            format TEXT,
+            fingerprint TEXT,
+            schema_json TEXT,
+            rows INTEGER,
+            start_ns INTEGER,
+            end_ns INTEGER,
+            error TEXT,
+            ingested DATETIME DEFAULT CURRENT_TIMESTAMP
+        )''')
+        
         conn.commit()
         conn.close()
         
@@ -69,7 +83,7 @@ class DatabaseManager:
             'troughs': extrema['troughs'].tolist() if hasattr(extrema['troughs'], 'tolist') else extrema['troughs']
         }
         
-        chain_data = [w.to_dict() for w in chain.widgets] if chain else []
+        chain_data = chain.to_list() if chain else []
         
         anchor_data = {}
         if anchor:
@@ -132,3 +146,46 @@ class DatabaseManager:
         rows = c.fetchall()
         conn.close()
         return rows
+
+    DATASET_FIELDS = ('filepath', 'filename', 'format', 'fingerprint', 'schema', 'rows', 'start_ns', 'end_ns', 'error')
+
+    def upsert_datasets(self, records):
+        """
+        Inserts or replaces catalog rows in one transaction.
+        Each record is a dict with the DATASET_FIELDS keys ('schema' is JSON-encoded).
+        """
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.executemany(
+            "INSERT OR REPLACE INTO datasets (filepath, filename, format, fingerprint, schema_json, rows, start_ns, end_ns, error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(r['filepath'], r.get('filename'), r.get('format'), r.get('fingerprint'),
+              json.dumps(r.get('schema')), r.get('rows'), r.get('start_ns'), r.get('end_ns'), r.get('error'))
+             for r in records]
+        )
+        conn.commit()
+        conn.close()
+
+    def get_dataset(self, filepath):
+        """Returns the catalog record for filepath, or None."""
+        rows = self._select_datasets("WHERE filepath=?", (filepath,))
+        return rows[0] if rows else None
+
+    def list_datasets(self):
+        """Returns all catalog records, ordered by path."""
+        return self._select_datasets("ORDER BY filepath", ())
+
+    def _select_datasets(self, clause, params):
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("SELECT filepath, filename, format, fingerprint, schema_json, rows, start_ns, end_ns, error "
+                  f"FROM datasets {clause}", params)
+        rows = c.fetchall()
+        conn.close()
+        
+        records = []
+        for row in rows:
+            record = dict(zip(self.DATASET_FIELDS, row))
+            record['schema'] = json.loads(record['schema']) if record['schema'] else None
+            records.append(record)
+        return records
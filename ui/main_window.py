@@ -1,13 +1,29 @@
+import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import numpy as np
 
-from cpas.ui.plotting import PlottingCanvas
+from cpas.ui.plotting import PlottingCanvas, date_num_to_ns, ns_to_date_num
 from cpas.ui.theme import setup_theme, COLORS, FONTS
 from cpas.ui.components import ScrollableFrame, AlgorithmCard
 from cpas.core.genome import GenomeEngine
 from cpas.ui.mold_manager import MoldManager
 
+# Follow mode polling interval (ms)
+FOLLOW_POLL_MS = 1000
+# Ingest resampling choices (label -> bucket period)
+RESAMPLE_PERIODS = {"Raw": None, "1 sec": "1s", "1 min": "1min", "5 min": "5min", "1 hour": "1h"}
+# Minimum index gap between extrema of the same type
+EXTREMA_DISTANCE = 10
+# Extrema detector choices; in ZigZag mode the resolution value is the reversal percentage
+DETECTOR_MODES = ["Prominence", "ZigZag %"]
+# Prominence threshold modes (label -> volatility measure); adaptive thresholds are
+# multiples of the measure over a rolling window of VOLATILITY_WINDOW points
+THRESHOLD_MODES = {"Fixed Threshold": None, "Adaptive (Std)": "std", "Adaptive (Range)": "range", "Adaptive (ATR)": "atr"}
+VOLATILITY_WINDOW = 100
+# Series at least this long are detected coarse-to-fine (approximate result first)
+PROGRESSIVE_MIN_POINTS = 1_000_000
+
 class CPASMainWindow:
     def __init__(self, root):
         self.root = root
@@ -19,11 +35,13 @@ class CPASMainWindow:
         self.root.configure(bg=COLORS["bg_dark"])
 
         # Data State
-        self.df = None
+        self.series = None
         self.peaks = None
         self.troughs = None
         self.chain = None
         self.selected_algo_card = None
+        self.follower = None # Live tail-follow of the loaded CSV
+        self.live_detector = None # Incremental extrema state while following
         
         self.setup_layout()
         
@@ -56,8 +74,25 @@ class CPASMainWindow:
         
         # Navigation Items
         self._sidebar_btn("Load Dataset", self.load_csv)
+        self._sidebar_btn("Load Channels", self.load_channels)
+        self._sidebar_btn("Ingest Folder", self.ingest_folder)
         self._sidebar_btn("Save Session", self.save_session)
         self._sidebar_btn("Load Session", self.load_session)
+        self.btn_follow = self._sidebar_btn("Follow File", self.toggle_follow)
+        
+        # Optional ingest resampling (OHLC rows per bucket keep peaks/troughs)
+        ttk.Label(self.sidebar, text="RESAMPLE", style="Sidebar.TLabel", font=FONTS["small"]).pack(padx=25, pady=(10,5), anchor="w")
+        self.resample_var = tk.StringVar(value="Raw")
+        self.combo_resample = ttk.Combobox(self.sidebar, textvariable=self.resample_var, state="readonly",
+                                           values=list(RESAMPLE_PERIODS))
+        self.combo_resample.pack(fill=tk.X, padx=25, pady=5)
+        
+        # Channel shown after a multi-channel load (each has its own chain)
+        ttk.Label(self.sidebar, text="CHANNEL", style="Sidebar.TLabel", font=FONTS["small"]).pack(padx=25, pady=(10,5), anchor="w")
+        self.channel_var = tk.StringVar(value="")
+        self.combo_channel = ttk.Combobox(self.sidebar, textvariable=self.channel_var, state="disabled", values=[])
+        self.combo_channel.pack(fill=tk.X, padx=25, pady=5)
+        self.combo_channel.bind("<<ComboboxSelected>>", self.on_channel_change)
         
         ttk.Separator(self.sidebar, orient=tk.HORIZONTAL).pack(fill=tk.X, padx=25, pady=25)
         
@@ -79,6 +114,16 @@ class CPASMainWindow:
 
         self.prominence_var = tk.DoubleVar(value=0.1) # Backing var for detection
         
+        self.detector_var = tk.StringVar(value=DETECTOR_MODES[0])
+        self.combo_detector = ttk.Combobox(self.sidebar, textvariable=self.detector_var, state="readonly",
+                                           values=DETECTOR_MODES)
+        self.combo_detector.pack(fill=tk.X, padx=25, pady=5)
+        
+        self.threshold_var = tk.StringVar(value="Fixed Threshold")
+        self.combo_threshold = ttk.Combobox(self.sidebar, textvariable=self.threshold_var, state="readonly",
+                                            values=list(THRESHOLD_MODES))
+        self.combo_threshold.pack(fill=tk.X, padx=25, pady=5)
+        
         self._sidebar_btn("Detect Extrema", self.detect_extrema, primary=True)
         
         # DNA Ops
@@ -159,8 +204,19 @@ class CPASMainWindow:
         # Wait, plan said "Slider updates peaks visually". I should support it.
         # I'll call it if data exists.
         
-        if hasattr(self, 'df') and self.df is not None:
-             self.detect_extrema() # Live Visual Update
+        if hasattr(self, 'series') and self.series is not None:
+            # Once the prominence hierarchy exists, a new threshold is just a cut of it
+            cached = None
+            if self.peaks is not None and hasattr(self, 'async_processor') and not getattr(self, '_detecting', False) \
+                    and self.detector_var.get() == "Prominence":
+                cached = self.async_processor.cached_extrema(self.series, self.prominence_var.get(), EXTREMA_DISTANCE,
+                                                             THRESHOLD_MODES[self.threshold_var.get()], VOLATILITY_WINDOW,
+                                                             previous_chain=self.chain)
+            if cached is not None:
+                self.live_detector = None
+                self._show_extrema(cached, open_panel=False)
+            else:
+                self.detect_extrema() # Live Visual Update
 
     def run_dna_search(self):
         """
@@ -182,15 +238,9 @@ class CPASMainWindow:
         s, e = anchor.start_idx, anchor.end_idx
         if s > e: s, e = e, s
         
-        # Find widgets in this range
-        query_widgets = []
-        q_start_idx = -1
-        # Scan widgets
-        for i, w in enumerate(self.chain.widgets):
-            # If widget STARTS inside range
-            if w.start_idx >= s and w.end_idx <= e:
-                query_widgets.append(w)
-                if q_start_idx == -1: q_start_idx = i
+        # Find widgets in this range (binary search over the chain's range index)
+        q_start_idx, q_end_idx = self.chain.range_bounds(s, e)
+        query_widgets = self.chain.widgets[q_start_idx:q_end_idx]
                 
         if not query_widgets:
             self.log("⚠️ No pattern DNA found in selection.")
@@ -198,6 +248,8 @@ class CPASMainWindow:
             
         # Create Query Identity
         q_seq = [w.w_type for w in query_widgets] # This is a list of strings
+        # Encoded query: a slice of the chain's cached symbol string (see to_string)
+        q_str = self.chain.symbol_string[q_start_idx:q_end_idx]
         query_dna = PatternDNA(
              sequence=q_seq, 
              range_idx=(query_widgets[0].start_idx, query_widgets[-1].end_idx),
@@ -215,7 +267,8 @@ class CPASMainWindow:
         self.log(f"🧠 Scanning Genome ({mode})...")
         self.root.config(cursor="wait")
         
-        full_seq = [w.w_type for w in self.chain.widgets]
+        # Cached on the chain, so repeated searches don't re-encode it
+        full_seq = self.chain.symbol_string
         
         # Callback
         def on_search_complete(result):
@@ -249,7 +302,7 @@ class CPASMainWindow:
             # Visualize
             all_dna = [query_dna] + matches_dna
             if hasattr(self, 'plotting_canvas'):
-                self.plotting_canvas.plot_dna_layer(all_dna, self.df['timestamp'])
+                self.plotting_canvas.plot_dna_layer(all_dna, self.series)
                 
             # Ranked List
             self.update_match_list(matches_dna)
@@ -257,7 +310,7 @@ class CPASMainWindow:
         # Submit
         self.async_processor.submit_dna_search(
             full_seq=full_seq,
-            q_seq=q_seq,
+            q_seq=q_str,
             mode=mode,
             key_context={'ignore_idx': q_start_idx},
             callback=on_search_complete
@@ -305,28 +358,18 @@ class CPASMainWindow:
             # Zoom chart to this range
             # dna.range_idx is indices. Convert to timestamps for axis limits?
             # Actually plotting works with X-axis units (dates or ints).
-            # self.df['timestamp']
             
             s, e = dna.range_idx
             # Buffer
             buffer = int((e - s) * 0.5)
             s_vis = max(0, s - buffer)
-            e_vis = min(len(self.df)-1, e + buffer)
+            e_vis = min(len(self.series)-1, e + buffer)
             
-            ts_start = self.df['timestamp'].iloc[s_vis]
-            ts_end = self.df['timestamp'].iloc[e_vis]
-            
-            # Need to set xlim on plotting canvas
-            # plotting_canvas.ax.set_xlim(...)
-            # But keys are matplotlib nums if dates.
-            # Use utility in plotting canvas?
-            # For now, let's just log. Better implementation requires axis access.
+            # Index -> time is arithmetic on the time index (no column access)
             self.log(f"🔎 Jumping to Match {dna.id[:4]}...")
             
-            import matplotlib.dates as mdates
             try:
-                t1 = mdates.date2num(ts_start)
-                t2 = mdates.date2num(ts_end)
+                t1, t2 = ns_to_date_num(self.series.time_index.time_at([s_vis, e_vis]))
                 self.plotting_canvas.ax.set_xlim(t1, t2)
                 self.plotting_canvas.canvas.draw()
             except:
@@ -572,24 +615,75 @@ class CPASMainWindow:
         self.log_text.config(state=tk.DISABLED)
 
     def load_csv(self):
-        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+        file_path = filedialog.askopenfilename(filetypes=[
+            ("Datasets", "*.csv *.parquet *.pq *.feather *.arrow *.ipc"),
+            ("CSV files", "*.csv"),
+            ("Columnar files", "*.parquet *.pq *.feather *.arrow *.ipc")
+        ])
         if file_path:
             self.load_dataset_file(file_path)
 
+    def ingest_folder(self):
+        """
+        Bulk-validates every dataset in a folder into the binary cache and the
+        dataset catalog (background process pool).
+        """
+        folder = filedialog.askdirectory()
+        if not folder:
+            return
+            
+        if not hasattr(self, 'async_processor'):
+            from cpas.core.async_ops import AsyncProcessor
+            self.async_processor = AsyncProcessor(lambda f: self.root.after(0, f))
+        if not hasattr(self, 'dataset_cache'):
+            from cpas.core.dataset_cache import DatasetCache
+            self.dataset_cache = DatasetCache()
+            
+        from cpas.core.catalog import DatasetCatalog
+        catalog = DatasetCatalog(cache=self.dataset_cache)
+        self.log(f"📥 Ingesting {os.path.basename(folder) or folder}...")
+        
+        def on_progress(done, total, record):
+            status = f"❌ {record['error']}" if record.get('error') else f"{record.get('rows', 0):,} rows"
+            self.log(f"[{done}/{total}] {record['filename']}: {status}")
+            
+        def on_complete(result):
+            if 'error' in result:
+                self.log(f"Ingest Error: {result['error']}")
+                return
+            self.log(f"Ingest Complete: {len(result['ingested'])} new, "
+                     f"{len(result['skipped'])} unchanged, {len(result['failed'])} failed")
+                     
+        self.async_processor.submit_catalog_ingest(catalog, folder, on_complete, progress=on_progress)
+
     def load_dataset_file(self, file_path):
         try:
-            from cpas.core.data_loader import DataLoader
-            self.df = DataLoader.load_csv(file_path)
+            from cpas.core.data_loader import DataLoader, STREAMING_THRESHOLD_BYTES, DEFAULT_CHUNKSIZE
+            # Size BEFORE parsing: follow mode resumes here, so rows appended while
+            # parsing are re-read (CsvFollower skips the ones already loaded)
+            size = os.path.getsize(file_path)
+            # Stream large exports in bounded chunks instead of one big parse
+            chunksize = DEFAULT_CHUNKSIZE if size > STREAMING_THRESHOLD_BYTES else None
+            if not hasattr(self, 'dataset_cache'):
+                from cpas.core.dataset_cache import DatasetCache
+                self.dataset_cache = DatasetCache()
+            resample = RESAMPLE_PERIODS.get(self.resample_var.get())
+            self.series = DataLoader.load(file_path, cache=self.dataset_cache, chunksize=chunksize, resample=resample)
+            self._clear_channels()
             self.loaded_filepath = file_path # Keep track of actual path
+            self.loaded_size = size
+            self.stop_follow()
             
             # Update Cards
             name = file_path.split('/')[-1]
             self.card_file.config(text=name[:18] + "..." if len(name)>18 else name)
-            self.card_points.config(text=f"{len(self.df):,}")
+            self.card_points.config(text=f"{len(self.series):,}")
             
             self.log(f"Loaded: {name}")
+            if resample:
+                self.log(f"Resampled to {resample} OHLC: {len(self.series):,} points")
             
-            self.plotting_canvas.plot_data(self.df['timestamp'], self.df['value'])
+            self.plotting_canvas.plot_data(self.series)
             self.setup_anchor_support()
             
             # Restore Recurrence Button if it was hidden
@@ -600,21 +694,218 @@ class CPASMainWindow:
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    def load_channels(self):
+        file_path = filedialog.askopenfilename(filetypes=[
+            ("Datasets", "*.csv *.parquet *.pq *.feather *.arrow *.ipc"),
+            ("CSV files", "*.csv"),
+            ("Columnar files", "*.parquet *.pq *.feather *.arrow *.ipc")
+        ])
+        if file_path:
+            self.load_multi_channel_file(file_path)
+
+    def load_multi_channel_file(self, file_path):
+        """
+        Loads every numeric channel of a dataset and detects extrema + chains for
+        all of them in one background job (process pool, see
+        AsyncProcessor.submit_multi_extrema_detection). The CHANNEL selector
+        switches the chart, extrema and chain between channels.
+        """
+        try:
+            from cpas.core.data_loader import DataLoader
+            multi = DataLoader.load_multi(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+            
+        self.stop_follow()
+        self.multi_series = multi
+        self.channel_results = {}
+        self.loaded_filepath = file_path
+        self.combo_channel.config(values=list(multi.columns), state="readonly")
+        self.channel_var.set(multi.columns[0])
+        
+        name = os.path.basename(file_path)
+        self.card_file.config(text=name[:18] + "..." if len(name)>18 else name)
+        self.log(f"Loaded: {name} ({len(multi.columns)} channels: {', '.join(multi.columns)})")
+        self._select_channel(multi.columns[0])
+        
+        if not hasattr(self, 'async_processor'):
+            from cpas.core.async_ops import AsyncProcessor
+            self.async_processor = AsyncProcessor(lambda f: self.root.after(0, f))
+            
+        def on_complete(result):
+            self.root.config(cursor="")
+            self._detecting = False
+            if 'error' in result:
+                self.log(f"Channel Extrema Error: {result['error']}")
+                return
+            if self.multi_series is not multi:
+                return # Another dataset was loaded meanwhile
+            self.channel_results = dict(zip(result['columns'], result['channels']))
+            for col, res in self.channel_results.items():
+                self.log(f"  {col}: {len(res['peaks'])} Peaks, {len(res['troughs'])} Troughs, "
+                         f"DNA {res['chain'].symbol_string[:24]}")
+            current = self.channel_results.get(self.channel_var.get())
+            if current is not None:
+                self._show_extrema(current)
+                
+        self.log(f"🧠 Analyzing {len(multi.columns)} channels (Background)...")
+        self.root.config(cursor="wait")
+        self._detecting = True
+        self.async_processor.submit_multi_extrema_detection(multi, self.prominence_var.get(), EXTREMA_DISTANCE, on_complete)
+
+    def on_channel_change(self, event=None):
+        name = self.channel_var.get()
+        if getattr(self, 'multi_series', None) is None or name not in self.multi_series.columns:
+            return
+        self._select_channel(name)
+        result = self.channel_results.get(name)
+        if result is not None:
+            self._show_extrema(result, open_panel=False)
+            self.log(f"Channel {name}: {len(result['peaks'])} Peaks, {len(result['troughs'])} Troughs")
+
+    def _select_channel(self, name):
+        """Makes one channel of the multi-channel dataset the current series."""
+        self.series = self.multi_series.series(name)
+        self.peaks = self.troughs = self.chain = None
+        self.live_detector = None
+        self.card_points.config(text=f"{len(self.series):,}")
+        self.card_extrema.config(text="0")
+        self.plotting_canvas.plot_data(self.series)
+        self.setup_anchor_support()
+
+    def _clear_channels(self):
+        """Leaves multi-channel mode (a single-channel dataset was loaded)."""
+        self.multi_series = None
+        self.channel_results = {}
+        self.channel_var.set("")
+        self.combo_channel.config(values=[], state="disabled")
+
+    def toggle_follow(self):
+        """
+        Tail-follow mode: polls the loaded CSV and ingests only appended rows.
+        """
+        if getattr(self, 'follower', None):
+            self.stop_follow()
+            self.log("Follow mode stopped.")
+            return
+            
+        if getattr(self, 'series', None) is None or not hasattr(self, 'loaded_filepath'):
+            messagebox.showwarning("Warning", "No data loaded.")
+            return
+        if not self.loaded_filepath.lower().endswith('.csv'):
+            messagebox.showwarning("Warning", "Follow mode needs a CSV dataset.")
+            return
+        if getattr(self, 'multi_series', None) is not None:
+            messagebox.showwarning("Warning", "Follow mode needs a single-channel dataset. Use Load Dataset.")
+            return
+        if self.series.raw_rows is not None:
+            messagebox.showwarning("Warning", "Follow mode needs raw data. Set Resample to Raw and reload.")
+            return
+            
+        from cpas.core.live import CsvFollower
+        try:
+            self.follower = CsvFollower(
+                self.loaded_filepath,
+                offset=self.loaded_size,
+                last_timestamp=np.datetime64(int(self.series.time_index.time_at(len(self.series) - 1)), 'ns'),
+                row_offset=len(self.series)
+            )
+        except ValueError as e:
+            self.log(f"Follow Error: {e}")
+            return
+            
+        # Downstream consumers of each appended batch
+        self.follower.subscribe(self._on_live_rows)
+        self.follower.subscribe(self._on_live_analysis)
+        
+        self.btn_follow.config(text="Stop Following")
+        self.log(f"📡 Following {os.path.basename(self.loaded_filepath)} for appended rows...")
+        self._poll_follow()
+
+    def stop_follow(self):
+        self.follower = None
+        self.live_detector = None
+        if hasattr(self, 'btn_follow'):
+            self.btn_follow.config(text="Follow File")
+
+    def _poll_follow(self):
+        follower = getattr(self, 'follower', None)
+        if follower is None:
+            return
+        try:
+            follower.poll()
+        except ValueError as e:
+            self.log(f"Follow Error: {e}")
+            self.stop_follow()
+            return
+        self.root.after(FOLLOW_POLL_MS, self._poll_follow)
+
+    def _on_live_rows(self, timestamps, values):
+        """Appends a live batch to the dataset and extends the chart in place."""
+        # Amortized in-place growth; the time index is extended, not rebuilt
+        self.series = self.series.append(timestamps, values)
+        self.card_points.config(text=f"{len(self.series):,}")
+        self.plotting_canvas.append_data(self.series, len(values))
+
+    def _on_live_analysis(self, timestamps, values):
+        """Refreshes extrema/chain for a live batch, if they were detected before."""
+        if self.peaks is None or getattr(self, '_detecting', False):
+            return
+        if self.detector_var.get() != "Prominence" or THRESHOLD_MODES[self.threshold_var.get()] is not None:
+            # ZigZag is a single linear pass anyway; centered volatility windows
+            # change near the end, so adaptive thresholds are recomputed in full
+            self.detect_extrema()
+            return
+            
+        # Only the new batch is analyzed; the first batch primes the detector
+        # with the whole series (self.series already includes the batch)
+        batch = values
+        if self.live_detector is None:
+            from cpas.core.incremental_extrema import IncrementalExtremaDetector
+            self.live_detector = IncrementalExtremaDetector(prominence=self.prominence_var.get(), distance=EXTREMA_DISTANCE)
+            batch = self.series.values
+            
+        series = self.series
+        detector = self.live_detector
+        
+        def on_update(result):
+            if 'error' in result:
+                self.log(f"Live Extrema Error: {result['error']}")
+                self.live_detector = None
+                return
+            # Extrema can only change at positions that were tentative when last
+            # shown or that were confirmed since; everything before stays drawn
+            state = getattr(self, '_live_shown', None)
+            if state is not None and state['detector'] is not detector:
+                state = None
+            if state is not None:
+                state['since'] = min([state['since'], *result['confirmed_peaks'], *result['confirmed_troughs']])
+            if len(self.series) != len(series):
+                return # A newer batch is already queued
+                
+            tentative = [*result['tentative_peaks'], *result['tentative_troughs']]
+            if state is None:
+                # Priming batch: the result covers the whole series
+                self._show_extrema(result, open_panel=False)
+            else:
+                self._show_live_extrema(result, min([state['since'], *tentative]))
+            self._live_shown = {'detector': detector, 'since': min(tentative, default=len(series))}
+            
+        self.async_processor.submit_incremental_extrema(self.live_detector, batch, series, on_update, previous_chain=self.chain)
+
     def setup_anchor_support(self):
         self.plotting_canvas.enable_selector(self.on_time_select)
         self.plotting_canvas.on_clear_request = self.clear_selection
 
     def on_time_select(self, xmin, xmax):
-        if not hasattr(self, 'df'): return
+        if not hasattr(self, 'series'): return
         
         # Reverse Selection Support
         if xmin > xmax:
             xmin, xmax = xmax, xmin
             
-        import matplotlib.dates as mdates
-        t_vals = mdates.date2num(self.df['timestamp'])
-        idx_min = np.searchsorted(t_vals, xmin)
-        idx_max = np.searchsorted(t_vals, xmax)
+        idx_min, idx_max = (int(i) for i in self.series.time_index.index_of(date_num_to_ns([xmin, xmax])))
         
         if idx_min >= idx_max:
              self.log("Invalid selection (start >= end).")
@@ -640,11 +931,11 @@ class CPASMainWindow:
         # Simplest: Trigger a redraw or tell canvas to clear selector.
         self.plotting_canvas.reset_view() # Also clears selection mostly? No reset_view resets zoom.
         # Let's just re-plot data to clear artifacts
-        if hasattr(self, 'df'):
-            self.plotting_canvas.plot_data(self.df['timestamp'], self.df['value'], self.peaks, self.troughs)
+        if hasattr(self, 'series'):
+            self.plotting_canvas.plot_data(self.series, peaks=self.peaks, troughs=self.troughs)
 
     def detect_extrema(self):
-        if not hasattr(self, 'df'):
+        if self.series is None:
             messagebox.showwarning("Warning", "No data loaded.")
             return
 
@@ -654,54 +945,111 @@ class CPASMainWindow:
             # Pass root.after as scheduler
             self.async_processor = AsyncProcessor(lambda f: self.root.after(0, f))
 
+        prom = self.prominence_var.get()
+        volatility = THRESHOLD_MODES[self.threshold_var.get()]
+        progressive = (self.detector_var.get() == "Prominence" and volatility is None
+                       and len(self.series) >= PROGRESSIVE_MIN_POINTS
+                       and self.async_processor.cached_extrema(self.series, prom, EXTREMA_DISTANCE) is None)
+        
+        # Busy state only once the request is valid (cleared by on_complete)
         self.log("🧠 Analyzing Extrema (Background)...")
         self.root.config(cursor="wait")
-        
-        prom = self.prominence_var.get()
+        self._detecting = True
+        self.live_detector = None # Parameters may have changed; re-prime on the next live batch
         
         def on_complete(result):
             self.root.config(cursor="")
+            self._detecting = False
             if 'error' in result:
                 self.log(f"Extrema Error: {result['error']}")
                 return
-                
-            self.peaks = result['peaks']
-            self.troughs = result['troughs']
-            self.chain = result['chain'] # Chain is widget object list
+            self._show_extrema(result)
             
-            count = len(self.peaks) + len(self.troughs)
-            self.card_extrema.config(text=f"{count:,}")
-            self.log(f"Extrema Found: {len(self.peaks)} Peaks, {len(self.troughs)} Troughs")
-            
-            # Draw
-            self.plotting_canvas.plot_data(self.df['timestamp'], self.df['value'], self.peaks, self.troughs)
-            self.log("Analysis Complete.")
-            
-            # Populate Widget Bank
-            # Initialize Genome Engine
-            # Create list of all extrema indices
-            all_extrema = sorted(list(self.peaks) + list(self.troughs))
-            self.genome_engine = GenomeEngine(all_extrema, len(self.df))
+        def on_progress(result):
+            if 'error' in result or result['final']:
+                on_complete(result)
+                return
+            self.root.config(cursor="") # Structure is visible; refinement continues in background
+            self._show_extrema(result, open_panel=False)
+            self.log(f"Refining extrema... {result['progress']:.0%}")
             
-            # Pass to Mold Manager
-            if hasattr(self, 'mold_manager'):
-                self.mold_manager.engine = self.genome_engine
-                # Auto-open Molds panel
-                self.toggle_panel("widgets")
-                if not self.panel_expanded: self.toggle_panel_state(force_open=True)
-
         try:
              # Submit Task
-             self.async_processor.submit_extrema_detection(
-                 self.df['value'].values, 
-                 prominence=prom, 
-                 distance=10, 
-                 callback=on_complete
-             )
+             if progressive:
+                 self.async_processor.submit_progressive_extrema(self.series, prom, EXTREMA_DISTANCE, on_progress)
+             elif self.detector_var.get() == "ZigZag %":
+                 self.async_processor.submit_zigzag_detection(self.series, on_complete, percent=prom)
+             else:
+                 self.async_processor.submit_extrema_detection(
+                     self.series, 
+                     prominence=prom, 
+                     distance=EXTREMA_DISTANCE, 
+                     callback=on_complete,
+                     volatility=volatility,
+                     volatility_window=VOLATILITY_WINDOW,
+                     previous_chain=self.chain
+                 )
             
         except Exception as e:
             self.log(f"Async Error: {e}")
             self.root.config(cursor="")
+            self._detecting = False
+            
+    def _show_extrema(self, result, open_panel=True):
+        """
+        Installs a detection result (peaks, troughs, chain) and redraws.
+        open_panel=False is used for slider cuts, which arrive many times per second.
+        """
+        self.peaks = result['peaks']
+        self.troughs = result['troughs']
+        self.chain = result['chain'] # Chain is widget object list
+        if hasattr(self, 'async_processor'):
+            # Only caches that depend on changed widget ranges are dropped
+            self.async_processor.on_chain_changed(result.get('changes'))
+        
+        count = len(self.peaks) + len(self.troughs)
+        self.card_extrema.config(text=f"{count:,}")
+        
+        # Draw
+        self.plotting_canvas.plot_data(self.series, peaks=self.peaks, troughs=self.troughs)
+        
+        # Populate Widget Bank
+        # Initialize Genome Engine
+        # Create list of all extrema indices
+        all_extrema = sorted(list(self.peaks) + list(self.troughs))
+        self.genome_engine = GenomeEngine(all_extrema, len(self.series))
+        
+        # Pass to Mold Manager
+        if hasattr(self, 'mold_manager'):
+            self.mold_manager.engine = self.genome_engine
+            
+        if open_panel:
+            self.log(f"Extrema Found: {len(self.peaks)} Peaks, {len(self.troughs)} Troughs")
+            self.log("Analysis Complete.")
+            # Auto-open Molds panel
+            if hasattr(self, 'mold_manager'):
+                self.toggle_panel("widgets")
+                if not self.panel_expanded: self.toggle_panel_state(force_open=True)
+            
+    def _show_live_extrema(self, result, since):
+        """
+        Installs a live detection result in which only extrema at index >= since
+        changed: the markers and the Genome Engine are updated for that tail
+        instead of redrawing the chart and re-sorting every extremum.
+        """
+        self.peaks = result['peaks']
+        self.troughs = result['troughs']
+        self.chain = result['chain']
+        self.async_processor.on_chain_changed(result.get('changes'))
+        
+        count = len(self.peaks) + len(self.troughs)
+        self.card_extrema.config(text=f"{count:,}")
+        
+        self.plotting_canvas.update_extrema(self.series, self.peaks, self.troughs, since)
+        
+        peaks, troughs = np.asarray(self.peaks), np.asarray(self.troughs)
+        tail = np.concatenate([peaks[np.searchsorted(peaks, since):], troughs[np.searchsorted(troughs, since):]])
+        self.genome_engine.replace_tail(tail, since, len(self.series))
             
     def on_chart_node_click(self, x_val, y_val):
         """
@@ -711,28 +1059,20 @@ class CPASMainWindow:
         if not hasattr(self, 'genome_engine') or not self.genome_engine:
             return
             
-        if self.df is None: return
+        if self.series is None: return
         
         # Map x_val (Time/Float) to Index
         # Matplotlib dates are floats.
-        # We need to find nearest timestamp in df.
+        # We need to find nearest timestamp in the series.
         try:
-            import matplotlib.dates as mdates
-            # Convert num back to datetime
-            dt = mdates.num2date(x_val)
-            # Remove timezone info if df is naive? Or match.
-            if self.df['timestamp'].dt.tz is None:
-                dt = dt.replace(tzinfo=None)
-            
-            # Find nearest in DataFrame
-            # Searchsorted requires sorted index. Assumed time sorted.
-            # Using get_loc method of simple logic
-            # diff = abs(self.df['timestamp'] - dt)
-            # idx = diff.idxmin() # Slow?
-            # Faster: searchsorted
-            idx = self.df['timestamp'].searchsorted(dt)
+            # Convert num back to ns (UTC, same basis as the time index)
+            t = int(date_num_to_ns(x_val))
+            dt = np.datetime64(t, 'ns')
+            
+            # Time -> index is arithmetic for regular series, binary search otherwise
+            idx = int(self.series.time_index.index_of(t))
             # Clamp
-            idx = min(max(0, idx), len(self.df)-1)
+            idx = min(max(0, idx), len(self.series)-1)
             
             # Verify its close?
             # User might click empty space.
@@ -740,7 +1080,10 @@ class CPASMainWindow:
             # GenomeEngine logic handles "Apply FROM this anchor".
             # We pass this index.
             
-            self.log(f"🖱️ Clicked Time: {dt} -> Index: {idx}")
+            if self.series.raw_rows is not None:
+                self.log(f"🖱️ Clicked Time: {dt} -> Index: {idx} (raw row {self.series.raw_row(idx)})")
+            else:
+                self.log(f"🖱️ Clicked Time: {dt} -> Index: {idx}")
             self.mold_manager.on_node_click(idx)
             
         except Exception as e:
@@ -751,33 +1094,32 @@ class CPASMainWindow:
             self.log(f"Click Error: {e}")
             try:
                 idx = int(round(x_val))
-                if 0 <= idx < len(self.df):
+                if 0 <= idx < len(self.series):
                     self.mold_manager.on_node_click(idx)
             except:
                 pass
 
     def generate_recurrence(self):
-        if not hasattr(self, 'df'): return
+        if not hasattr(self, 'series'): return
         from cpas.core.recurrence import RecurrencePlot
         
         # 1. Determine Range
         if hasattr(self, 'anchor_manager'):
-            s, e = self.anchor_manager.get_active_range(len(self.df))
+            s, e = self.anchor_manager.get_active_range(len(self.series))
         else:
-            s, e = 0, len(self.df)
+            s, e = 0, len(self.series)
             
         # 2. Check for Widget Chain (Primary Source now)
         if hasattr(self, 'chain') and self.chain:
-            # Filter widgets in range
-            selected_widgets = [w for w in self.chain.widgets if w.start_idx >= s and w.end_idx <= e]
+            # Widgets in range (binary search over the chain's range index)
+            selected = self.chain.range_slice(s, e)
             
-            if not selected_widgets:
+            if not len(selected.type_codes):
                 self.log("⚠️ No widgets found in selection for Recurrence Plot.")
                 return
 
-            # Map Types to Ints
-            type_map = {'P2P': 1, 'T2T': 2, 'P2T': 3, 'T2P': 4}
-            values = [type_map.get(w.w_type, 0) for w in selected_widgets]
+            # Map Types to Ints: P2P 1, T2T 2, P2T 3, T2P 4 (type code + 1)
+            values = (selected.type_codes.astype(np.int64) + 1).tolist()
             
             self.log(f"🔄 Recurrence: Analyzing {len(values)} Widgets (Structural Mode).")
             
@@ -840,23 +1182,24 @@ class CPASMainWindow:
             return
 
         if hasattr(self, 'anchor_manager'):
-            s, e = self.anchor_manager.get_active_range(len(self.df))
+            s, e = self.anchor_manager.get_active_range(len(self.series))
         else:
-            s, e = 0, len(self.df)
+            s, e = 0, len(self.series)
             
         if self.chain is None:
              messagebox.showwarning("Req", "Run Extrema Detection first to generate chain.")
              return
 
-        selected_widgets = [w for w in self.chain.widgets if w.start_idx >= s and w.end_idx <= e]
-        if not selected_widgets:
+        first, last = self.chain.range_bounds(s, e)
+        if first == last:
              self.log("No widgets in selected range.")
              return
              
         try:
             import importlib
             mod = importlib.import_module(f"cpas.algorithms.{mod_name}")
-            sequence = [w.w_type for w in selected_widgets]
+            # Encoded slice of the chain's cached symbol string
+            sequence = self.chain.symbol_string[first:last]
             
             # Prepare kwargs
             kwargs = {}
@@ -906,7 +1249,7 @@ class CPASMainWindow:
             self.log(f"Algo Error: {ex}")
 
     def save_session(self):
-        if not hasattr(self, 'df') or not hasattr(self, 'loaded_filepath'): 
+        if not hasattr(self, 'series') or not hasattr(self, 'loaded_filepath'): 
              messagebox.showwarning("Save Error", "No file loaded to save session for.")
              return
 
@@ -957,10 +1300,10 @@ class CPASMainWindow:
                 
                 # 3. Regenerate Chain
                 from cpas.core.widgets import WidgetGenerator
-                self.chain = WidgetGenerator.generate_chain(self.df['value'].values, self.peaks, self.troughs)
+                self.chain = WidgetGenerator.generate_chain(self.series.values, self.peaks, self.troughs)
                 
                 # 4. Re-plot with Extrema
-                self.plotting_canvas.plot_data(self.df['timestamp'], self.df['value'], self.peaks, self.troughs)
+                self.plotting_canvas.plot_data(self.series, peaks=self.peaks, troughs=self.troughs)
             
             # 5. Restore Anchor
             anchor_data = state.get('anchor', {})
@@ -1006,7 +1349,7 @@ class CPASMainWindow:
         Callback from WidgetBank.
         Zooms chart to show the selected widgets and highlights them.
         """
-        if not widgets or not hasattr(self, 'df'): return
+        if not widgets or not hasattr(self, 'series'): return
         
         # 1. Calculate Range
         s_idx = min([w.start_idx for w in widgets])
@@ -1021,22 +1364,16 @@ class CPASMainWindow:
         self.log(f"🔎 Focused on {len(widgets)} widgets (Indices {s_idx}-{e_idx})")
         
         # 3. Zoom
-        import matplotlib.dates as mdates
-        
         # Buffer
         duration = e_idx - s_idx
         # Ensure buffer is reasonable (at least 20 points or 50% of duration)
         buffer = max(20, int(duration * 0.5)) 
         
         s_vis = max(0, s_idx - buffer)
-        e_vis = min(len(self.df)-1, e_idx + buffer)
-        
-        ts_start = self.df['timestamp'].iloc[s_vis]
-        ts_end = self.df['timestamp'].iloc[e_vis]
+        e_vis = min(len(self.series)-1, e_idx + buffer)
         
         try:
-            t1 = mdates.date2num(ts_start)
-            t2 = mdates.date2num(ts_end)
+            t1, t2 = ns_to_date_num(self.series.time_index.time_at([s_vis, e_vis]))
             self.plotting_canvas.ax.set_xlim(t1, t2)
             self.plotting_canvas.canvas.draw()
         except Exception as e:
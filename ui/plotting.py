@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 from matplotlib.widgets import SpanSelector
@@ -9,6 +10,49 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # Import Theme colors for seamless integration
 from cpas.ui.theme import COLORS
+from cpas.models.timeseries import TimeSeries
+
+NS_PER_DAY = 86_400 * 10**9
+
+def _epoch_ns():
+    import matplotlib.dates as mdates
+    return np.datetime64(mdates.get_epoch(), 'ns').astype(np.int64)
+
+def date_num_to_ns(x):
+    """Matplotlib date number(s) -> int64 ns since the Unix epoch (UTC)."""
+    return np.round(np.asarray(x, dtype=np.float64) * NS_PER_DAY).astype(np.int64) + _epoch_ns()
+
+def ns_to_date_num(t):
+    """int64 ns since the Unix epoch -> Matplotlib date number(s)."""
+    return (np.asarray(t, dtype=np.int64) - _epoch_ns()) / NS_PER_DAY
+
+# Most points drawn for a line / bar layer (longer series are decimated)
+PLOT_POINT_LIMIT = 10000
+
+class TimeAxis:
+    """
+    Lazy datetime64[ns] x-axis over a TimeIndex.
+
+    Indexing (int, slice or position array) computes only the requested
+    positions through TimeIndex.time_at, so drawing a decimated line or a few
+    markers of a long regular series never builds its full timestamp column.
+    np.asarray still materializes it for callers that need every point.
+    """
+    def __init__(self, time_index):
+        self.time_index = time_index
+
+    def __len__(self):
+        return len(self.time_index)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            key = np.arange(*key.indices(len(self)), dtype=np.int64)
+        t = np.asarray(self.time_index.time_at(key), dtype=np.int64).view('datetime64[ns]')
+        return t[()] if t.ndim == 0 else t
+
+    def __array__(self, dtype=None, copy=None):
+        t = self.time_index.to_array().view('datetime64[ns]')
+        return t if dtype is None else t.astype(dtype)
 
 class PlottingCanvas(tk.Frame):
     def __init__(self, parent):
@@ -233,11 +277,28 @@ class PlottingCanvas(tk.Frame):
             drag_from_anywhere=True
         )
 
-    def plot_data(self, x, y, peaks=None, troughs=None):
+    @staticmethod
+    def _as_xy(x, y=None):
+        """
+        Accepts a TimeSeries or (x, y) array-likes. A series' x comes back as a
+        lazy TimeAxis (see TimeAxis); anything else as plain numpy arrays.
+        """
+        if isinstance(x, TimeSeries):
+            return TimeAxis(x.time_index), x.values
+        if isinstance(x, TimeAxis):
+            return x, np.asarray(y)
+        return np.asarray(x), np.asarray(y)
+
+    def plot_data(self, x, y=None, peaks=None, troughs=None):
+        """
+        Plots a TimeSeries (or x / y arrays) with optional peak and trough markers.
+        """
         # Ensure toolbar exists
         if not hasattr(self, '_mpl_toolbar'):
             self.setup_hidden_toolbar()
             
+        x, y = self._as_xy(x, y)
+            
         # Cache for redraws on mode switch
         self.last_x = x
         self.last_y = y
@@ -245,6 +306,7 @@ class PlottingCanvas(tk.Frame):
         self.last_troughs = troughs
             
         self.ax.clear()
+        self.extrema_markers = {} # Scatter per marker kind (see update_extrema)
         
         # Dispatcher
         if self.viz_mode == "histogram":
@@ -257,10 +319,12 @@ class PlottingCanvas(tk.Frame):
         # Common Decorations (Peaks/Troughs) - Only for Time-based charts
         if self.viz_mode != "histogram":
             if peaks is not None:
-                 self.ax.scatter(x.iloc[peaks], y.iloc[peaks], color=COLORS["danger"], marker='^', s=60, label='Peaks', zorder=5)
+                 peaks = np.asarray(peaks, dtype=np.intp)
+                 self.extrema_markers['peaks'] = self.ax.scatter(x[peaks], y[peaks], color=COLORS["danger"], marker='^', s=60, label='Peaks', zorder=5)
                  
             if troughs is not None:
-                 self.ax.scatter(x.iloc[troughs], y.iloc[troughs], color=COLORS["success"], marker='v', s=60, label='Troughs', zorder=5)
+                 troughs = np.asarray(troughs, dtype=np.intp)
+                 self.extrema_markers['troughs'] = self.ax.scatter(x[troughs], y[troughs], color=COLORS["success"], marker='v', s=60, label='Troughs', zorder=5)
                  
             self.ax.set_xlabel("Time", color=COLORS["text_light"])
              
@@ -282,22 +346,84 @@ class PlottingCanvas(tk.Frame):
         # Peaks/troughs are scatters, they handle themselves.
         # The line itself needs downsampling.
         
-        limit = 10000
-        if len(x) > limit:
-            # Simple decimation: Take every Nth point
-            step = len(x) // limit
-            x_plot = x.iloc[::step]
-            y_plot = y.iloc[::step]
-        else:
-            x_plot = x
-            y_plot = y
+        # Simple decimation: Take every Nth point (x is computed for those only)
+        step = max(1, len(x) // PLOT_POINT_LIMIT)
+        x_plot = x[::step]
+        y_plot = y[::step]
             
-        self.ax.plot(x_plot, y_plot, label='Series', color=COLORS["accent"], linewidth=1.5)
+        # Keep line + decimation step so appended rows can extend it in place
+        self._plot_step = step
+        self.series_line, = self.ax.plot(x_plot, y_plot, label='Series', color=COLORS["accent"], linewidth=1.5)
+
+    def append_data(self, series, n_new):
+        """
+        Extends the plotted series with its last n_new rows without rebuilding
+        the chart. Falls back to plot_data when there is no line to extend.
+        """
+        line = getattr(self, 'series_line', None)
+        x, y = self._as_xy(series)
+        self.last_x = x
+        self.last_y = y
+        
+        if self.viz_mode != "time_series" or line is None or line.axes is None:
+            self.plot_data(x, y, self.last_peaks, self.last_troughs)
+            return
+            
+        # Continue the existing decimation grid (every step-th row);
+        # only these new positions are converted to timestamps
+        step = self._plot_step
+        first = len(x) - n_new
+        start = first + (-first) % step
+        x_new = x[start::step]
+        y_new = y[start::step]
+        
+        x_all = np.concatenate([np.asarray(line.get_xdata()), x_new])
+        if len(x_all) > 20000:
+            # Too dense after many appends: re-decimate from scratch
+            self.plot_data(x, y, self.last_peaks, self.last_troughs)
+            return
+            
+        line.set_data(x_all, np.concatenate([np.asarray(line.get_ydata()), y_new]))
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+
+    def update_extrema(self, series, peaks, troughs, since):
+        """
+        Moves the peak / trough markers to new positions when only those at
+        index >= since changed (live data). Earlier markers keep their drawn
+        coordinates, so only the changed tail is converted. Falls back to
+        plot_data when the chart has no markers to update.
+        """
+        peaks = np.asarray(peaks, dtype=np.intp)
+        troughs = np.asarray(troughs, dtype=np.intp)
+        markers = getattr(self, 'extrema_markers', {})
+        
+        if self.viz_mode == "histogram":
+            # No markers in this mode; keep the positions for a mode switch
+            self.last_peaks, self.last_troughs = peaks, troughs
+            return
+        if 'peaks' not in markers or 'troughs' not in markers:
+            self.plot_data(series, peaks=peaks, troughs=troughs)
+            return
+            
+        for name, new, old in (('peaks', peaks, self.last_peaks), ('troughs', troughs, self.last_troughs)):
+            keep = np.searchsorted(np.asarray(old, dtype=np.intp), since)
+            tail = new[np.searchsorted(new, since):]
+            t = np.asarray(series.time_index.time_at(tail), dtype=np.int64)
+            xy = np.column_stack([ns_to_date_num(t), series.values[tail]])
+            offsets = np.asarray(markers[name].get_offsets())[:keep]
+            markers[name].set_offsets(np.concatenate([offsets.reshape(-1, 2), xy]))
+            
+        self.last_peaks, self.last_troughs = peaks, troughs
+        self.canvas.draw_idle()
 
     def plot_bar_chart(self, x, y):
         # Stem Plot style for performance & alignment
         # "vlines" is much faster than plt.bar for many points
-        self.ax.vlines(x, 0, y, color=COLORS["accent"], alpha=0.6, linewidth=1, label='Signal')
+        # Decimated like the line: more stems than pixels only costs time
+        step = max(1, len(x) // PLOT_POINT_LIMIT)
+        self.ax.vlines(x[::step], 0, y[::step], color=COLORS["accent"], alpha=0.6, linewidth=1, label='Signal')
         self.ax.axhline(0, color=COLORS["text_dim"], linewidth=0.5)
 
     def plot_histogram(self, y):
@@ -337,8 +463,8 @@ class PlottingCanvas(tk.Frame):
             if w.start_idx >= len(x_data) or w.end_idx >= len(x_data):
                 continue
                 
-            t_start = x_data.iloc[w.start_idx]
-            t_end = x_data.iloc[w.end_idx]
+            t_start = x_data[w.start_idx]
+            t_end = x_data[w.end_idx]
             
             # Convert timestamp to matplotlib num if needed, but plot_data uses raw x which might be dates.
             # If x_data is datetime, we need date2num?
@@ -401,8 +527,8 @@ class PlottingCanvas(tk.Frame):
             if s_idx >= len(x_data) or e_idx >= len(x_data):
                 continue
                 
-            ts = x_data.iloc[s_idx]
-            te = x_data.iloc[e_idx]
+            ts = x_data[s_idx]
+            te = x_data[e_idx]
             
             try:
                 ts_n = mdates.date2num(ts)
@@ -546,6 +672,8 @@ class PlottingCanvas(tk.Frame):
         
         # Cache logic
         self.last_dna_objects = dna_objects
+        if isinstance(x_data, TimeSeries):
+            x_data = TimeAxis(x_data.time_index)
         
         # Clear spatial index
         self.dna_spatial_index = []
@@ -581,7 +709,7 @@ class PlottingCanvas(tk.Frame):
             if s >= len(x_data) or e >= len(x_data): continue
             
             # X-Coords (Vectorize this later if needed, loop is OK for <10k)
-            ts, te = x_data.iloc[s], x_data.iloc[e]
+            ts, te = x_data[s], x_data[e]
             
             try:
                 # Optimized date conversion: if timestamps, use ordinal